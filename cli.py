@@ -22,13 +22,19 @@ from globals import DEFAULT_OLLAMA_MODEL, DEFAULT_OLLAMA_URL
 TOOL_DEFS = [
     {
         "name": "build_code_graph",
-        "description": "Builds the project graph and returns metadata including code_hash.",
+        "description": "Builds the project graph and returns a summary including code_hash.",
         "params": {"project": "string"},
     },
     {
         "name": "query_code_graph",
         "description": "Queries the graph by name or file path and returns matches.",
-        "params": {"project": "string", "term": "string", "kind": "string|null"},
+        "params": {
+            "project": "string",
+            "term": "string",
+            "kind": "string|null",
+            "limit": "integer",
+            "offset": "integer",
+        },
     },
     {
         "name": "save_graph_proposal",
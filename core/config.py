@@ -2,10 +2,11 @@
 from __future__ import annotations
 
 import os
-from typing import Set
+from typing import List, Set
 
 from pydantic import BaseModel, Field
 
+from core.ignore import DEFAULT_IGNORE_PATTERNS
 from core.registry import ProjectRegistry
 
 
@@ -15,6 +16,52 @@ class AppConfig(BaseModel):
     allowed_extensions: Set[str] = Field(
         default_factory=set, description="Allowed file extensions"
     )
+    ignore_patterns: List[str] = Field(
+        default_factory=lambda: list(DEFAULT_IGNORE_PATTERNS),
+        description="Gitignore-style patterns for files and folders never walked",
+    )
+    use_gitignore: bool = Field(
+        default=True, description="Also apply the patterns in each project's root .gitignore"
+    )
+    build_workers: int = Field(
+        default=0, description="Processes used to parse files during builds (0 = cpu count)"
+    )
+    parallel_build_min_files: int = Field(
+        default=64, description="Minimum number of files to parse before using a process pool"
+    )
+    hash_algorithm: str = Field(
+        default="sha256", description="Digest used for file and code hashes (e.g. blake2b)"
+    )
+    hash_workers: int = Field(
+        default=0, description="Threads used to hash files (0 = default pool size)"
+    )
+    parse_cache_max_bytes: int = Field(
+        default=256 * 1024 * 1024,
+        description="Size bound of the shared parse cache in bytes (0 disables it)",
+    )
+    watch: bool = Field(
+        default=False, description="Rebuild graphs in the background when project files change"
+    )
+    watch_debounce_ms: int = Field(
+        default=300, description="Quiet period before a watched change triggers a rebuild"
+    )
+    watch_poll_interval_ms: int = Field(
+        default=1000, description="Stat polling interval when inotify is unavailable"
+    )
+    graph_versions_max: int = Field(
+        default=16, description="Graph versions kept for diffs and proposals, keyed by code hash"
+    )
+    graph_versions_max_bytes: int = Field(
+        default=128 * 1024 * 1024,
+        description="Size bound of stored graph versions in bytes (0 = count bound only)",
+    )
+    graph_storage: str = Field(
+        default="single",
+        description="single (one JSON/binary file) or sharded (per-file shards + manifest)",
+    )
+    graph_backend: str = Field(
+        default="json", description="Graph store used for queries: json or sqlite"
+    )
 
     @classmethod
     def from_globals(cls) -> "AppConfig":
@@ -27,4 +74,5 @@ class AppConfig(BaseModel):
             base_path=base_path,
             projects=base_projects.union(registered),
             allowed_extensions=set(globals_mod.ALLOWED_EXTENSIONS),
+            watch=bool(getattr(globals_mod, "WATCH", False)),
         )
@@ -2,15 +2,38 @@
 from __future__ import annotations
 
 import ast
+import builtins
 import hashlib
 import json
+import multiprocessing
 import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timezone
-from typing import Any, Iterable
+from typing import Any, Container, Iterable
 
 from pydantic import BaseModel, Field
 
 from core.config import AppConfig
+from core.graph_index import TRIGRAM_INDEX_VERSION, GraphIndex, TrigramIndex
+from core.graph_ndjson import fragment_records, load_ndjson, ndjson_records, write_ndjson
+from core.graph_shards import ShardedGraphStore
+from core.graph_sqlite import SqliteGraphStore
+from core.graph_store import BinaryGraphReader, write_binary_graph
+from core.graph_versions import GraphVersionStore
+from core.hashing import FileHasher
+from core.hashtree import HashTree
+from core.ignore import load_ignore_rules
+from core.parse_cache import ParseCache
+from core.proposal_catalog import ProposalCatalog
+from core.snapshot import SNAPSHOTS, ProjectSnapshot, SnapshotCache
+from core.symbols import RESOLVED_EDGE_KINDS, SymbolTable
+
+MANIFEST_VERSION = "0.3.0"
+# Bump whenever the extractor's output changes so cached fragments are not reused.
+EXTRACTOR_VERSION = "1"
 
 
 class Range(BaseModel):
@@ -45,6 +68,7 @@ class Graph(BaseModel):
     kinds: dict[str, list[str]]
     extensions: dict[str, Any]
     code_hash: str
+    hash_algorithm: str = "sha256"
 
 
 class GraphChangeOperation(BaseModel):
@@ -70,9 +94,541 @@ def _model_dump(model: BaseModel) -> dict[str, Any]:
     return model.dict(by_alias=True)
 
 
+class _NodeRecord:
+    """Extractor-side node; serialises to the same dict as a dumped ``Node``."""
+
+    __slots__ = ("id", "kind", "name", "file", "start_line", "end_line", "extra")
+
+    def __init__(
+        self,
+        node_id: str,
+        kind: str,
+        name: str,
+        file_rel: str,
+        start_line: int | None,
+        end_line: int | None,
+        extra: dict[str, Any],
+    ) -> None:
+        self.id = node_id
+        self.kind = kind
+        self.name = name
+        self.file = file_rel
+        self.start_line = start_line
+        self.end_line = end_line
+        self.extra = extra
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "name": self.name,
+            "file": self.file,
+            "range": {"start_line": self.start_line, "end_line": self.end_line},
+            "extra": self.extra,
+        }
+
+
+class _EdgeRecord:
+    """Extractor-side edge; serialises to the same dict as a dumped ``Edge``."""
+
+    __slots__ = ("from_id", "to_id", "kind", "extra")
+
+    def __init__(self, from_id: str, to_id: str, kind: str, extra: dict[str, Any]) -> None:
+        self.from_id = from_id
+        self.to_id = to_id
+        self.kind = kind
+        self.extra = extra
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"from": self.from_id, "to": self.to_id, "kind": self.kind, "extra": self.extra}
+
+
+class _ShardCache:
+    """Sharded query state kept between calls while the shard manifest keeps its stamp.
+
+    ``files_by_key`` maps lowercase names and paths to their files, ``callers``
+    maps node ids to the files with edges into them, and ``fragments`` holds the
+    shards read so far by fragment key.
+    """
+
+    __slots__ = ("stamp", "manifest", "trigrams", "files_by_key", "callers", "fragments")
+
+    def __init__(
+        self,
+        stamp: tuple[int, int],
+        manifest: dict[str, Any],
+        trigrams: TrigramIndex,
+        files_by_key: dict[str, list[str]],
+        callers: dict[str, list[str]],
+        fragments: dict[str, dict[str, Any]],
+    ) -> None:
+        self.stamp = stamp
+        self.manifest = manifest
+        self.trigrams = trigrams
+        self.files_by_key = files_by_key
+        self.callers = callers
+        self.fragments = fragments
+
+
+def validate_graph(graph: dict[str, Any]) -> dict[str, Any]:
+    """Checks a graph from outside the builder against the schema; returns it normalised."""
+    return _model_dump(Graph(**graph))
+
+
+def module_qualname(file_rel: str) -> str:
+    """Dotted module path for a project-relative python file (``pkg/__init__.py`` -> ``pkg``)."""
+    parts = os.path.splitext(file_rel)[0].replace("\\", "/").split("/")
+    if len(parts) > 1 and parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def stable_node_id(file_rel: str, qualname: str, kind: str, disambiguator: int = 0) -> str:
+    """Content-addressed node id: unchanged symbols keep their id across rebuilds."""
+    key = f"{file_rel}\0{qualname}\0{kind}\0{disambiguator}".encode("utf-8")
+    return f"n{hashlib.blake2b(key, digest_size=8).hexdigest()}"
+
+
+def _symbol_key(node: dict[str, Any]) -> str:
+    extra = node.get("extra") or {}
+    qualname = extra.get("qualname")
+    if qualname is not None:
+        return qualname
+    asname = extra.get("asname")
+    return f"{node.get('name', '')} as {asname}" if asname else str(node.get("name", ""))
+
+
+def assign_stable_ids(fragment: dict[str, Any]) -> dict[str, str]:
+    """Maps a fragment's file-local ids to stable ids.
+
+    Repeated symbols (redefinitions, duplicate imports) are disambiguated by their
+    order of appearance within the file.
+    """
+    seen: dict[tuple[str, str], int] = {}
+    id_map: dict[str, str] = {}
+    for node in fragment["nodes"]:
+        key = (_symbol_key(node), node.get("kind", ""))
+        occurrence = seen.get(key, 0)
+        seen[key] = occurrence + 1
+        id_map[node["id"]] = stable_node_id(node.get("file", ""), key[0], key[1], occurrence)
+    return id_map
+
+
+_IGNORED_REFERENCES = frozenset(dir(builtins)) | {"self", "cls"}
+
+
+def _dotted_name(expr: ast.AST) -> str | None:
+    if isinstance(expr, ast.Name):
+        return expr.id
+    if isinstance(expr, ast.Attribute):
+        base = _dotted_name(expr.value)
+        return f"{base}.{expr.attr}" if base else None
+    return None
+
+
+class _PythonExtractor(ast.NodeVisitor):
+    """Collects nodes and edges for a single module using file-local ids.
+
+    Calls and name references are recorded as unresolved ``refs`` (owner node,
+    edge kind, dotted name, enclosing class) and resolved project-wide later.
+    Nodes and edges are kept as slotted records rather than pydantic models; the
+    extractor's output is trusted, so models only validate external graphs.
+    """
+
+    def __init__(self, file_rel: str) -> None:
+        self.file_rel = file_rel
+        self.nodes: list[_NodeRecord] = []
+        self.edges: list[_EdgeRecord] = []
+        self.refs: list[list[Any]] = []
+        self.class_stack: list[str] = []
+        self.class_names: list[str] = []
+        self.owner_stack: list[str] = []
+        self.scope: list[str] = []
+        self.module_id = ""
+        self._seen_refs: set[tuple[str, str, str]] = set()
+
+    def add_ref(self, kind: str, dotted: str) -> None:
+        if dotted in _IGNORED_REFERENCES:
+            return
+        owner = self.owner_stack[-1] if self.owner_stack else self.module_id
+        key = (owner, kind, dotted)
+        if key in self._seen_refs:
+            return
+        self._seen_refs.add(key)
+        class_qualname = self.class_names[-1] if self.class_names else None
+        self.refs.append([owner, kind, dotted, class_qualname])
+
+    def add_node(
+        self,
+        kind: str,
+        name: str,
+        start_line: int | None,
+        end_line: int | None,
+        extra: dict[str, Any] | None = None,
+    ) -> str:
+        nid = str(len(self.nodes))
+        self.nodes.append(
+            _NodeRecord(nid, kind, name, self.file_rel, start_line, end_line, extra or {})
+        )
+        return nid
+
+    def add_edge(
+        self,
+        from_id: str,
+        to_id: str,
+        kind: str,
+        extra: dict[str, Any] | None = None,
+    ) -> None:
+        self.edges.append(_EdgeRecord(from_id, to_id, kind, extra or {}))
+
+    def _qualname(self, name: str) -> str:
+        return ".".join([*self.scope, name])
+
+    def visit_Module(self, node: ast.Module) -> None:
+        self.module_id = self.add_node(
+            "module",
+            os.path.splitext(os.path.basename(self.file_rel))[0],
+            1,
+            getattr(node, "end_lineno", None),
+            extra={"qualname": module_qualname(self.file_rel)},
+        )
+        self.generic_visit(node)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        bases = []
+        for base in node.bases:
+            if isinstance(base, ast.Name):
+                bases.append(base.id)
+            elif isinstance(base, ast.Attribute):
+                bases.append(base.attr)
+        class_id = self.add_node(
+            "class",
+            node.name,
+            node.lineno,
+            getattr(node, "end_lineno", node.lineno),
+            extra={"bases": bases, "qualname": self._qualname(node.name)},
+        )
+        self.add_edge(self.module_id, class_id, "defines")
+        if self.class_stack:
+            self.add_edge(self.class_stack[-1], class_id, "defines")
+        self.class_stack.append(class_id)
+        self.class_names.append(self._qualname(node.name))
+        self.owner_stack.append(class_id)
+        self.scope.append(node.name)
+        self.generic_visit(node)
+        self.scope.pop()
+        self.owner_stack.pop()
+        self.class_names.pop()
+        self.class_stack.pop()
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self._handle_function(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        self._handle_function(node)
+
+    def _handle_function(self, node: ast.AST) -> None:
+        name = getattr(node, "name", "<lambda>")
+        kind = "method" if self.class_stack else "function"
+        func_id = self.add_node(
+            kind,
+            name,
+            getattr(node, "lineno", None),
+            getattr(node, "end_lineno", None),
+            extra={"qualname": self._qualname(name)},
+        )
+        self.add_edge(self.module_id, func_id, "defines")
+        if self.class_stack:
+            self.add_edge(self.class_stack[-1], func_id, "belongs_to")
+        self.owner_stack.append(func_id)
+        self.scope.append(name)
+        self.generic_visit(node)
+        self.scope.pop()
+        self.owner_stack.pop()
+
+    def visit_Call(self, node: ast.Call) -> None:
+        dotted = _dotted_name(node.func)
+        if dotted is None:
+            self.generic_visit(node)
+            return
+        self.add_ref("calls", dotted)
+        for arg in node.args:
+            self.visit(arg)
+        for keyword in node.keywords:
+            self.visit(keyword)
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if isinstance(node.ctx, ast.Load):
+            self.add_ref("references", node.id)
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        dotted = _dotted_name(node)
+        if dotted is not None and isinstance(node.ctx, ast.Load):
+            self.add_ref("references", dotted)
+            return
+        self.generic_visit(node)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            imp_id = self.add_node(
+                "import",
+                alias.name,
+                node.lineno,
+                getattr(node, "end_lineno", node.lineno),
+                extra={"asname": alias.asname},
+            )
+            self.add_edge(self.module_id, imp_id, "imports")
+        self.generic_visit(node)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        module = node.module or ""
+        for alias in node.names:
+            name = f"{module}.{alias.name}" if module else alias.name
+            imp_id = self.add_node(
+                "import",
+                name,
+                node.lineno,
+                getattr(node, "end_lineno", node.lineno),
+                extra={"level": node.level, "asname": alias.asname},
+            )
+            self.add_edge(self.module_id, imp_id, "imports")
+        self.generic_visit(node)
+
+
+def extract_python_file(full_path: str, file_rel: str) -> dict[str, Any] | None:
+    """Parses one python file into a fragment of nodes and edges with file-local ids.
+
+    Module-level so it can be shipped to worker processes during parallel builds.
+    """
+    try:
+        with open(full_path, "r", encoding="UTF-8") as handle:
+            source = handle.read()
+        tree = ast.parse(source, filename=full_path)
+    except (SyntaxError, ValueError, OSError):
+        return None
+    extractor = _PythonExtractor(file_rel)
+    extractor.visit(tree)
+    return {
+        "nodes": [node.to_dict() for node in extractor.nodes],
+        "edges": [edge.to_dict() for edge in extractor.edges],
+        "refs": extractor.refs,
+    }
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    """Start method for extraction pools: never ``fork``, which is unsafe once the
+    server's watcher thread is running; ``forkserver`` where available, else ``spawn``."""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _resolve_refs(
+    nodes: list[dict[str, Any]], refs: dict[str, list[list[Any]]]
+) -> list[dict[str, Any]]:
+    """Turns imports, recorded calls and references into edges between project symbols.
+
+    Resolution is redone over every file on each build, because a change in one
+    file can redirect names used in another.
+    """
+    table = SymbolTable(nodes)
+    edges: list[dict[str, Any]] = []
+    seen: set[tuple[str, str, str]] = set()
+    for import_id in table.import_targets:
+        to_id = table.resolve_import(import_id)
+        if to_id is not None:
+            edges.append({"from": import_id, "to": to_id, "kind": "resolves_to", "extra": {}})
+    for file_rel, file_refs in refs.items():
+        for from_id, kind, dotted, class_qualname in file_refs:
+            to_id = table.resolve(file_rel, dotted, class_qualname)
+            if to_id is None or to_id == from_id or (from_id, to_id, kind) in seen:
+                continue
+            seen.add((from_id, to_id, kind))
+            edges.append({"from": from_id, "to": to_id, "kind": kind, "extra": {}})
+    return edges
+
+
+def relocate_fragment(fragment: dict[str, Any], file_rel: str) -> dict[str, Any]:
+    """Points a cached fragment at ``file_rel`` (its content may come from another path)."""
+    for node in fragment["nodes"]:
+        node["file"] = file_rel
+        if node.get("kind") == "module":
+            node["name"] = os.path.splitext(os.path.basename(file_rel))[0]
+            node.setdefault("extra", {})["qualname"] = module_qualname(file_rel)
+    return fragment
+
+
+def _proposal_references(
+    proposal: GraphProposal,
+) -> tuple[set[str], set[tuple[str, str, str]]]:
+    """Node ids and edge keys a proposal's operations refer to."""
+    referenced_nodes: set[str] = set()
+    referenced_edges: set[tuple[str, str, str]] = set()
+    for op in proposal.operations:
+        if op.node_id:
+            referenced_nodes.add(op.node_id)
+        if op.node and op.node.get("id"):
+            referenced_nodes.add(op.node["id"])
+        if op.edge:
+            key = (op.edge.get("from"), op.edge.get("to"), op.edge.get("kind"))
+            referenced_nodes.update(node_id for node_id in key[:2] if node_id)
+            referenced_edges.add(key)
+    return referenced_nodes, referenced_edges
+
+
+def _operation_files(
+    operations: Iterable[GraphChangeOperation], nodes_by_id: dict[str, dict[str, Any]]
+) -> list[set[str]]:
+    """The files each operation touches, looking node ids up in ``nodes_by_id``."""
+    added: dict[str, dict[str, Any]] = {}
+    touched: list[set[str]] = []
+    for op in operations:
+        files: set[str] = set()
+        node_refs: list[str] = []
+        if op.node:
+            added[str(op.node.get("id"))] = op.node
+            files.add(str(op.node.get("file", "")))
+        if op.node_id:
+            node_refs.append(op.node_id)
+        if op.patch and op.patch.get("file"):
+            files.add(str(op.patch["file"]))
+        if op.edge:
+            node_refs.extend(str(op.edge.get(end)) for end in ("from", "to") if op.edge.get(end))
+        for node_id in node_refs:
+            node = nodes_by_id.get(node_id) or added.get(node_id)
+            if node is not None:
+                files.add(str(node.get("file", "")))
+        touched.append(files - {""})
+    return touched
+
+
+def _proposal_footprint(
+    proposal: GraphProposal,
+) -> tuple[set[str], set[str], set[tuple[str, str, str]]]:
+    """Node ids a proposal writes, node ids it touches (including writes), edge keys it writes."""
+    written_nodes: set[str] = set()
+    touched_nodes: set[str] = set()
+    written_edges: set[tuple[str, str, str]] = set()
+    for op in proposal.operations:
+        if op.node and op.node.get("id"):
+            written_nodes.add(str(op.node["id"]))
+        if op.node_id:
+            written_nodes.add(op.node_id)
+        if op.edge:
+            key = (op.edge.get("from"), op.edge.get("to"), op.edge.get("kind"))
+            written_edges.add(key)
+            touched_nodes.update(node_id for node_id in key[:2] if node_id)
+    return written_nodes, touched_nodes | written_nodes, written_edges
+
+
+def _validate_operations(
+    operations: Iterable[GraphChangeOperation],
+    node_ids: Container[str],
+    edge_keys: Container[tuple[str, str, str]],
+    kinds: dict[str, list[str]],
+) -> list[tuple[int, str]]:
+    """Checks operations in order against a graph's node ids and edge keys.
+
+    Returns ``(operation index, message)`` for every invalid operation; an
+    invalid operation does not change the state later operations see.
+    """
+    allowed_node_kinds = set(kinds.get("node", []))
+    allowed_edge_kinds = set(kinds.get("edge", []))
+
+    added_nodes: set[str] = set()
+    deleted_nodes: set[str] = set()
+    added_edges: set[tuple[str, str, str]] = set()
+    deleted_edges: set[tuple[str, str, str]] = set()
+
+    def node_exists(node_id: str) -> bool:
+        if node_id in deleted_nodes:
+            return False
+        return node_id in node_ids or node_id in added_nodes
+
+    def check(op: GraphChangeOperation) -> None:
+        if op.op == "add_node":
+            if not op.node:
+                raise ValueError("add_node requires node")
+            node = op.node
+            node_id = node.get("id")
+            if not node_id:
+                raise ValueError("add_node requires node.id")
+            if node_id in node_ids or node_id in added_nodes:
+                raise ValueError(f"Node already exists: {node_id}")
+            kind = node.get("kind")
+            if allowed_node_kinds and kind not in allowed_node_kinds:
+                raise ValueError(f"Invalid node kind: {kind}")
+            if not node.get("name") or not node.get("file") or not node.get("range"):
+                raise ValueError("add_node requires name, file, range")
+            added_nodes.add(node_id)
+        elif op.op == "update_node":
+            if not op.node_id or not op.patch:
+                raise ValueError("update_node requires node_id and patch")
+            if not node_exists(op.node_id):
+                raise ValueError(f"Node not found: {op.node_id}")
+            if "kind" in op.patch and allowed_node_kinds:
+                if op.patch["kind"] not in allowed_node_kinds:
+                    raise ValueError(f"Invalid node kind: {op.patch['kind']}")
+        elif op.op == "delete_node":
+            if not op.node_id:
+                raise ValueError("delete_node requires node_id")
+            if not node_exists(op.node_id):
+                raise ValueError(f"Node not found: {op.node_id}")
+            deleted_nodes.add(op.node_id)
+        elif op.op == "add_edge":
+            if not op.edge:
+                raise ValueError("add_edge requires edge")
+            edge = op.edge
+            from_id = edge.get("from")
+            to_id = edge.get("to")
+            kind = edge.get("kind")
+            if not from_id or not to_id or not kind:
+                raise ValueError("add_edge requires from, to, kind")
+            if allowed_edge_kinds and kind not in allowed_edge_kinds:
+                raise ValueError(f"Invalid edge kind: {kind}")
+            if not node_exists(from_id) or not node_exists(to_id):
+                raise ValueError("add_edge references unknown node")
+            key = (from_id, to_id, kind)
+            if key in edge_keys or key in added_edges:
+                raise ValueError("Edge already exists")
+            added_edges.add(key)
+        elif op.op == "delete_edge":
+            if not op.edge:
+                raise ValueError("delete_edge requires edge")
+            edge = op.edge
+            from_id = edge.get("from")
+            to_id = edge.get("to")
+            kind = edge.get("kind")
+            key = (from_id, to_id, kind)
+            if key not in edge_keys and key not in added_edges:
+                raise ValueError("Edge not found")
+            deleted_edges.add(key)
+        else:
+            raise ValueError(f"Unknown operation: {op.op}")
+
+    errors: list[tuple[int, str]] = []
+    for position, op in enumerate(operations):
+        try:
+            check(op)
+        except ValueError as exc:
+            errors.append((position, str(exc)))
+    return errors
+
+
 class GraphService:
-    def __init__(self, config: AppConfig) -> None:
+    def __init__(self, config: AppConfig, snapshots: SnapshotCache | None = None) -> None:
         self._config = config
+        self._snapshots = snapshots or SNAPSHOTS
+        self._hasher = FileHasher(config.hash_algorithm, workers=config.hash_workers)
+        self._index_cache: dict[str, tuple[tuple[int, int], GraphIndex]] = {}
+        self._shard_caches: dict[str, _ShardCache] = {}
+        self._sqlite_stores: dict[str, SqliteGraphStore] = {}
+        self._locks: dict[str, threading.RLock] = {}
+        self._locks_guard = threading.Lock()
+
+    def project_lock(self, project: str) -> threading.RLock:
+        """Serialises builds and graph writes of one project across threads."""
+        with self._locks_guard:
+            return self._locks.setdefault(project, threading.RLock())
 
     def _repo_root(self) -> str:
         return os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -85,6 +641,18 @@ class GraphService:
     def _graph_path(self, project: str) -> str:
         return os.path.join(self._graph_dir(), f"{project}.codegraph.json")
 
+    def _binary_graph_path(self, project: str) -> str:
+        return os.path.join(self._graph_dir(), f"{project}.codegraph.bin")
+
+    def _sharded(self) -> bool:
+        return self._config.graph_storage == "sharded"
+
+    def _storage_path(self, project: str) -> str:
+        """The file whose stamp identifies the stored graph (shard manifest or JSON)."""
+        if self._sharded():
+            return os.path.join(self._graph_dir(), f"{project}.shards.json")
+        return self._graph_path(project)
+
     def _proposal_dir(self, project: str) -> str:
         path = os.path.join(self._graph_dir(), "proposals", project)
         os.makedirs(path, exist_ok=True)
@@ -93,242 +661,883 @@ class GraphService:
     def _project_root(self, project: str) -> str:
         return os.path.join(self._config.base_path, project)
 
-    def _iter_code_files(self, project: str) -> Iterable[tuple[str, str]]:
+    def snapshot(self, project: str) -> ProjectSnapshot:
+        """The cached listing of a project with the configured ignore rules applied."""
         root = self._project_root(project)
+        rules = load_ignore_rules(root, self._config.ignore_patterns, self._config.use_gitignore)
+        return self._snapshots.get(root, rules)
+
+    def _iter_code_files(self, project: str) -> Iterable[tuple[str, str]]:
         extensions = {ext.lower().lstrip(".") for ext in self._config.allowed_extensions}
-        for current_root, _, filenames in os.walk(root):
-            for filename in filenames:
-                ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
-                if extensions and ext not in extensions:
-                    continue
-                full_path = os.path.join(current_root, filename)
-                rel_path = os.path.relpath(full_path, root).replace("\\", "/")
-                yield full_path, rel_path
+        for entry in self.snapshot(project).files():
+            if extensions and entry.extension not in extensions:
+                continue
+            yield entry.path, entry.rel_path
+
+    def _hash_tree_path(self, project: str) -> str:
+        return os.path.join(self._graph_dir(), f"{project}.hashtree.json")
+
+    def _hash_tree(
+        self, project: str, files: Iterable[tuple[str, str]] | None = None
+    ) -> HashTree:
+        """Loads the persisted hash tree and revalidates it against the project files."""
+        tree = HashTree(self._hash_tree_path(project), self._hasher).load()
+        if tree.refresh(self._iter_code_files(project) if files is None else files):
+            tree.save()
+        return tree
 
     def compute_code_hash(self, project: str) -> str:
-        """Computes a deterministic hash for the project files."""
+        """Computes a deterministic hash for the project files (Merkle root)."""
         if project not in self._config.projects:
             raise ValueError("Invalid project")
-        hasher = hashlib.sha256()
-        files = sorted(self._iter_code_files(project), key=lambda item: item[1])
-        for full_path, rel_path in files:
-            hasher.update(rel_path.encode("utf-8"))
-            with open(full_path, "rb") as handle:
-                hasher.update(handle.read())
-        return hasher.hexdigest()
-
-    def build(self, project: str) -> dict[str, Any]:
-        """Builds a code graph for a project and writes it to disk."""
+        return self._hash_tree(project).root
+
+    def refresh_hashes(self, project: str, graph: dict[str, Any]) -> None:
+        """Sets ``graph``'s code hash and per-file hashes from the current hash tree.
+
+        Used after proposals rewrite files, so the version recorded for the new
+        code hash carries the digests of the files it was written from.
+        """
+        tree = self._hash_tree(project)
+        graph["code_hash"] = tree.root
+        graph["hash_algorithm"] = tree.algorithm
+        graph["files"] = [
+            {"path": file_rel, "language": "python", "hash": tree.digest(file_rel)}
+            for file_rel in sorted(tree.files)
+            if file_rel.endswith(".py")
+        ]
+
+    def changed_since(self, project: str, code_hash: str) -> dict[str, Any]:
+        """Reports which directories changed since the tree with ``code_hash``."""
         if project not in self._config.projects:
             raise ValueError("Invalid project")
+        tree = self._hash_tree(project)
+        result = tree.changed_since(code_hash)
+        result["code_hash"] = tree.root
+        return result
 
-        nodes: list[Node] = []
-        edges: list[Edge] = []
-        files: list[dict[str, Any]] = []
-        node_id = 0
-
-        def next_id() -> str:
-            nonlocal node_id
-            node_id += 1
-            return f"n{node_id}"
-
-        def add_node(
-            kind: str,
-            name: str,
-            file_rel: str,
-            start_line: int | None,
-            end_line: int | None,
-            extra: dict[str, Any] | None = None,
-        ) -> str:
-            nid = next_id()
-            nodes.append(
-                Node(
-                    id=nid,
-                    kind=kind,
-                    name=name,
-                    file=file_rel,
-                    range=Range(start_line=start_line, end_line=end_line),
-                    extra=extra or {},
-                )
-            )
-            return nid
-
-        def add_edge(
-            from_id: str,
-            to_id: str,
-            kind: str,
-            extra: dict[str, Any] | None = None,
-        ) -> None:
-            edges.append(
-                Edge(
-                    from_id=from_id,
-                    to_id=to_id,
-                    kind=kind,
-                    extra=extra or {},
+    def _manifest_path(self, project: str) -> str:
+        return os.path.join(self._graph_dir(), f"{project}.manifest.json")
+
+    def _load_manifest(self, project: str) -> dict[str, Any]:
+        path = self._manifest_path(project)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, "r", encoding="UTF-8") as handle:
+                manifest = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("schema_version") != MANIFEST_VERSION:
+            return {}
+        return manifest
+
+    def _write_manifest(self, project: str, manifest: dict[str, Any]) -> None:
+        # ``json.dumps`` without indentation uses the C encoder; ``json.dump`` never does.
+        with open(self._manifest_path(project), "w", encoding="UTF-8") as handle:
+            handle.write(json.dumps(manifest, ensure_ascii=True))
+
+    def _storage_kind(self) -> list[str]:
+        return [self._config.graph_storage, self._config.graph_backend]
+
+    def _is_current(self, project: str, manifest: dict[str, Any], code_hash: str) -> bool:
+        """Whether the stored graph was written by a build of the tree with ``code_hash``."""
+        stamp = self._graph_stamp(self._storage_path(project))
+        return (
+            stamp is not None
+            and manifest.get("code_hash") == code_hash
+            and manifest.get("stamp") == list(stamp)
+            and manifest.get("storage") == self._storage_kind()
+        )
+
+    def _load_previous_graph(self, project: str) -> dict[str, Any] | None:
+        """The stored graph, from the resident index when it is cached.
+
+        Its nodes and edges are reused by the next graph, never modified.
+        """
+        try:
+            graph = self.load_index(project).graph
+        except (OSError, ValueError):
+            return None
+        if graph.get("project") != project:
+            return None
+        return graph
+
+    def _extract_file(self, full_path: str, file_rel: str) -> dict[str, Any] | None:
+        """Parses one python file into a fragment of nodes and edges with file-local ids."""
+        return extract_python_file(full_path, file_rel)
+
+    def _parse_cache(self) -> ParseCache:
+        return ParseCache(
+            os.path.join(self._graph_dir(), "cache", "parse"),
+            EXTRACTOR_VERSION,
+            self._config.parse_cache_max_bytes,
+        )
+
+    def _build_workers(self) -> int:
+        return self._config.build_workers or os.cpu_count() or 1
+
+    def _extract_files(self, jobs: list[tuple[str, str]]) -> list[dict[str, Any] | None]:
+        """Extracts fragments for many files, fanning out to a process pool when worthwhile.
+
+        Results are returned in job order so merging stays deterministic regardless of
+        the number of workers.
+        """
+        workers = min(self._build_workers(), len(jobs))
+        if workers <= 1 or len(jobs) < self._config.parallel_build_min_files:
+            return [self._extract_file(full_path, file_rel) for full_path, file_rel in jobs]
+        chunksize = max(1, len(jobs) // (workers * 4))
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as pool:
+                return list(
+                    pool.map(
+                        extract_python_file,
+                        [full_path for full_path, _ in jobs],
+                        [file_rel for _, file_rel in jobs],
+                        chunksize=chunksize,
+                    )
                 )
-            )
+        except (OSError, BrokenProcessPool):
+            return [self._extract_file(full_path, file_rel) for full_path, file_rel in jobs]
+
+    def build(self, project: str, incremental: bool = True) -> dict[str, Any]:
+        """Builds a code graph for a project and writes it to disk.
+
+        With ``incremental`` the per-file manifest from the previous build is used
+        to re-parse only added or changed files; unchanged files keep their nodes.
+        Files whose content was parsed before, in any project, come from the parse
+        cache.
+        """
+        if project not in self._config.projects:
+            raise ValueError("Invalid project")
+        with self.project_lock(project):
+            return self._build(project, incremental)
 
+    def _build(self, project: str, incremental: bool) -> dict[str, Any]:
+        manifest = self._load_manifest(project) if incremental else {}
         project_root = self._project_root(project)
-        for full_path, file_rel in self._iter_code_files(project):
+        code_files = sorted(self._iter_code_files(project), key=lambda item: item[1])
+        tree = self._hash_tree(project, code_files)
+        if manifest and self._is_current(project, manifest, tree.root):
+            return self.load_index(project).graph
+
+        previous_graph = self._load_previous_graph(project) if manifest else None
+        previous_files: dict[str, Any] = manifest.get("files", {}) if previous_graph else {}
+
+        previous_nodes: dict[str, list[dict[str, Any]]] = {}
+        previous_edges: dict[str, list[dict[str, Any]]] = {}
+        previous_fragment_edges: dict[str, list[dict[str, Any]]] = {}
+        if previous_graph:
+            node_files: dict[str, str] = {}
+            for node in previous_graph.get("nodes", []):
+                node_files[node["id"]] = node.get("file", "")
+                previous_nodes.setdefault(node.get("file", ""), []).append(node)
+            for edge in previous_graph.get("edges", []):
+                owner = node_files.get(edge.get("from"))
+                if owner is None:
+                    continue
+                previous_fragment_edges.setdefault(owner, []).append(edge)
+                if edge.get("kind") not in RESOLVED_EDGE_KINDS:
+                    previous_edges.setdefault(owner, []).append(edge)
+
+        nodes: list[dict[str, Any]] = []
+        edges: list[dict[str, Any]] = []
+        files: list[dict[str, Any]] = []
+        refs: dict[str, list[list[Any]]] = {}
+        manifest_files: dict[str, Any] = {}
+
+        parse_cache = self._parse_cache()
+        plan: list[tuple[str, str | None]] = []
+        jobs: list[tuple[str, str]] = []
+        fragments: dict[str, dict[str, Any] | None] = {}
+        for full_path, file_rel in code_files:
             if not file_rel.endswith(".py"):
                 continue
-            files.append({"path": file_rel, "language": "python"})
-            try:
-                with open(full_path, "r", encoding="UTF-8") as handle:
-                    source = handle.read()
-                tree = ast.parse(source, filename=full_path)
-            except (SyntaxError, OSError):
+            digest = tree.digest(file_rel)
+            files.append({"path": file_rel, "language": "python", "hash": digest})
+            if digest is None:
                 continue
+            manifest_files[file_rel] = {"hash": digest}
 
-                module_id = add_node(
-                    "module",
-                    os.path.splitext(filename)[0],
-                    file_rel,
-                    1,
-                    getattr(tree, "end_lineno", None),
-                    extra={},
-                )
+            previous = previous_files.get(file_rel)
+            if previous and previous.get("hash") == digest and file_rel in previous_nodes:
+                plan.append((file_rel, None))
+                continue
+            plan.append((file_rel, full_path))
+            hit, fragment = parse_cache.get(tree.algorithm, digest)
+            if hit:
+                fragments[file_rel] = relocate_fragment(fragment, file_rel) if fragment else None
+            else:
+                jobs.append((full_path, file_rel))
 
-                class_stack: list[str] = []
-
-                class Visitor(ast.NodeVisitor):
-                    def visit_ClassDef(self, node: ast.ClassDef) -> None:
-                        bases = []
-                        for base in node.bases:
-                            if isinstance(base, ast.Name):
-                                bases.append(base.id)
-                            elif isinstance(base, ast.Attribute):
-                                bases.append(base.attr)
-                        class_id = add_node(
-                            "class",
-                            node.name,
-                            file_rel,
-                            node.lineno,
-                            getattr(node, "end_lineno", node.lineno),
-                            extra={"bases": bases},
-                        )
-                        add_edge(module_id, class_id, "defines")
-                        if class_stack:
-                            add_edge(class_stack[-1], class_id, "defines")
-                        class_stack.append(class_id)
-                        self.generic_visit(node)
-                        class_stack.pop()
-
-                    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
-                        self._handle_function(node)
-
-                    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
-                        self._handle_function(node)
-
-                    def _handle_function(self, node: ast.AST) -> None:
-                        name = getattr(node, "name", "<lambda>")
-                        kind = "method" if class_stack else "function"
-                        func_id = add_node(
-                            kind,
-                            name,
-                            file_rel,
-                            getattr(node, "lineno", None),
-                            getattr(node, "end_lineno", None),
-                            extra={},
-                        )
-                        add_edge(module_id, func_id, "defines")
-                        if class_stack:
-                            add_edge(class_stack[-1], func_id, "belongs_to")
-                        self.generic_visit(node)
-
-                    def visit_Import(self, node: ast.Import) -> None:
-                        for alias in node.names:
-                            imp_id = add_node(
-                                "import",
-                                alias.name,
-                                file_rel,
-                                node.lineno,
-                                getattr(node, "end_lineno", node.lineno),
-                                extra={"asname": alias.asname},
-                            )
-                            add_edge(module_id, imp_id, "imports")
-                        self.generic_visit(node)
-
-                    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
-                        module = node.module or ""
-                        for alias in node.names:
-                            name = f"{module}.{alias.name}" if module else alias.name
-                            imp_id = add_node(
-                                "import",
-                                name,
-                                file_rel,
-                                node.lineno,
-                                getattr(node, "end_lineno", node.lineno),
-                                extra={"level": node.level, "asname": alias.asname},
-                            )
-                            add_edge(module_id, imp_id, "imports")
-                        self.generic_visit(node)
-
-                Visitor().visit(tree)
-
-        graph = Graph(
-            schema_version="0.1.0",
-            project=project,
-            generated_at=datetime.now(timezone.utc).isoformat(),
-            root=project_root.replace("\\", "/"),
-            nodes=nodes,
-            edges=edges,
-            files=files,
-            kinds={
+        for (_, file_rel), fragment in zip(jobs, self._extract_files(jobs)):
+            parse_cache.put(tree.algorithm, manifest_files[file_rel]["hash"], fragment)
+            fragments[file_rel] = fragment
+        if jobs:
+            parse_cache.prune()
+
+        for file_rel, full_path in plan:
+            if full_path is None:
+                nodes.extend(previous_nodes[file_rel])
+                edges.extend(previous_edges.get(file_rel, []))
+                refs[file_rel] = previous_files[file_rel].get("refs", [])
+                continue
+            fragment = fragments.get(file_rel)
+            if fragment is None:
+                continue
+            id_map = assign_stable_ids(fragment)
+            for node in fragment["nodes"]:
+                node["id"] = id_map[node["id"]]
+                nodes.append(node)
+            for edge in fragment["edges"]:
+                edge["from"] = id_map[edge["from"]]
+                edge["to"] = id_map[edge["to"]]
+                edges.append(edge)
+            refs[file_rel] = [[id_map[ref[0]], *ref[1:]] for ref in fragment.get("refs", [])]
+
+        for file_rel, file_refs in refs.items():
+            manifest_files[file_rel]["refs"] = file_refs
+        edges.extend(_resolve_refs(nodes, refs))
+
+        live_ids = {node["id"] for node in nodes}
+        edges = [
+            edge for edge in edges if edge.get("from") in live_ids and edge.get("to") in live_ids
+        ]
+
+        # Built as plain dicts: nodes and edges come from the extractor, and
+        # re-validating every one through ``Graph`` dominated large builds.
+        graph_dict = {
+            "schema_version": "0.1.0",
+            "project": project,
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "root": project_root.replace("\\", "/"),
+            "nodes": nodes,
+            "edges": edges,
+            "files": files,
+            "kinds": {
                 "node": ["module", "class", "function", "method", "import"],
-                "edge": ["defines", "belongs_to", "imports"],
+                "edge": ["defines", "belongs_to", "imports", *RESOLVED_EDGE_KINDS],
             },
-            extensions={},
-            code_hash=self.compute_code_hash(project),
-        )
+            "extensions": {},
+            "code_hash": tree.root,
+            "hash_algorithm": tree.algorithm,
+        }
+        changed_files = None
+        known_fragments: dict[str, str] = {}
+        if previous_graph:
+            changed_files = {file_rel for file_rel, full_path in plan if full_path is not None}
+            changed_files.update(set(previous_nodes) - set(manifest_files))
+            known_fragments = self._unchanged_fragments(
+                project, previous_graph, graph_dict, changed_files, previous_fragment_edges
+            )
+        self.write_graph(project, graph_dict, changed_files, known_fragments)
 
-        graph_dict = _model_dump(graph)
-        with open(self._graph_path(project), "w", encoding="UTF-8") as handle:
-            json.dump(graph_dict, handle, indent=2, ensure_ascii=True)
+        stamp = self._graph_stamp(self._storage_path(project))
+        self._write_manifest(
+            project,
+            {
+                "schema_version": MANIFEST_VERSION,
+                "code_hash": tree.root,
+                "stamp": list(stamp) if stamp else None,
+                "storage": self._storage_kind(),
+                "files": manifest_files,
+            },
+        )
 
         return graph_dict
 
-    def query(self, project: str, term: str, kind: str | None = None) -> dict[str, Any]:
-        """Query nodes by name/file and return matching nodes with related edges."""
+    def _unchanged_fragments(
+        self,
+        project: str,
+        previous_graph: dict[str, Any],
+        graph: dict[str, Any],
+        changed_files: set[str],
+        previous_edges: dict[str, list[dict[str, Any]]],
+    ) -> dict[str, str]:
+        """Stored fragment keys of the files whose nodes and edges did not change.
+
+        Unchanged files keep their node objects; their fragment is only reused when
+        the re-resolved edges leaving them are also equal to the previous ones.
+        """
+        previous_keys = self._versions(project).files(previous_graph.get("code_hash", ""))
+        if not previous_keys:
+            return {}
+        node_files = {node["id"]: node.get("file", "") for node in graph["nodes"]}
+        edges: dict[str, list[dict[str, Any]]] = {}
+        for edge in graph["edges"]:
+            edges.setdefault(node_files[edge["from"]], []).append(edge)
+        return {
+            file_rel: key
+            for file_rel, key in previous_keys.items()
+            if file_rel not in changed_files
+            and edges.get(file_rel, []) == previous_edges.get(file_rel, [])
+        }
+
+    def _graph_stamp(self, graph_path: str) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(graph_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _trigram_path(self, project: str) -> str:
+        return os.path.join(self._graph_dir(), f"{project}.trigrams.json")
+
+    def _write_trigrams(self, project: str, index: GraphIndex) -> None:
+        self._save_trigrams(project, index.graph, index.trigram_index())
+
+    def _save_trigrams(
+        self, project: str, header: dict[str, Any], trigrams: TrigramIndex
+    ) -> None:
+        data = {
+            "schema_version": TRIGRAM_INDEX_VERSION,
+            "code_hash": header.get("code_hash", ""),
+            "generated_at": header.get("generated_at"),
+            **trigrams.to_dict(),
+        }
+        with open(self._trigram_path(project), "w", encoding="UTF-8") as handle:
+            handle.write(json.dumps(data, ensure_ascii=True))
+
+    def _read_trigrams(self, project: str, header: dict[str, Any]) -> TrigramIndex | None:
+        """The persisted trigram index, if it was written for the graph with ``header``."""
+        path = self._trigram_path(project)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="UTF-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if (
+            data.get("schema_version") == TRIGRAM_INDEX_VERSION
+            and data.get("code_hash") == header.get("code_hash", "")
+            and data.get("generated_at") == header.get("generated_at")
+        ):
+            return TrigramIndex.from_dict(data)
+        return None
+
+    def _load_trigrams(self, project: str, index: GraphIndex) -> None:
+        """Attaches the persisted trigram index when it belongs to the loaded graph."""
+        trigrams = self._read_trigrams(project, index.graph)
+        if trigrams is not None:
+            index.trigrams = trigrams
+
+    def _sqlite_store(self, project: str) -> SqliteGraphStore:
+        store = self._sqlite_stores.get(project)
+        if store is None:
+            store = SqliteGraphStore(
+                os.path.join(self._graph_dir(), f"{project}.codegraph.sqlite")
+            )
+            self._sqlite_stores[project] = store
+        return store
+
+    def write_graph(
+        self,
+        project: str,
+        graph: dict[str, Any],
+        changed_files: Iterable[str] | None = None,
+        known_fragments: dict[str, str] | None = None,
+    ) -> None:
+        """Writes the JSON export, the binary form and the trigram index, and caches it.
+
+        With the sqlite backend the database is updated too, limited to
+        ``changed_files`` when given. ``known_fragments`` are the stored fragment
+        keys of files whose nodes and edges are unchanged.
+        """
+        with self.project_lock(project):
+            self._write_graph(project, graph, changed_files, known_fragments)
+
+    def _write_graph(
+        self,
+        project: str,
+        graph: dict[str, Any],
+        changed_files: Iterable[str] | None,
+        known_fragments: dict[str, str] | None = None,
+    ) -> None:
+        if self._config.graph_backend == "sqlite":
+            self._sqlite_store(project).write_graph(
+                graph, changed_files, replace_edge_kinds=RESOLVED_EDGE_KINDS
+            )
+        if self._sharded():
+            self._shards(project).write(graph, known_fragments)
+        else:
+            graph_path = self._graph_path(project)
+            with open(graph_path, "w", encoding="UTF-8") as handle:
+                handle.write(json.dumps(graph, ensure_ascii=True))
+            stamp = self._graph_stamp(graph_path)
+            write_binary_graph(
+                self._binary_graph_path(project),
+                graph,
+                stamp={"mtime_ns": stamp[0], "size": stamp[1]} if stamp else None,
+            )
+            self._versions(project).record(graph, known_fragments)
+        previous = self._index_cache.get(project)
+        stamp = self._graph_stamp(self._storage_path(project))
+        index = GraphIndex(graph)
+        if previous is not None and previous[1].trigrams is not None:
+            # Names and paths rarely change between builds; keep the postings then.
+            trigrams = previous[1].trigrams
+            if trigrams.keys == sorted({*index.by_name, *index.by_file}):
+                index.trigrams = trigrams
+        self._write_trigrams(project, index)
+        if stamp is not None:
+            self._index_cache[project] = (stamp, index)
+
+    def _shards(self, project: str) -> ShardedGraphStore:
+        return ShardedGraphStore(self._storage_path(project), self._versions(project))
+
+    def load_partial(
+        self, project: str, node_ids: Iterable[str] = (), files: Iterable[str] = ()
+    ) -> dict[str, Any]:
+        """Loads the part of the graph owning ``node_ids`` and ``files``.
+
+        With sharded storage only those files' shards are read and the graph carries
+        ``partial_files``; otherwise the whole graph is returned.
+        """
+        if project not in self._config.projects:
+            raise ValueError("Invalid project")
+        if not self._sharded():
+            return self.load_graph(project)
+        return self._shards(project).load_partial(node_ids, files)
+
+    def write_partial(self, project: str, graph: dict[str, Any]) -> None:
+        """Writes back a graph returned by ``load_partial``."""
+        if "partial_files" not in graph:
+            self.write_graph(project, graph)
+            return
+        with self.project_lock(project):
+            if self._config.graph_backend == "sqlite":
+                self._sqlite_store(project).write_graph(
+                    {k: v for k, v in graph.items() if k != "partial_files"},
+                    graph["partial_files"],
+                )
+            self._shards(project).write_partial(graph)
+            self._index_cache.pop(project, None)
+
+    def known_node_ids(self, project: str, node_ids: Iterable[str]) -> set[str]:
+        """Which of ``node_ids`` exist in the stored graph, without loading shards."""
+        node_ids = set(node_ids)
+        if self._sharded():
+            return node_ids & self._shards(project).node_ids()
+        index = self.load_index(project)
+        return {node_id for node_id in node_ids if node_id in index.nodes_by_id}
+
+    def _open_binary_graph(
+        self, project: str, stamp: tuple[int, int]
+    ) -> BinaryGraphReader | None:
+        """Opens the binary graph when it was written from the current JSON graph."""
+        path = self._binary_graph_path(project)
+        if not os.path.exists(path):
+            return None
+        try:
+            reader = BinaryGraphReader(path)
+        except (OSError, ValueError):
+            return None
+        source = reader.header.get("source_stamp") or {}
+        if (source.get("mtime_ns"), source.get("size")) != stamp:
+            reader.close()
+            return None
+        return reader
+
+    def _versions(self, project: str) -> GraphVersionStore:
+        return GraphVersionStore(
+            os.path.join(self._graph_dir(), "versions", project),
+            os.path.join(self._graph_dir(), f"{project}.versions.json"),
+            self._config.graph_versions_max,
+            self._config.graph_versions_max_bytes,
+        )
+
+    def diff(
+        self, project: str, from_hash: str | None = None, to_hash: str | None = None
+    ) -> dict[str, Any]:
+        """Structural diff between two graph versions, compared file by file.
+
+        Without ``to_hash`` the current tree is built (incrementally) and compared
+        with ``from_hash`` or, by default, the graph stored before that build.
+        Without ``from_hash`` the version recorded before ``to_hash`` is used.
+        """
         if project not in self._config.projects:
             raise ValueError("Invalid project")
+        with self.project_lock(project):
+            versions = self._versions(project)
+            recorded = [version["code_hash"] for version in versions.versions()]
+            if to_hash is None:
+                if not recorded and self._graph_stamp(self._storage_path(project)):
+                    versions.record(self.load_graph(project))
+                    recorded = [version["code_hash"] for version in versions.versions()]
+                previous = recorded[-1] if recorded else None
+                to_hash = self.build(project)["code_hash"]
+                from_hash = from_hash or previous or to_hash
+            elif from_hash is None:
+                if to_hash not in recorded:
+                    raise ValueError(f"Unknown code hash: {to_hash}")
+                position = recorded.index(to_hash)
+                from_hash = recorded[position - 1] if position else to_hash
+            result = versions.diff(from_hash, to_hash)
+        return {"project": project, "from_hash": from_hash, "to_hash": to_hash, **result}
+
+    def load_graph(self, project: str) -> dict[str, Any]:
+        """Loads a fresh copy of the graph, preferring the binary form over JSON."""
+        if project not in self._config.projects:
+            raise ValueError("Invalid project")
+        if self._sharded():
+            return self._shards(project).load()
         graph_path = self._graph_path(project)
-        if not os.path.exists(graph_path):
+        stamp = self._graph_stamp(graph_path)
+        if stamp is None:
             raise ValueError("Graph not found, build it first")
-
+        reader = self._open_binary_graph(project, stamp)
+        if reader is not None:
+            with reader:
+                return reader.to_graph()
         with open(graph_path, "r", encoding="UTF-8") as handle:
-            graph = json.load(handle)
-
-        nodes = graph.get("nodes", [])
-        edges = graph.get("edges", [])
-
-        term_lower = term.lower()
-        matches = [
-            node
-            for node in nodes
-            if (
-                (not kind or node.get("kind") == kind)
-                and (
-                    term_lower in str(node.get("name", "")).lower()
-                    or term_lower in str(node.get("file", "")).lower()
-                )
-            )
-        ]
-        matched_ids = {node["id"] for node in matches}
-        related_edges = [
-            edge
-            for edge in edges
-            if edge.get("from") in matched_ids or edge.get("to") in matched_ids
-        ]
+            return json.load(handle)
+
+    def summary(self, project: str, graph: dict[str, Any]) -> dict[str, Any]:
+        """Counts and identifying metadata of a graph, without its nodes and edges."""
+        node_kinds: dict[str, int] = {}
+        for node in graph.get("nodes", []):
+            kind = node.get("kind", "")
+            node_kinds[kind] = node_kinds.get(kind, 0) + 1
+        return {
+            "project": project,
+            "code_hash": graph.get("code_hash"),
+            "hash_algorithm": graph.get("hash_algorithm"),
+            "generated_at": graph.get("generated_at"),
+            "path": self._storage_path(project).replace("\\", "/"),
+            "node_count": len(graph.get("nodes", [])),
+            "edge_count": len(graph.get("edges", [])),
+            "file_count": len(graph.get("files", [])),
+            "node_kinds": dict(sorted(node_kinds.items())),
+        }
+
+    def _ndjson_path(self, project: str, path: str | None = None) -> str:
+        """Resolves an NDJSON path relative to the graphs folder, refusing paths outside it."""
+        graph_dir = os.path.realpath(self._graph_dir())
+        full_path = os.path.realpath(
+            os.path.join(graph_dir, path or f"{project}.codegraph.ndjson")
+        )
+        if os.path.commonpath([graph_dir, full_path]) != graph_dir:
+            raise ValueError("NDJSON path must be inside the graphs directory")
+        return full_path
+
+    def export_ndjson(self, project: str, path: str | None = None) -> dict[str, Any]:
+        """Streams the stored graph to NDJSON, one header, node or edge per line.
+
+        Nodes and edges are read one at a time from the binary graph, or one
+        fragment at a time with sharded storage, so the full graph is never held in
+        memory when either is available.
+        """
+        if project not in self._config.projects:
+            raise ValueError("Invalid project")
+        path = self._ndjson_path(project, path)
+        with self.project_lock(project):
+            if self._sharded():
+                manifest = self._shards(project).manifest()
+                versions = self._versions(project)
+                fragments = (versions.fragment(key) for key in manifest["files"].values())
+                lines = write_ndjson(path, fragment_records(manifest["header"], fragments))
+            else:
+                stamp = self._graph_stamp(self._graph_path(project))
+                if stamp is None:
+                    raise ValueError("Graph not found, build it first")
+                reader = self._open_binary_graph(project, stamp)
+                if reader is not None:
+                    with reader:
+                        header = reader.to_header()
+                        lines = write_ndjson(
+                            path, ndjson_records(header, reader.nodes(), reader.edges())
+                        )
+                else:
+                    graph = self.load_graph(project)
+                    lines = write_ndjson(
+                        path, ndjson_records(graph, graph["nodes"], graph["edges"])
+                    )
+        return {"project": project, "path": path.replace("\\", "/"), "lines": lines}
+
+    def import_ndjson(self, project: str, path: str | None = None) -> dict[str, Any]:
+        """Reads an NDJSON export and stores it as the project's graph; returns a summary.
+
+        The build manifest is removed, so the next build re-parses every file
+        instead of reusing the imported nodes.
+        """
+        if project not in self._config.projects:
+            raise ValueError("Invalid project")
+        graph = load_ndjson(self._ndjson_path(project, path))
+        if graph.get("project") not in (None, project):
+            raise ValueError(f"NDJSON export belongs to project {graph['project']}")
+        graph = validate_graph({**graph, "project": project})
+        with self.project_lock(project):
+            self.write_graph(project, graph)
+            try:
+                os.remove(self._manifest_path(project))
+            except FileNotFoundError:
+                pass
+        return self.summary(project, graph)
+
+    def load_index(self, project: str) -> GraphIndex:
+        """Returns the indexed graph, reloading it only when the graph file changed."""
+        if project not in self._config.projects:
+            raise ValueError("Invalid project")
+        stamp = self._graph_stamp(self._storage_path(project))
+        if stamp is None:
+            self._index_cache.pop(project, None)
+            raise ValueError("Graph not found, build it first")
+        cached = self._index_cache.get(project)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        index = GraphIndex(self.load_graph(project))
+        self._load_trigrams(project, index)
+        self._index_cache[project] = (stamp, index)
+        return index
+
+    def query(
+        self,
+        project: str,
+        term: str,
+        kind: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> dict[str, Any]:
+        """Query nodes by name/file and return ranked matching nodes with related edges.
+
+        ``match_count`` is the total number of matches; ``limit``/``offset`` page them.
+        """
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError("limit and offset must be non-negative")
+        if self._config.graph_backend == "sqlite":
+            if project not in self._config.projects:
+                raise ValueError("Invalid project")
+            store = self._sqlite_store(project)
+            if not store.exists():
+                raise ValueError("Graph not found, build it first")
+            return store.query(term, kind, limit=limit, offset=offset)
+        if self._sharded() and not self._index_is_resident(project):
+            if project not in self._config.projects:
+                raise ValueError("Invalid project")
+            return self._query_shards(project, term, kind, limit, offset)
+        index = self.load_index(project)
+        ranked = index.search(term, kind)
+        end = None if limit is None else offset + limit
+        matches = ranked[offset:end]
+        related_edges = index.related_edges(node["id"] for node in matches)
 
         return {
             "matches": matches,
             "related_edges": related_edges,
-            "match_count": len(matches),
+            "match_count": len(ranked),
+            "offset": offset,
+            "limit": limit,
+        }
+
+    def _index_is_resident(self, project: str) -> bool:
+        cached = self._index_cache.get(project)
+        return cached is not None and cached[0] == self._graph_stamp(self._storage_path(project))
+
+    def _shard_cache(self, project: str) -> _ShardCache:
+        """The project's sharded query state, rebuilt when the shard manifest changes.
+
+        Fragments are content addressed, so those still listed by a new manifest
+        are carried over instead of being read again.
+        """
+        stamp = self._graph_stamp(self._storage_path(project))
+        if stamp is None:
+            self._shard_caches.pop(project, None)
+            raise ValueError("Graph not found, build it first")
+        cached = self._shard_caches.get(project)
+        if cached is not None and cached.stamp == stamp:
+            return cached
+        shards = self._shards(project)
+        manifest = shards.manifest()
+        index = shards.index(manifest)
+        files_by_key: dict[str, list[str]] = {}
+        for file_rel, names in index["file_names"].items():
+            for name in names:
+                files_by_key.setdefault(name, []).append(file_rel)
+            files_by_key.setdefault(file_rel.lower(), []).append(file_rel)
+        callers: dict[str, list[str]] = {}
+        for file_rel, targets in index["file_targets"].items():
+            for node_id in targets:
+                callers.setdefault(node_id, []).append(file_rel)
+        trigrams = self._read_trigrams(project, manifest["header"])
+        if trigrams is None:
+            trigrams = TrigramIndex.from_keys(files_by_key)
+            self._save_trigrams(project, manifest["header"], trigrams)
+        live = set(manifest["files"].values())
+        fragments = {
+            key: fragment
+            for key, fragment in (cached.fragments.items() if cached is not None else ())
+            if key in live
+        }
+        cache = _ShardCache(stamp, manifest, trigrams, files_by_key, callers, fragments)
+        self._shard_caches[project] = cache
+        return cache
+
+    def _query_shards(
+        self, project: str, term: str, kind: str | None, limit: int | None, offset: int
+    ) -> dict[str, Any]:
+        """``query`` over sharded storage, loading only the shards that can match.
+
+        The trigram index maps the term to matching names and paths, and those map
+        to files. A second, smaller load adds the shards whose edges point at the
+        returned matches, so ``related_edges`` stays complete. Shards read once
+        stay cached in memory until they are replaced.
+        """
+        shards = self._shards(project)
+        cache = self._shard_cache(project)
+        wanted = {
+            file_rel
+            for key in cache.trigrams.lookup(term.lower())
+            for file_rel in cache.files_by_key.get(key, ())
+        }
+        index = GraphIndex(shards.load_files(wanted, cache.manifest, cache.fragments))
+        index.trigrams = cache.trigrams
+        ranked = index.search(term, kind)
+        end = None if limit is None else offset + limit
+        matches = ranked[offset:end]
+        callers = {
+            file_rel
+            for node in matches
+            for file_rel in cache.callers.get(node["id"], ())
+            if file_rel not in wanted
+        }
+        if callers:
+            index = GraphIndex(
+                shards.load_files(wanted | callers, cache.manifest, cache.fragments)
+            )
+        return {
+            "matches": matches,
+            "related_edges": index.related_edges(node["id"] for node in matches),
+            "match_count": len(ranked),
+            "offset": offset,
+            "limit": limit,
+        }
+
+    def _traversal_start(self, index: GraphIndex, node_id: str) -> int:
+        position = index.csr().position.get(node_id)
+        if position is None:
+            raise ValueError(f"Node not found: {node_id}")
+        return position
+
+    def _traversal_result(
+        self, index: GraphIndex, distances: dict[int, int], edge_positions: Iterable[int]
+    ) -> dict[str, Any]:
+        csr = index.csr()
+        ordered = sorted(distances, key=lambda idx: (distances[idx], idx))
+        return {
+            "nodes": [index.nodes[idx] for idx in ordered],
+            "edges": [index.edges[pos] for pos in sorted(set(edge_positions))],
+            "distances": {csr.node_ids[idx]: distances[idx] for idx in ordered},
+            "node_count": len(ordered),
+        }
+
+    def neighborhood(
+        self,
+        project: str,
+        node_id: str,
+        hops: int = 1,
+        direction: str = "both",
+        edge_kinds: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Nodes within ``hops`` edges of ``node_id`` and the edges connecting them."""
+        if hops < 0:
+            raise ValueError("hops must be non-negative")
+        index = self.load_index(project)
+        start = self._traversal_start(index, node_id)
+        distances, edges = index.csr().bfs([start], direction, edge_kinds, max_depth=hops)
+        return self._traversal_result(index, distances, edges)
+
+    def dependencies(
+        self,
+        project: str,
+        node_id: str,
+        edge_kinds: list[str] | None = None,
+        max_depth: int | None = None,
+    ) -> dict[str, Any]:
+        """Transitive closure over outgoing edges (what ``node_id`` depends on)."""
+        index = self.load_index(project)
+        start = self._traversal_start(index, node_id)
+        distances, edges = index.csr().bfs([start], "out", edge_kinds, max_depth=max_depth)
+        return self._traversal_result(index, distances, edges)
+
+    def dependents(
+        self,
+        project: str,
+        node_id: str,
+        edge_kinds: list[str] | None = None,
+        max_depth: int | None = None,
+    ) -> dict[str, Any]:
+        """Transitive closure over incoming edges (what depends on ``node_id``)."""
+        index = self.load_index(project)
+        start = self._traversal_start(index, node_id)
+        distances, edges = index.csr().bfs([start], "in", edge_kinds, max_depth=max_depth)
+        return self._traversal_result(index, distances, edges)
+
+    def shortest_path(
+        self,
+        project: str,
+        from_id: str,
+        to_id: str,
+        direction: str = "both",
+        edge_kinds: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Shortest path between two nodes; ``found`` is False when they are not connected."""
+        index = self.load_index(project)
+        source = self._traversal_start(index, from_id)
+        target = self._traversal_start(index, to_id)
+        path = index.csr().shortest_path(source, target, direction, edge_kinds)
+        if path is None:
+            return {"found": False, "nodes": [], "edges": [], "length": None}
+        nodes, edge_positions = path
+        return {
+            "found": True,
+            "nodes": [index.nodes[idx] for idx in nodes],
+            "edges": [index.edges[pos] for pos in edge_positions],
+            "length": len(edge_positions),
+        }
+
+    def _sqlite_membership(
+        self, project: str, proposal: GraphProposal
+    ) -> tuple[set[str], set[tuple[str, str, str]], dict[str, list[str]]]:
+        """Looks up only the node ids and edge keys a proposal references."""
+        store = self._sqlite_store(project)
+        header = store.header()
+        if "code_hash" not in header:
+            raise ValueError("Graph not found, build it first")
+        referenced_nodes, referenced_edges = _proposal_references(proposal)
+        return (
+            store.existing_nodes(referenced_nodes),
+            store.existing_edges(referenced_edges),
+            header.get("kinds", {}),
+        )
+
+    def _sharded_membership(
+        self, project: str, proposal: GraphProposal
+    ) -> tuple[set[str], set[tuple[str, str, str]], dict[str, list[str]]]:
+        """Loads only the shards owning the ``from`` nodes of referenced edges."""
+        shards = self._shards(project)
+        referenced_nodes, referenced_edges = _proposal_references(proposal)
+        manifest = shards.manifest()
+        index = shards.index(manifest)
+        node_ids = index["node_files"].keys()
+        partial = shards.load_partial(
+            node_ids=[key[0] for key in referenced_edges], manifest=manifest, index=index
+        )
+        edge_keys = {
+            (edge.get("from"), edge.get("to"), edge.get("kind")) for edge in partial["edges"]
         }
+        return (
+            referenced_nodes.intersection(node_ids),
+            referenced_edges & edge_keys,
+            partial.get("kinds", {}),
+        )
 
     def save_proposal(self, project: str, proposal: dict[str, Any]) -> dict[str, Any]:
-        """Validates and stores a graph change proposal."""
+        """Validates and stores a graph change proposal.
+
+        Operations are checked against the cached ``GraphIndex`` (or the sqlite
+        database, or the relevant shards), so the stored graph is not re-read.
+        """
         if project not in self._config.projects:
             raise ValueError("Invalid project")
 
@@ -339,101 +1548,347 @@ class GraphService:
         proposal_model = GraphProposal(**proposal_copy)
         if proposal_model.project != project:
             raise ValueError("Proposal project mismatch")
+        base_graph = None
         if proposal_model.base_code_hash != current_hash:
-            raise ValueError("Code hash mismatch")
-
-        graph_path = self._graph_path(project)
-        if not os.path.exists(graph_path):
-            raise ValueError("Graph not found, build it first")
-        with open(graph_path, "r", encoding="UTF-8") as handle:
-            graph = json.load(handle)
+            # Proposals made against an older tree are checked against its snapshot.
+            base_graph = self._versions(project).graph(proposal_model.base_code_hash)
+            if base_graph is None:
+                raise ValueError("Code hash mismatch")
 
-        node_ids = {node["id"] for node in graph.get("nodes", [])}
-        edge_keys = {
-            (edge.get("from"), edge.get("to"), edge.get("kind"))
-            for edge in graph.get("edges", [])
-        }
-        allowed_node_kinds = set(graph.get("kinds", {}).get("node", []))
-        allowed_edge_kinds = set(graph.get("kinds", {}).get("edge", []))
-
-        added_nodes: set[str] = set()
-        deleted_nodes: set[str] = set()
-        added_edges: set[tuple[str, str, str]] = set()
-        deleted_edges: set[tuple[str, str, str]] = set()
-
-        def node_exists(node_id: str) -> bool:
-            if node_id in deleted_nodes:
-                return False
-            return node_id in node_ids or node_id in added_nodes
-
-        for op in proposal_model.operations:
-            if op.op == "add_node":
-                if not op.node:
-                    raise ValueError("add_node requires node")
-                node = op.node
-                node_id = node.get("id")
-                if not node_id:
-                    raise ValueError("add_node requires node.id")
-                if node_id in node_ids or node_id in added_nodes:
-                    raise ValueError(f"Node already exists: {node_id}")
-                kind = node.get("kind")
-                if allowed_node_kinds and kind not in allowed_node_kinds:
-                    raise ValueError(f"Invalid node kind: {kind}")
-                if not node.get("name") or not node.get("file") or not node.get("range"):
-                    raise ValueError("add_node requires name, file, range")
-                added_nodes.add(node_id)
-            elif op.op == "update_node":
-                if not op.node_id or not op.patch:
-                    raise ValueError("update_node requires node_id and patch")
-                if not node_exists(op.node_id):
-                    raise ValueError(f"Node not found: {op.node_id}")
-                if "kind" in op.patch and allowed_node_kinds:
-                    if op.patch["kind"] not in allowed_node_kinds:
-                        raise ValueError(f"Invalid node kind: {op.patch['kind']}")
-            elif op.op == "delete_node":
-                if not op.node_id:
-                    raise ValueError("delete_node requires node_id")
-                if not node_exists(op.node_id):
-                    raise ValueError(f"Node not found: {op.node_id}")
-                deleted_nodes.add(op.node_id)
-            elif op.op == "add_edge":
-                if not op.edge:
-                    raise ValueError("add_edge requires edge")
-                edge = op.edge
-                from_id = edge.get("from")
-                to_id = edge.get("to")
-                kind = edge.get("kind")
-                if not from_id or not to_id or not kind:
-                    raise ValueError("add_edge requires from, to, kind")
-                if allowed_edge_kinds and kind not in allowed_edge_kinds:
-                    raise ValueError(f"Invalid edge kind: {kind}")
-                if not node_exists(from_id) or not node_exists(to_id):
-                    raise ValueError("add_edge references unknown node")
-                key = (from_id, to_id, kind)
-                if key in edge_keys or key in added_edges:
-                    raise ValueError("Edge already exists")
-                added_edges.add(key)
-            elif op.op == "delete_edge":
-                if not op.edge:
-                    raise ValueError("delete_edge requires edge")
-                edge = op.edge
-                from_id = edge.get("from")
-                to_id = edge.get("to")
-                kind = edge.get("kind")
-                key = (from_id, to_id, kind)
-                if key not in edge_keys and key not in added_edges:
-                    raise ValueError("Edge not found")
-                deleted_edges.add(key)
-            else:
-                raise ValueError(f"Unknown operation: {op.op}")
+        if base_graph is not None:
+            node_ids = {node["id"] for node in base_graph.get("nodes", [])}
+            edge_keys = {
+                (edge.get("from"), edge.get("to"), edge.get("kind"))
+                for edge in base_graph.get("edges", [])
+            }
+            kinds = base_graph.get("kinds", {})
+        elif self._config.graph_backend == "sqlite":
+            node_ids, edge_keys, kinds = self._sqlite_membership(project, proposal_model)
+        elif self._sharded():
+            node_ids, edge_keys, kinds = self._sharded_membership(project, proposal_model)
+        else:
+            # The resident index is refreshed by builds and applies, so validation
+            # only costs a stat of the graph file plus one lookup per operation.
+            index = self.load_index(project)
+            node_ids = index.nodes_by_id.keys()
+            edge_keys = index.edge_keys
+            kinds = index.graph.get("kinds", {})
+        errors = _validate_operations(proposal_model.operations, node_ids, edge_keys, kinds)
+        if errors:
+            raise ValueError(errors[0][1])
 
         proposal_dict = _model_dump(proposal_model)
         proposal_blob = json.dumps(proposal_dict, sort_keys=True).encode("utf-8")
         proposal_hash = hashlib.sha256(proposal_blob).hexdigest()[:8]
-        filename = f"{proposal_model.created_at.replace(':', '-')}_{proposal_hash}.json"
-        path = os.path.join(self._proposal_dir(project), filename)
+        proposal_id = f"{proposal_model.created_at.replace(':', '-')}_{proposal_hash}"
+        path = os.path.join(self._proposal_dir(project), f"{proposal_id}.json")
 
         with open(path, "w", encoding="UTF-8") as handle:
             json.dump(proposal_dict, handle, indent=2, ensure_ascii=True)
+        self._proposal_catalog(project).add(
+            proposal_id,
+            proposal_dict,
+            path.replace("\\", "/"),
+            status="stale" if base_graph is not None else "pending",
+        )
+
+        return {
+            "saved": True,
+            "id": proposal_id,
+            "path": path.replace("\\", "/"),
+            "proposal": proposal_dict,
+            "stale_base": base_graph is not None,
+        }
+
+    def validate_proposals(
+        self, project: str, proposals: list[dict[str, Any]]
+    ) -> dict[str, Any]:
+        """Validates many proposals against one graph snapshot, without saving them.
+
+        The code hash is computed and the graph index loaded once for the batch;
+        proposals on an older retained base share one load of that version. Two
+        valid proposals conflict when one writes (adds, updates or deletes) a node
+        or edge that the other touches.
+        """
+        if project not in self._config.projects:
+            raise ValueError("Invalid project")
+        current_hash = self.compute_code_hash(project)
+        index = self.load_index(project)
+        snapshots: dict[str, tuple[Any, Any, dict[str, Any]] | None] = {
+            current_hash: (index.nodes_by_id.keys(), index.edge_keys, index.graph.get("kinds", {}))
+        }
+        results: list[dict[str, Any]] = []
+        footprints: dict[int, tuple[set[str], set[str], set[tuple[str, str, str]]]] = {}
+        for position, proposal in enumerate(proposals):
+            result: dict[str, Any] = {"index": position, "valid": False, "errors": []}
+            results.append(result)
+            try:
+                model = GraphProposal(**{"created_at": "", **proposal})
+                if model.project != project:
+                    raise ValueError("Proposal project mismatch")
+            except ValueError as exc:
+                result["errors"].append({"operation": None, "reason": str(exc)})
+                continue
+            base_hash = model.base_code_hash
+            if base_hash not in snapshots:
+                base_graph = self._versions(project).graph(base_hash)
+                if base_graph is None:
+                    snapshots[base_hash] = None
+                else:
+                    snapshots[base_hash] = (
+                        {node["id"] for node in base_graph.get("nodes", [])},
+                        {
+                            (edge.get("from"), edge.get("to"), edge.get("kind"))
+                            for edge in base_graph.get("edges", [])
+                        },
+                        base_graph.get("kinds", {}),
+                    )
+            snapshot = snapshots[base_hash]
+            result["stale_base"] = base_hash != current_hash
+            if snapshot is None:
+                result["errors"].append({"operation": None, "reason": "Code hash mismatch"})
+                continue
+            errors = _validate_operations(model.operations, *snapshot)
+            result["errors"] = [
+                {"operation": operation, "reason": reason} for operation, reason in errors
+            ]
+            result["valid"] = not errors
+            if not errors:
+                footprints[position] = _proposal_footprint(model)
+
+        writers: dict[Any, set[int]] = {}
+        touchers: dict[Any, set[int]] = {}
+        for position, (written_nodes, touched_nodes, written_edges) in footprints.items():
+            for node_id in written_nodes:
+                writers.setdefault(("node", node_id), set()).add(position)
+            for node_id in touched_nodes:
+                touchers.setdefault(("node", node_id), set()).add(position)
+            for key in written_edges:
+                writers.setdefault(("edge", key), set()).add(position)
+                touchers.setdefault(("edge", key), set()).add(position)
+        shared: dict[tuple[int, int], dict[str, list[Any]]] = {}
+        for item, item_writers in writers.items():
+            for writer in item_writers:
+                for other in touchers.get(item, ()):
+                    if other == writer:
+                        continue
+                    pair = (min(writer, other), max(writer, other))
+                    entry = shared.setdefault(pair, {"nodes": [], "edges": []})
+                    bucket = entry["nodes"] if item[0] == "node" else entry["edges"]
+                    if item[1] not in bucket:
+                        bucket.append(item[1])
+        conflicts = [
+            {
+                "proposals": list(pair),
+                "nodes": sorted(shared[pair]["nodes"]),
+                "edges": [list(key) for key in sorted(shared[pair]["edges"])],
+            }
+            for pair in sorted(shared)
+        ]
+        return {
+            "project": project,
+            "code_hash": current_hash,
+            "valid_count": sum(1 for result in results if result["valid"]),
+            "results": results,
+            "conflicts": conflicts,
+        }
+
+    def rebase_proposal(
+        self,
+        project: str,
+        proposal_id: str | None = None,
+        proposal: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Re-targets a proposal made against an older tree to the current code hash.
+
+        The base version's per-file hashes are compared with the current build for
+        every file the operations touch, and the operations are re-validated
+        against the current graph. Without conflicts the rebased proposal is saved
+        like ``save_proposal``; otherwise nothing is saved and the conflicting
+        files and operations are reported.
+        """
+        if project not in self._config.projects:
+            raise ValueError("Invalid project")
+        if (proposal_id is None) == (proposal is None):
+            raise ValueError("Pass either proposal_id or proposal")
+        if proposal_id is not None:
+            proposal = self.get_proposal(project, proposal_id)["proposal"]
+        proposal_model = GraphProposal(**proposal)
+        if proposal_model.project != project:
+            raise ValueError("Proposal project mismatch")
+
+        with self.project_lock(project):
+            base_hash = proposal_model.base_code_hash
+            tree = self._hash_tree(project)
+            current_hash = tree.root
+            result: dict[str, Any] = {
+                "rebased": False,
+                "from_hash": base_hash,
+                "to_hash": current_hash,
+                "conflicts": {"files": [], "operations": []},
+            }
+            if base_hash == current_hash:
+                return {**result, "up_to_date": True}
+            base_graph = self._versions(project).graph(base_hash)
+            if base_graph is None:
+                raise ValueError(f"Base code hash is no longer retained: {base_hash}")
+            try:
+                index = self.load_index(project)
+            except ValueError:
+                index = None
+            if index is None or index.code_hash != current_hash:
+                self.build(project)
+                index = self.load_index(project)
+                tree = self._hash_tree(project)
+            result["to_hash"] = index.code_hash
+
+            # Current digests come from the hash tree, which may be newer than the graph.
+            base_hashes = {entry["path"]: entry.get("hash") for entry in base_graph["files"]}
+            base_nodes = {node["id"]: node for node in base_graph.get("nodes", [])}
+            file_conflicts: dict[str, dict[str, Any]] = {}
+            touched = _operation_files(proposal_model.operations, base_nodes)
+            for position, files in enumerate(touched):
+                for file_rel in sorted(files):
+                    before = base_hashes.get(file_rel)
+                    after = tree.digest(file_rel)
+                    if file_rel in base_hashes and before is None:
+                        reason = "unknown"
+                    elif before == after:
+                        continue
+                    elif after is None:
+                        reason = "removed"
+                    elif before is None:
+                        reason = "added"
+                    else:
+                        reason = "changed"
+                    conflict = file_conflicts.setdefault(
+                        file_rel, {"file": file_rel, "reason": reason, "operations": []}
+                    )
+                    conflict["operations"].append(position)
+            result["conflicts"]["files"] = [file_conflicts[f] for f in sorted(file_conflicts)]
+            result["conflicts"]["operations"] = [
+                {"operation": position, "reason": message}
+                for position, message in _validate_operations(
+                    proposal_model.operations,
+                    index.nodes_by_id.keys(),
+                    index.edge_keys,
+                    index.graph.get("kinds", {}),
+                )
+            ]
+            if result["conflicts"]["files"] or result["conflicts"]["operations"]:
+                return result
+
+            rebased = _model_dump(proposal_model)
+            rebased["base_code_hash"] = index.code_hash
+            rebased["created_at"] = datetime.now(timezone.utc).isoformat()
+            saved = self.save_proposal(project, rebased)
+        return {
+            **result,
+            "rebased": True,
+            "id": saved["id"],
+            "path": saved["path"],
+            "proposal": saved["proposal"],
+        }
 
-        return {"saved": True, "path": path.replace("\\", "/"), "proposal": proposal_dict}
+    def _proposal_catalog(self, project: str) -> ProposalCatalog:
+        """The project's proposal catalog, backfilled from proposal files on first use.
+
+        The backfill is written to a temporary database in one transaction and
+        moved into place, so the catalog either does not exist or is complete.
+        """
+        directory = self._proposal_dir(project)
+        path = os.path.join(directory, "catalog.sqlite")
+        catalog = ProposalCatalog(path)
+        if catalog.exists():
+            return catalog
+        with self.project_lock(project):
+            if catalog.exists():
+                return catalog
+            tmp_path = f"{path}.tmp"
+            for stale in (tmp_path, f"{tmp_path}-wal", f"{tmp_path}-shm"):
+                if os.path.exists(stale):
+                    os.remove(stale)
+            ProposalCatalog(tmp_path).add_many(self._proposal_records(directory))
+            os.replace(tmp_path, path)
+        return catalog
+
+    def _proposal_records(
+        self, directory: str
+    ) -> Iterable[tuple[str, dict[str, Any], str, float]]:
+        for entry in sorted(os.scandir(directory), key=lambda item: item.name):
+            if not entry.name.endswith(".json") or not entry.is_file():
+                continue
+            try:
+                with open(entry.path, "r", encoding="UTF-8") as handle:
+                    proposal = json.load(handle)
+            except (OSError, ValueError):
+                continue
+            yield (
+                entry.name[: -len(".json")],
+                proposal,
+                entry.path.replace("\\", "/"),
+                entry.stat().st_mtime,
+            )
+
+    def list_proposals(
+        self,
+        project: str,
+        status: str | None = None,
+        base_code_hash: str | None = None,
+        limit: int | None = 50,
+        offset: int = 0,
+    ) -> dict[str, Any]:
+        """Catalogued proposals, newest first, after re-marking pending/stale by code hash."""
+        if project not in self._config.projects:
+            raise ValueError("Invalid project")
+        code_hash = self.compute_code_hash(project)
+        catalog = self._proposal_catalog(project)
+        catalog.refresh(code_hash)
+        result = catalog.entries(
+            [status] if status else (), base_code_hash=base_code_hash, limit=limit, offset=offset
+        )
+        return {"project": project, "code_hash": code_hash, **result}
+
+    def get_proposal(self, project: str, proposal_id: str) -> dict[str, Any]:
+        """A catalogued proposal's entry together with the stored proposal."""
+        if project not in self._config.projects:
+            raise ValueError("Invalid project")
+        entry = self._proposal_catalog(project).get(proposal_id)
+        if entry is None:
+            raise ValueError(f"Unknown proposal: {proposal_id}")
+        try:
+            with open(entry["path"], "r", encoding="UTF-8") as handle:
+                entry["proposal"] = json.load(handle)
+        except (OSError, ValueError) as exc:
+            raise ValueError(f"Proposal file missing: {entry['path']}") from exc
+        return entry
+
+    def mark_proposal_applied(self, project: str, proposal_path: str, code_hash: str) -> bool:
+        """Marks the catalogued proposal stored at ``proposal_path`` as applied."""
+        directory = self._proposal_dir(project)
+        if os.path.dirname(os.path.abspath(proposal_path)) != os.path.abspath(directory):
+            return False
+        proposal_id = os.path.splitext(os.path.basename(proposal_path))[0]
+        return self._proposal_catalog(project).set_status(proposal_id, "applied", code_hash)
+
+    def gc_proposals(
+        self,
+        project: str,
+        statuses: Iterable[str] = ("stale",),
+        older_than_days: float | None = None,
+    ) -> dict[str, Any]:
+        """Removes proposals with ``statuses`` (older than ``older_than_days``) and their files."""
+        if project not in self._config.projects:
+            raise ValueError("Invalid project")
+        catalog = self._proposal_catalog(project)
+        catalog.refresh(self.compute_code_hash(project))
+        older_than = None
+        if older_than_days is not None:
+            older_than = time.time() - older_than_days * 86400
+        removed = catalog.remove(statuses, older_than=older_than)
+        for entry in removed:
+            try:
+                os.remove(entry["path"])
+            except OSError:
+                pass
+        return {"project": project, "removed": len(removed), "ids": [e["id"] for e in removed]}
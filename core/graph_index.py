@@ -0,0 +1,133 @@
+"""In-memory indexes over a loaded code graph."""
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+from core.graph_traversal import CsrAdjacency
+
+TRIGRAM_INDEX_VERSION = "0.1.0"
+
+
+def trigrams(text: str) -> set[str]:
+    return {text[idx : idx + 3] for idx in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """Posting lists from trigrams to the lowercase keys (names, paths) containing them."""
+
+    def __init__(self, keys: list[str], postings: dict[str, list[int]]) -> None:
+        self.keys = keys
+        self.postings = postings
+
+    @classmethod
+    def from_keys(cls, keys: Iterable[str]) -> "TrigramIndex":
+        ordered = sorted(set(keys))
+        postings: dict[str, list[int]] = {}
+        for idx, key in enumerate(ordered):
+            for gram in trigrams(key):
+                postings.setdefault(gram, []).append(idx)
+        return cls(ordered, postings)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TrigramIndex":
+        return cls(list(data.get("keys", [])), dict(data.get("postings", {})))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"keys": self.keys, "postings": self.postings}
+
+    def lookup(self, term: str) -> list[str]:
+        """Keys containing ``term``; terms shorter than a trigram scan the key list."""
+        grams = trigrams(term)
+        if not grams:
+            return [key for key in self.keys if term in key]
+        lists = []
+        for gram in grams:
+            posting = self.postings.get(gram)
+            if not posting:
+                return []
+            lists.append(posting)
+        lists.sort(key=len)
+        candidates = set(lists[0])
+        for posting in lists[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+        return [self.keys[idx] for idx in sorted(candidates) if term in self.keys[idx]]
+
+
+class GraphIndex:
+    """Prebuilt lookup structures so queries scale with the result, not the graph."""
+
+    def __init__(self, graph: dict[str, Any]) -> None:
+        self.graph = graph
+        self.nodes: list[dict[str, Any]] = graph.get("nodes", [])
+        self.edges: list[dict[str, Any]] = graph.get("edges", [])
+        self.position: dict[str, int] = {}
+        self.nodes_by_id: dict[str, dict[str, Any]] = {}
+        self.nodes_by_kind: dict[str, list[str]] = {}
+        self.by_name: dict[str, list[str]] = {}
+        self.by_file: dict[str, list[str]] = {}
+        self.out_edges: dict[str, list[int]] = {}
+        self.in_edges: dict[str, list[int]] = {}
+        self.edge_keys: set[tuple[str, str, str]] = set()
+        self.trigrams: TrigramIndex | None = None
+        self._csr: CsrAdjacency | None = None
+
+        for idx, node in enumerate(self.nodes):
+            node_id = node["id"]
+            self.position[node_id] = idx
+            self.nodes_by_id[node_id] = node
+            self.nodes_by_kind.setdefault(node.get("kind", ""), []).append(node_id)
+            self.by_name.setdefault(str(node.get("name", "")).lower(), []).append(node_id)
+            self.by_file.setdefault(str(node.get("file", "")).lower(), []).append(node_id)
+
+        for idx, edge in enumerate(self.edges):
+            self.out_edges.setdefault(edge.get("from"), []).append(idx)
+            self.in_edges.setdefault(edge.get("to"), []).append(idx)
+            self.edge_keys.add((edge.get("from"), edge.get("to"), edge.get("kind")))
+
+    @property
+    def code_hash(self) -> str:
+        return self.graph.get("code_hash", "")
+
+    def csr(self) -> CsrAdjacency:
+        if self._csr is None:
+            self._csr = CsrAdjacency([node["id"] for node in self.nodes], self.edges)
+        return self._csr
+
+    def trigram_index(self) -> TrigramIndex:
+        if self.trigrams is None:
+            self.trigrams = TrigramIndex.from_keys([*self.by_name, *self.by_file])
+        return self.trigrams
+
+    def search(self, term: str, kind: str | None = None) -> list[dict[str, Any]]:
+        """Nodes whose name or file contains ``term`` (case-insensitive).
+
+        Results are ranked exact > prefix > substring, name matches before file
+        matches, then by graph order.
+        """
+        term_lower = term.lower()
+        scores: dict[str, tuple[int, int]] = {}
+        for key in self.trigram_index().lookup(term_lower):
+            rank = 0 if key == term_lower else 1 if key.startswith(term_lower) else 2
+            for field, lookup in enumerate((self.by_name, self.by_file)):
+                for node_id in lookup.get(key, []):
+                    score = (rank, field)
+                    if score < scores.get(node_id, (3, 2)):
+                        scores[node_id] = score
+        if kind:
+            scores = {
+                node_id: score
+                for node_id, score in scores.items()
+                if self.nodes_by_id[node_id].get("kind") == kind
+            }
+        ranked = sorted(scores, key=lambda node_id: (*scores[node_id], self.position[node_id]))
+        return [self.nodes_by_id[node_id] for node_id in ranked]
+
+    def related_edges(self, node_ids: Iterable[str]) -> list[dict[str, Any]]:
+        """Edges touching any of ``node_ids``, in graph order."""
+        indexes: set[int] = set()
+        for node_id in node_ids:
+            indexes.update(self.out_edges.get(node_id, []))
+            indexes.update(self.in_edges.get(node_id, []))
+        return [self.edges[idx] for idx in sorted(indexes)]
@@ -0,0 +1,94 @@
+"""Streaming NDJSON export and import of code graphs."""
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Iterable, Iterator
+
+NDJSON_VERSION = "0.1.0"
+
+
+def ndjson_records(
+    header: dict[str, Any],
+    nodes: Iterable[dict[str, Any]],
+    edges: Iterable[dict[str, Any]],
+) -> Iterator[str]:
+    """Yields one JSON line for the header, then one per node and one per edge.
+
+    ``nodes`` and ``edges`` are consumed lazily, so a generator-backed source (such
+    as ``BinaryGraphReader``) is exported without materialising the graph.
+    """
+    yield _header_line(header)
+    for node in nodes:
+        yield json.dumps({"type": "node", **node}) + "\n"
+    for edge in edges:
+        yield json.dumps({"type": "edge", **edge}) + "\n"
+
+
+def fragment_records(
+    header: dict[str, Any], fragments: Iterable[dict[str, Any]]
+) -> Iterator[str]:
+    """Like ``ndjson_records``, but emits each fragment's nodes and then its edges.
+
+    Every fragment is consumed once, so a sharded graph is exported one shard at
+    a time. ``load_ndjson`` does not depend on nodes preceding all edges.
+    """
+    yield _header_line(header)
+    for fragment in fragments:
+        for node in fragment["nodes"]:
+            yield json.dumps({"type": "node", **node}) + "\n"
+        for edge in fragment["edges"]:
+            yield json.dumps({"type": "edge", **edge}) + "\n"
+
+
+def _header_line(header: dict[str, Any]) -> str:
+    meta = {key: value for key, value in header.items() if key not in {"nodes", "edges"}}
+    return json.dumps({"type": "header", "ndjson_version": NDJSON_VERSION, **meta}) + "\n"
+
+
+def write_ndjson(path: str, lines: Iterable[str]) -> int:
+    """Writes lines atomically and returns how many were written."""
+    count = 0
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="UTF-8") as handle:
+        for line in lines:
+            handle.write(line)
+            count += 1
+    os.replace(tmp_path, path)
+    return count
+
+
+def read_ndjson(path: str) -> Iterator[tuple[str, dict[str, Any]]]:
+    """Yields ``(record type, record)`` pairs one line at a time."""
+    with open(path, "r", encoding="UTF-8") as handle:
+        for line_no, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                raise ValueError(f"Invalid NDJSON at line {line_no}") from exc
+            record_type = record.pop("type", None)
+            if record_type not in {"header", "node", "edge"}:
+                raise ValueError(f"Unknown NDJSON record at line {line_no}: {record_type}")
+            yield record_type, record
+
+
+def load_ndjson(path: str) -> dict[str, Any]:
+    """Collects an NDJSON export back into a graph dict."""
+    graph: dict[str, Any] = {}
+    nodes: list[dict[str, Any]] = []
+    edges: list[dict[str, Any]] = []
+    for record_type, record in read_ndjson(path):
+        if record_type == "header":
+            record.pop("ndjson_version", None)
+            graph.update(record)
+        elif record_type == "node":
+            nodes.append(record)
+        else:
+            edges.append(record)
+    if not graph:
+        raise ValueError("NDJSON export has no header")
+    graph["nodes"] = nodes
+    graph["edges"] = edges
+    return graph
@@ -0,0 +1,203 @@
+"""Graph storage sharded into per-file fragments behind a small manifest."""
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Iterable
+
+from core.graph_versions import GraphVersionStore, split_fragments
+
+SHARD_MANIFEST_VERSION = "0.3.0"
+
+
+def _file_summaries(
+    fragments: dict[str, dict[str, Any]], node_files: dict[str, str]
+) -> tuple[dict[str, list[str]], dict[str, list[str]]]:
+    """Per file: the lowercase names of its nodes, and the other files' nodes its edges reach."""
+    file_names: dict[str, list[str]] = {}
+    file_targets: dict[str, list[str]] = {}
+    for file_rel, fragment in fragments.items():
+        file_names[file_rel] = sorted(
+            {str(node.get("name", "")).lower() for node in fragment["nodes"]}
+        )
+        file_targets[file_rel] = sorted(
+            {
+                edge.get("to")
+                for edge in fragment["edges"]
+                if node_files.get(edge.get("to"), file_rel) != file_rel
+            }
+        )
+    return file_names, file_targets
+
+
+def _generation(header: dict[str, Any]) -> list[Any]:
+    return [header.get("code_hash", ""), header.get("generated_at")]
+
+
+class ShardedGraphStore:
+    """A project graph stored as content-addressed per-file fragments.
+
+    The manifest holds only the graph header and the fragment key of every
+    file. A sidecar index next to it holds what grows with the node count: the
+    file of every node id, and per file the lowercase names of its nodes and
+    the ids its edges point to in other files. Callers can therefore load just
+    the files a query or proposal touches. Fragments live in the project's
+    ``GraphVersionStore``, which makes every write a retained version as well.
+    """
+
+    def __init__(self, manifest_path: str, fragments: GraphVersionStore) -> None:
+        self._path = manifest_path
+        self._index_path = f"{os.path.splitext(manifest_path)[0]}.index.json"
+        self._fragments = fragments
+
+    def exists(self) -> bool:
+        return os.path.exists(self._path)
+
+    def _read(self, path: str) -> dict[str, Any]:
+        try:
+            with open(path, "r", encoding="UTF-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError) as exc:
+            raise ValueError("Graph not found, build it first") from exc
+        if data.get("schema_version") != SHARD_MANIFEST_VERSION:
+            raise ValueError("Graph not found, build it first")
+        return data
+
+    def _write(self, path: str, data: dict[str, Any]) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="UTF-8") as handle:
+            handle.write(
+                json.dumps({"schema_version": SHARD_MANIFEST_VERSION, **data}, ensure_ascii=True)
+            )
+        os.replace(tmp_path, path)
+
+    def manifest(self) -> dict[str, Any]:
+        """The graph header and the fragment key of every file."""
+        return self._read(self._path)
+
+    def index(self, manifest: dict[str, Any] | None = None) -> dict[str, Any]:
+        """``node_files``, ``file_names`` and ``file_targets`` of the stored graph."""
+        manifest = manifest or self.manifest()
+        data = self._read(self._index_path)
+        if data.get("generation") != _generation(manifest["header"]):
+            raise ValueError("Graph not found, build it first")
+        return data
+
+    def _write_both(
+        self,
+        header: dict[str, Any],
+        files: dict[str, str],
+        node_files: dict[str, str],
+        file_names: dict[str, list[str]],
+        file_targets: dict[str, list[str]],
+    ) -> None:
+        # The index goes first; the manifest names the generation readers accept.
+        self._write(
+            self._index_path,
+            {
+                "generation": _generation(header),
+                "node_files": node_files,
+                "file_names": file_names,
+                "file_targets": file_targets,
+            },
+        )
+        self._write(self._path, {"header": header, "files": files})
+
+    def write(self, graph: dict[str, Any], known: dict[str, str] | None = None) -> None:
+        files = self._fragments.record(graph, known)
+        node_files = {node["id"]: str(node.get("file", "")) for node in graph.get("nodes", [])}
+        file_names, file_targets = _file_summaries(split_fragments(graph), node_files)
+        header = {key: value for key, value in graph.items() if key not in {"nodes", "edges"}}
+        self._write_both(header, files, node_files, file_names, file_targets)
+
+    def load_files(
+        self,
+        files: Iterable[str],
+        manifest: dict[str, Any] | None = None,
+        cache: dict[str, dict[str, Any]] | None = None,
+    ) -> dict[str, Any]:
+        """Assembles the shards of ``files`` in manifest (that is, full-graph) order.
+
+        Fragments found in ``cache`` are shared rather than read, and fragments
+        read are added to it; callers that modify the result must not pass one.
+        """
+        manifest = manifest or self.manifest()
+        wanted = set(files)
+        graph = dict(manifest["header"])
+        graph["nodes"] = []
+        graph["edges"] = []
+        for file_rel, key in manifest["files"].items():
+            if file_rel not in wanted:
+                continue
+            fragment = cache.get(key) if cache is not None else None
+            if fragment is None:
+                fragment = self._fragments.fragment(key)
+                if cache is not None:
+                    cache[key] = fragment
+            graph["nodes"].extend(fragment["nodes"])
+            graph["edges"].extend(fragment["edges"])
+        return graph
+
+    def load(self) -> dict[str, Any]:
+        manifest = self.manifest()
+        return self.load_files(manifest["files"], manifest)
+
+    def load_partial(
+        self,
+        node_ids: Iterable[str] = (),
+        files: Iterable[str] = (),
+        manifest: dict[str, Any] | None = None,
+        index: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Loads the files owning ``node_ids`` plus ``files``.
+
+        The result lists the loaded files in ``partial_files`` so ``write_partial``
+        can replace exactly those.
+        """
+        manifest = manifest or self.manifest()
+        node_files = (index or self.index(manifest))["node_files"]
+        wanted = set(files)
+        wanted.update(node_files[node_id] for node_id in node_ids if node_id in node_files)
+        graph = self.load_files(wanted, manifest)
+        graph["partial_files"] = sorted(wanted)
+        return graph
+
+    def node_ids(self) -> set[str]:
+        return set(self.index()["node_files"])
+
+    def write_partial(self, graph: dict[str, Any]) -> None:
+        """Replaces the fragments of ``graph["partial_files"]`` and updates the header."""
+        manifest = self.manifest()
+        index = self.index(manifest)
+        files: dict[str, str] = manifest["files"]
+        scope = set(graph.get("partial_files", []))
+        fragments = {
+            file_rel: fragment
+            for file_rel, fragment in split_fragments(graph).items()
+            if file_rel in scope
+        }
+        node_files = {
+            node_id: file_rel
+            for node_id, file_rel in index["node_files"].items()
+            if file_rel not in scope
+        }
+        for file_rel, fragment in fragments.items():
+            node_files.update((node["id"], file_rel) for node in fragment["nodes"])
+        file_names, file_targets = _file_summaries(fragments, node_files)
+        for file_rel in scope:
+            fragment = fragments.get(file_rel)
+            if fragment is None:
+                files.pop(file_rel, None)
+                index["file_names"].pop(file_rel, None)
+                index["file_targets"].pop(file_rel, None)
+                continue
+            files[file_rel] = self._fragments.put_fragment(fragment)
+            index["file_names"][file_rel] = file_names[file_rel]
+            index["file_targets"][file_rel] = file_targets[file_rel]
+        header = {
+            key: value
+            for key, value in graph.items()
+            if key not in {"nodes", "edges", "partial_files"}
+        }
+        self._fragments.record_files(header, files)
+        self._write_both(header, files, node_files, index["file_names"], index["file_targets"])
@@ -0,0 +1,297 @@
+"""SQLite-backed graph store with indexed queries."""
+from __future__ import annotations
+
+import json
+import sqlite3
+from contextlib import closing
+from typing import Any, Iterable
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, language TEXT);
+CREATE TABLE IF NOT EXISTS nodes (
+    pk INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    name_lower TEXT NOT NULL,
+    file TEXT NOT NULL,
+    file_lower TEXT NOT NULL,
+    start_line INTEGER,
+    end_line INTEGER,
+    extra TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS nodes_kind ON nodes (kind);
+CREATE INDEX IF NOT EXISTS nodes_name ON nodes (name_lower);
+CREATE INDEX IF NOT EXISTS nodes_file ON nodes (file);
+CREATE TABLE IF NOT EXISTS edges (
+    pk INTEGER PRIMARY KEY,
+    from_id TEXT NOT NULL,
+    to_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    owner_file TEXT NOT NULL,
+    extra TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS edges_from ON edges (from_id, kind);
+CREATE INDEX IF NOT EXISTS edges_to ON edges (to_id, kind);
+CREATE INDEX IF NOT EXISTS edges_owner ON edges (owner_file);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS nodes_fts USING fts5(
+    name, file, content='nodes', content_rowid='pk', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS nodes_fts_insert AFTER INSERT ON nodes BEGIN
+    INSERT INTO nodes_fts (rowid, name, file) VALUES (new.pk, new.name, new.file);
+END;
+CREATE TRIGGER IF NOT EXISTS nodes_fts_delete AFTER DELETE ON nodes BEGIN
+    INSERT INTO nodes_fts (nodes_fts, rowid, name, file)
+    VALUES ('delete', old.pk, old.name, old.file);
+END;
+"""
+
+_NODE_COLUMNS = "id, kind, name, file, start_line, end_line, extra"
+_EDGE_COLUMNS = "from_id, to_id, kind, extra"
+
+
+def _node_row(node: dict[str, Any]) -> tuple[Any, ...]:
+    node_range = node.get("range") or {}
+    name = str(node.get("name", ""))
+    file_rel = str(node.get("file", ""))
+    return (
+        node["id"],
+        node.get("kind", ""),
+        name,
+        name.lower(),
+        file_rel,
+        file_rel.lower(),
+        node_range.get("start_line"),
+        node_range.get("end_line"),
+        json.dumps(node.get("extra") or {}, ensure_ascii=True),
+    )
+
+
+def _node_dict(row: sqlite3.Row) -> dict[str, Any]:
+    return {
+        "id": row["id"],
+        "kind": row["kind"],
+        "name": row["name"],
+        "file": row["file"],
+        "range": {"start_line": row["start_line"], "end_line": row["end_line"]},
+        "extra": json.loads(row["extra"]),
+    }
+
+
+def _edge_dict(row: sqlite3.Row) -> dict[str, Any]:
+    return {
+        "from": row["from_id"],
+        "to": row["to_id"],
+        "kind": row["kind"],
+        "extra": json.loads(row["extra"]),
+    }
+
+
+class SqliteGraphStore:
+    """Stores one project graph in SQLite (WAL mode) with indexes and FTS5 name search.
+
+    Each call opens its own connection so readers never block on a writer.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._fts: bool | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        if self._fts is None:
+            try:
+                conn.executescript(_FTS_SCHEMA)
+                self._fts = True
+            except sqlite3.OperationalError:
+                self._fts = False
+        return conn
+
+    def _meta(self, conn: sqlite3.Connection) -> dict[str, Any]:
+        return {row["key"]: json.loads(row["value"]) for row in conn.execute("SELECT * FROM meta")}
+
+    def exists(self) -> bool:
+        with closing(self._connect()) as conn:
+            return "code_hash" in self._meta(conn)
+
+    def header(self) -> dict[str, Any]:
+        with closing(self._connect()) as conn:
+            return self._meta(conn)
+
+    def write_graph(
+        self,
+        graph: dict[str, Any],
+        files: Iterable[str] | None = None,
+        replace_edge_kinds: Iterable[str] = (),
+    ) -> None:
+        """Stores ``graph`` in one transaction.
+
+        With ``files`` only the nodes of those files and the edges they own (edges
+        whose ``from`` node lives in them) are replaced, plus every edge of
+        ``replace_edge_kinds``; otherwise everything is.
+        """
+        nodes = graph.get("nodes", [])
+        edges = graph.get("edges", [])
+        node_files = {node["id"]: str(node.get("file", "")) for node in nodes}
+        scope = None if files is None else set(files)
+        global_kinds = set(replace_edge_kinds)
+
+        with closing(self._connect()) as conn, conn:
+            if scope is not None and "code_hash" not in self._meta(conn):
+                scope = None
+            if scope is None:
+                conn.execute("DELETE FROM edges")
+                conn.execute("DELETE FROM nodes")
+            else:
+                for file_rel in scope:
+                    conn.execute("DELETE FROM edges WHERE owner_file = ?", (file_rel,))
+                    conn.execute("DELETE FROM nodes WHERE file = ?", (file_rel,))
+                for kind in global_kinds:
+                    conn.execute("DELETE FROM edges WHERE kind = ?", (kind,))
+            conn.executemany(
+                "INSERT INTO nodes (id, kind, name, name_lower, file, file_lower, "
+                "start_line, end_line, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    _node_row(node)
+                    for node in nodes
+                    if scope is None or node.get("file", "") in scope
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO edges (from_id, to_id, kind, owner_file, extra) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    (
+                        edge.get("from"),
+                        edge.get("to"),
+                        edge.get("kind", ""),
+                        node_files.get(edge.get("from"), ""),
+                        json.dumps(edge.get("extra") or {}, ensure_ascii=True),
+                    )
+                    for edge in edges
+                    if scope is None
+                    or edge.get("kind") in global_kinds
+                    or node_files.get(edge.get("from"), "") in scope
+                ),
+            )
+            if scope is not None:
+                # Edges from unchanged files may point at nodes that were just removed.
+                conn.execute("DELETE FROM edges WHERE to_id NOT IN (SELECT id FROM nodes)")
+            conn.execute("DELETE FROM files")
+            conn.executemany(
+                "INSERT INTO files (path, language) VALUES (?, ?)",
+                ((entry.get("path"), entry.get("language")) for entry in graph.get("files", [])),
+            )
+            conn.execute("DELETE FROM meta")
+            conn.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                (
+                    (key, json.dumps(value, ensure_ascii=True))
+                    for key, value in graph.items()
+                    if key not in {"nodes", "edges", "files"}
+                ),
+            )
+
+    def existing_nodes(self, node_ids: Iterable[str]) -> set[str]:
+        """Returns which of ``node_ids`` are stored, using one indexed lookup each."""
+        with closing(self._connect()) as conn:
+            return {
+                node_id
+                for node_id in set(node_ids)
+                if conn.execute("SELECT 1 FROM nodes WHERE id = ?", (node_id,)).fetchone()
+            }
+
+    def existing_edges(
+        self, keys: Iterable[tuple[str, str, str]]
+    ) -> set[tuple[str, str, str]]:
+        """Returns which ``(from, to, kind)`` keys are stored."""
+        with closing(self._connect()) as conn:
+            return {
+                key
+                for key in set(keys)
+                if conn.execute(
+                    "SELECT 1 FROM edges WHERE from_id = ? AND to_id = ? AND kind = ?", key
+                ).fetchone()
+            }
+
+    def nodes(self, node_ids: Iterable[str]) -> list[dict[str, Any]]:
+        node_ids = list(node_ids)
+        if not node_ids:
+            return []
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT {_NODE_COLUMNS} FROM nodes WHERE id IN "
+                f"({', '.join('?' for _ in node_ids)})",
+                node_ids,
+            ).fetchall()
+        return [_node_dict(row) for row in rows]
+
+    def _related_edges(
+        self, conn: sqlite3.Connection, node_ids: list[str]
+    ) -> list[dict[str, Any]]:
+        if not node_ids:
+            return []
+        marks = ", ".join("?" for _ in node_ids)
+        rows = conn.execute(
+            f"SELECT pk, {_EDGE_COLUMNS} FROM edges WHERE from_id IN ({marks}) "
+            f"UNION SELECT pk, {_EDGE_COLUMNS} FROM edges WHERE to_id IN ({marks}) "
+            "ORDER BY pk",
+            [*node_ids, *node_ids],
+        ).fetchall()
+        return [_edge_dict(row) for row in rows]
+
+    def query(
+        self,
+        term: str,
+        kind: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> dict[str, Any]:
+        """Ranked substring search with the same ordering as ``GraphIndex.search``."""
+        term_lower = term.lower()
+        params: dict[str, Any] = {
+            "term": term_lower,
+            "kind": kind,
+            "limit": -1 if limit is None else limit,
+            "offset": offset,
+        }
+        score = (
+            "min("
+            "CASE WHEN name_lower = :term THEN 0 "
+            "WHEN substr(name_lower, 1, length(:term)) = :term THEN 2 "
+            "WHEN instr(name_lower, :term) > 0 THEN 4 ELSE 6 END, "
+            "CASE WHEN file_lower = :term THEN 1 "
+            "WHEN substr(file_lower, 1, length(:term)) = :term THEN 3 "
+            "WHEN instr(file_lower, :term) > 0 THEN 5 ELSE 6 END)"
+        )
+        with closing(self._connect()) as conn:
+            if self._fts and len(term_lower) >= 3:
+                params["match"] = '"' + term_lower.replace('"', '""') + '"'
+                where = "pk IN (SELECT rowid FROM nodes_fts WHERE nodes_fts MATCH :match)"
+            else:
+                where = "(instr(name_lower, :term) > 0 OR instr(file_lower, :term) > 0)"
+            if kind:
+                where += " AND kind = :kind"
+            total = conn.execute(f"SELECT count(*) FROM nodes WHERE {where}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT {_NODE_COLUMNS}, {score} AS score FROM nodes WHERE {where} "
+                "ORDER BY score, file, start_line, pk LIMIT :limit OFFSET :offset",
+                params,
+            ).fetchall()
+            matches = [_node_dict(row) for row in rows]
+            related_edges = self._related_edges(conn, [node["id"] for node in matches])
+        return {
+            "matches": matches,
+            "related_edges": related_edges,
+            "match_count": total,
+            "offset": offset,
+            "limit": limit,
+        }
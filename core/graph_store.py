@@ -0,0 +1,295 @@
+"""Compact binary graph storage with lazy, memory-mapped reads."""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Callable, Iterable, Iterator
+
+BINARY_MAGIC = b"CGRB"
+BINARY_VERSION = 1
+_HEADER = struct.Struct("<4sHI")
+_NONE_LINE = -1
+
+NODE_COLUMNS = ("id", "kind", "name", "file", "start_line", "end_line", "extra")
+EDGE_COLUMNS = ("from", "to", "kind", "extra")
+_INT_COLUMNS = {"start_line", "end_line"}
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+
+    @property
+    def values(self) -> list[str]:
+        return list(self._ids)
+
+    def column(self, values: Iterable[str]) -> array:
+        """Interns ``values`` and returns their indexes (ids follow first insertion)."""
+        ids = self._ids
+        return array("I", [ids.setdefault(value, len(ids)) for value in values])
+
+
+def _extra_key(extra: dict[str, Any] | None) -> str:
+    if not extra:
+        return "{}"
+    return json.dumps(extra, sort_keys=True, separators=(",", ":"))
+
+
+def _decode_extra(value: str) -> dict[str, Any]:
+    return {} if value == "{}" else json.loads(value)
+
+
+def _to_bytes(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def write_binary_graph(
+    path: str, graph: dict[str, Any], stamp: dict[str, Any] | None = None
+) -> None:
+    """Writes ``graph`` as interned, columnar little-endian arrays.
+
+    Layout: magic, version, metadata length, JSON metadata (graph header fields and
+    a directory of column offsets), then 4-byte aligned column blobs. Strings
+    (ids, kinds, names, files and JSON-encoded ``extra``) live once in a string
+    table referenced by index.
+    """
+    strings = _StringTable()
+    nodes = graph.get("nodes", [])
+    edges = graph.get("edges", [])
+    ranges = [node.get("range") or {} for node in nodes]
+    # Columns are filled one at a time, which keeps each loop a tight comprehension.
+    columns: dict[str, array] = {
+        "node.id": strings.column(str(node["id"]) for node in nodes),
+        "node.kind": strings.column(str(node.get("kind", "")) for node in nodes),
+        "node.name": strings.column(str(node.get("name", "")) for node in nodes),
+        "node.file": strings.column(str(node.get("file", "")) for node in nodes),
+    }
+    for key in ("start_line", "end_line"):
+        columns[f"node.{key}"] = array(
+            "i",
+            [
+                _NONE_LINE if value is None else int(value)
+                for value in (node_range.get(key) for node_range in ranges)
+            ],
+        )
+    columns["node.extra"] = strings.column(_extra_key(node.get("extra")) for node in nodes)
+    columns["edge.from"] = strings.column(str(edge.get("from")) for edge in edges)
+    columns["edge.to"] = strings.column(str(edge.get("to")) for edge in edges)
+    columns["edge.kind"] = strings.column(str(edge.get("kind", "")) for edge in edges)
+    columns["edge.extra"] = strings.column(_extra_key(edge.get("extra")) for edge in edges)
+
+    encoded = [value.encode("utf-8") for value in strings.values]
+    offsets = array("I", [0])
+    for blob in encoded:
+        offsets.append(offsets[-1] + len(blob))
+
+    blobs: list[tuple[str, str, bytes]] = [
+        ("strings.offsets", "I", _to_bytes(offsets)),
+        ("strings.data", "B", b"".join(encoded)),
+    ]
+    blobs.extend((name, values.typecode, _to_bytes(values)) for name, values in columns.items())
+
+    header = {
+        key: value for key, value in graph.items() if key not in {"nodes", "edges"}
+    }
+    header["node_count"] = len(nodes)
+    header["edge_count"] = len(edges)
+    header["string_count"] = len(strings.values)
+    header["source_stamp"] = stamp or {}
+
+    directory: dict[str, list[Any]] = {}
+    offset = 0
+    for name, typecode, blob in blobs:
+        directory[name] = [offset, len(blob), typecode]
+        offset += len(blob) + (-len(blob) % 4)
+    header["columns"] = directory
+    meta = json.dumps(header, ensure_ascii=True).encode("utf-8")
+    meta += b" " * (-(len(meta) + _HEADER.size) % 4)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(meta)))
+        handle.write(meta)
+        for _, _, blob in blobs:
+            handle.write(blob)
+            handle.write(b"\0" * (-len(blob) % 4))
+    os.replace(tmp_path, path)
+
+
+class BinaryGraphReader:
+    """Memory-maps a binary graph and decodes columns and strings on demand."""
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, meta_len = _HEADER.unpack_from(self._map, 0)
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            self.close()
+            raise ValueError("Unsupported binary graph format")
+        start = _HEADER.size
+        self.header: dict[str, Any] = json.loads(self._map[start : start + meta_len])
+        self._data_start = start + meta_len
+        self._columns: dict[str, Any] = {}
+
+    def close(self) -> None:
+        for values in self._columns.values():
+            if isinstance(values, memoryview):
+                values.release()
+        self._columns.clear()
+        self._map.close()
+
+    def __enter__(self) -> "BinaryGraphReader":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    @property
+    def node_count(self) -> int:
+        return int(self.header.get("node_count", 0))
+
+    @property
+    def edge_count(self) -> int:
+        return int(self.header.get("edge_count", 0))
+
+    def column(self, name: str) -> Any:
+        """Returns a column as an indexable sequence, decoding only that column."""
+        cached = self._columns.get(name)
+        if cached is not None:
+            return cached
+        offset, length, typecode = self.header["columns"][name]
+        start = self._data_start + offset
+        if sys.byteorder == "little":
+            values: Any = memoryview(self._map)[start : start + length].cast(typecode)
+        else:
+            values = array(typecode, self._map[start : start + length])
+            values.byteswap()
+        self._columns[name] = values
+        return values
+
+    def string(self, idx: int) -> str:
+        """Decodes one string; nothing is cached, so streaming stays flat in memory."""
+        return self._decoder()(idx)
+
+    def _decoder(self) -> Callable[[int], str]:
+        offsets = self.column("strings.offsets")
+        data = self.column("strings.data")
+        return lambda idx: bytes(data[offsets[idx] : offsets[idx + 1]]).decode("utf-8")
+
+    def node(self, idx: int) -> dict[str, Any]:
+        return next(self.nodes(range(idx, idx + 1)))
+
+    def edge(self, idx: int) -> dict[str, Any]:
+        return next(self.edges(range(idx, idx + 1)))
+
+    def nodes(self, indexes: Iterable[int] | None = None) -> Iterator[dict[str, Any]]:
+        string = self._decoder()
+        ids, kinds, names, files, extras, starts, ends = (
+            self.column(f"node.{name}")
+            for name in ("id", "kind", "name", "file", "extra", "start_line", "end_line")
+        )
+        for idx in range(self.node_count) if indexes is None else indexes:
+            start = starts[idx]
+            end = ends[idx]
+            yield {
+                "id": string(ids[idx]),
+                "kind": string(kinds[idx]),
+                "name": string(names[idx]),
+                "file": string(files[idx]),
+                "range": {
+                    "start_line": None if start == _NONE_LINE else start,
+                    "end_line": None if end == _NONE_LINE else end,
+                },
+                "extra": _decode_extra(string(extras[idx])),
+            }
+
+    def edges(self, indexes: Iterable[int] | None = None) -> Iterator[dict[str, Any]]:
+        string = self._decoder()
+        sources, targets, kinds, extras = (
+            self.column(f"edge.{name}") for name in ("from", "to", "kind", "extra")
+        )
+        for idx in range(self.edge_count) if indexes is None else indexes:
+            yield {
+                "from": string(sources[idx]),
+                "to": string(targets[idx]),
+                "kind": string(kinds[idx]),
+                "extra": _decode_extra(string(extras[idx])),
+            }
+
+    def node_indexes_of_kind(self, kind: str) -> list[int]:
+        """Scans only the kind column; other node columns stay untouched."""
+        kinds = self.column("node.kind")
+        wanted = {idx for idx in set(kinds) if self.string(idx) == kind}
+        return [idx for idx, value in enumerate(kinds) if value in wanted]
+
+    def nodes_of_kind(self, kind: str) -> list[dict[str, Any]]:
+        return list(self.nodes(self.node_indexes_of_kind(kind)))
+
+    def to_header(self) -> dict[str, Any]:
+        """The graph's metadata as stored in the JSON form, without storage details."""
+        return {
+            key: value
+            for key, value in self.header.items()
+            if key not in {"columns", "node_count", "edge_count", "string_count", "source_stamp"}
+        }
+
+    def strings(self) -> list[str]:
+        """Decodes the whole string table at once."""
+        offsets = self.column("strings.offsets")
+        data = bytes(self.column("strings.data"))
+        text = data.decode("utf-8")
+        if len(text) == len(data):
+            # ASCII only: byte offsets are character offsets.
+            return [text[offsets[idx] : offsets[idx + 1]] for idx in range(len(offsets) - 1)]
+        return [
+            data[offsets[idx] : offsets[idx + 1]].decode("utf-8")
+            for idx in range(len(offsets) - 1)
+        ]
+
+    def _extras(self, strings: list[str], name: str) -> list[dict[str, Any]]:
+        # One ``json.loads`` over all rows; each row still gets its own dict.
+        return json.loads(f"[{','.join([strings[idx] for idx in self.column(name)])}]")
+
+    def to_graph(self) -> dict[str, Any]:
+        """Materialises the whole graph column by column."""
+        strings = self.strings()
+        graph = self.to_header()
+        graph["nodes"] = [
+            {
+                "id": strings[node_id],
+                "kind": strings[kind],
+                "name": strings[name],
+                "file": strings[file_rel],
+                "range": {
+                    "start_line": None if start == _NONE_LINE else start,
+                    "end_line": None if end == _NONE_LINE else end,
+                },
+                "extra": extra,
+            }
+            for node_id, kind, name, file_rel, start, end, extra in zip(
+                self.column("node.id"),
+                self.column("node.kind"),
+                self.column("node.name"),
+                self.column("node.file"),
+                self.column("node.start_line"),
+                self.column("node.end_line"),
+                self._extras(strings, "node.extra"),
+            )
+        ]
+        graph["edges"] = [
+            {"from": strings[from_id], "to": strings[to_id], "kind": strings[kind], "extra": extra}
+            for from_id, to_id, kind, extra in zip(
+                self.column("edge.from"),
+                self.column("edge.to"),
+                self.column("edge.kind"),
+                self._extras(strings, "edge.extra"),
+            )
+        ]
+        return graph
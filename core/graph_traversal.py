@@ -0,0 +1,136 @@
+"""Compressed (CSR) adjacency and traversals over a code graph."""
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from typing import Any, Iterable
+
+DIRECTIONS = ("out", "in", "both")
+
+
+class CsrAdjacency:
+    """Outgoing and incoming adjacency as CSR integer arrays.
+
+    Node ``i``'s outgoing neighbours are
+    ``out_targets[out_offsets[i]:out_offsets[i + 1]]``, with the edge kind code and
+    the edge's position in the graph stored alongside; incoming edges mirror this.
+    """
+
+    def __init__(self, node_ids: list[str], edges: list[dict[str, Any]]) -> None:
+        self.node_ids = node_ids
+        self.position = {node_id: idx for idx, node_id in enumerate(node_ids)}
+        self.edge_kinds = sorted({str(edge.get("kind", "")) for edge in edges})
+        kind_codes = {kind: code for code, kind in enumerate(self.edge_kinds)}
+
+        resolved = []
+        for edge_pos, edge in enumerate(edges):
+            source = self.position.get(edge.get("from"))
+            target = self.position.get(edge.get("to"))
+            if source is None or target is None:
+                continue
+            resolved.append((source, target, kind_codes[str(edge.get("kind", ""))], edge_pos))
+
+        self.out_offsets, self.out_targets, self.out_kinds, self.out_edges = self._compress(
+            (source, target, kind, pos) for source, target, kind, pos in resolved
+        )
+        self.in_offsets, self.in_targets, self.in_kinds, self.in_edges = self._compress(
+            (target, source, kind, pos) for source, target, kind, pos in resolved
+        )
+
+    def _compress(
+        self, rows: Iterable[tuple[int, int, int, int]]
+    ) -> tuple[array, array, array, array]:
+        rows = list(rows)
+        offsets = array("I", [0]) * (len(self.node_ids) + 1)
+        for source, _, _, _ in rows:
+            offsets[source + 1] += 1
+        for idx in range(len(self.node_ids)):
+            offsets[idx + 1] += offsets[idx]
+        cursor = array("I", offsets[:-1])
+        targets = array("I", [0]) * len(rows)
+        kinds = array("H", [0]) * len(rows)
+        edge_positions = array("I", [0]) * len(rows)
+        for source, target, kind, pos in rows:
+            slot = cursor[source]
+            cursor[source] += 1
+            targets[slot] = target
+            kinds[slot] = kind
+            edge_positions[slot] = pos
+        return offsets, targets, kinds, edge_positions
+
+    def kind_filter(self, edge_kinds: Iterable[str] | None) -> set[int] | None:
+        if not edge_kinds:
+            return None
+        wanted = set(edge_kinds)
+        return {code for code, kind in enumerate(self.edge_kinds) if kind in wanted}
+
+    def neighbours(
+        self, node: int, direction: str, kinds: set[int] | None
+    ) -> Iterable[tuple[int, int]]:
+        """Yields ``(neighbour, edge position)`` pairs."""
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Invalid direction: {direction}")
+        sides = []
+        if direction in ("out", "both"):
+            sides.append((self.out_offsets, self.out_targets, self.out_kinds, self.out_edges))
+        if direction in ("in", "both"):
+            sides.append((self.in_offsets, self.in_targets, self.in_kinds, self.in_edges))
+        for offsets, targets, edge_kinds, edge_positions in sides:
+            for slot in range(offsets[node], offsets[node + 1]):
+                if kinds is None or edge_kinds[slot] in kinds:
+                    yield targets[slot], edge_positions[slot]
+
+    def bfs(
+        self,
+        starts: Iterable[int],
+        direction: str = "both",
+        edge_kinds: Iterable[str] | None = None,
+        max_depth: int | None = None,
+    ) -> tuple[dict[int, int], set[int]]:
+        """Breadth-first distances from ``starts`` and the positions of traversed edges."""
+        kinds = self.kind_filter(edge_kinds)
+        distances = {start: 0 for start in starts}
+        traversed: set[int] = set()
+        queue = deque(distances)
+        while queue:
+            node = queue.popleft()
+            depth = distances[node]
+            if max_depth is not None and depth >= max_depth:
+                continue
+            for neighbour, edge_pos in self.neighbours(node, direction, kinds):
+                traversed.add(edge_pos)
+                if neighbour not in distances:
+                    distances[neighbour] = depth + 1
+                    queue.append(neighbour)
+        return distances, traversed
+
+    def shortest_path(
+        self,
+        source: int,
+        target: int,
+        direction: str = "both",
+        edge_kinds: Iterable[str] | None = None,
+    ) -> tuple[list[int], list[int]] | None:
+        """Returns node indexes and edge positions along a shortest path, or None."""
+        kinds = self.kind_filter(edge_kinds)
+        parents: dict[int, tuple[int, int] | None] = {source: None}
+        queue = deque([source])
+        while queue and target not in parents:
+            node = queue.popleft()
+            for neighbour, edge_pos in self.neighbours(node, direction, kinds):
+                if neighbour not in parents:
+                    parents[neighbour] = (node, edge_pos)
+                    queue.append(neighbour)
+        if target not in parents:
+            return None
+        nodes = [target]
+        edge_positions: list[int] = []
+        step = parents[target]
+        while step is not None:
+            previous, edge_pos = step
+            nodes.append(previous)
+            edge_positions.append(edge_pos)
+            step = parents[previous]
+        nodes.reverse()
+        edge_positions.reverse()
+        return nodes, edge_positions
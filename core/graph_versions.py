@@ -0,0 +1,285 @@
+"""Per-file graph fragments recorded for each build, and structural diffs between them."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from typing import Any
+
+GRAPH_VERSIONS_VERSION = "0.2.0"
+
+
+def split_fragments(graph: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Groups a graph's nodes by file and its edges by the file of their ``from`` node."""
+    fragments: dict[str, dict[str, Any]] = {}
+    node_files: dict[str, str] = {}
+    for node in graph.get("nodes", []):
+        file_rel = str(node.get("file", ""))
+        node_files[node["id"]] = file_rel
+        fragments.setdefault(file_rel, {"nodes": [], "edges": []})["nodes"].append(node)
+    for edge in graph.get("edges", []):
+        file_rel = node_files.get(edge.get("from"))
+        if file_rel is not None:
+            fragments[file_rel]["edges"].append(edge)
+    return fragments
+
+
+def _fragment_key(blob: bytes) -> str:
+    return hashlib.blake2b(blob, digest_size=16).hexdigest()
+
+
+def _edge_key(edge: dict[str, Any]) -> tuple[str, str, str]:
+    return (edge.get("from"), edge.get("to"), edge.get("kind"))
+
+
+def _node_identity(node: dict[str, Any]) -> tuple[str, str] | None:
+    qualname = (node.get("extra") or {}).get("qualname")
+    if qualname is None or node.get("kind") == "module":
+        return None
+    return node.get("kind", ""), qualname
+
+
+def diff_fragments(
+    old: dict[str, dict[str, Any]], new: dict[str, dict[str, Any]]
+) -> dict[str, Any]:
+    """Compares the fragments of the files that differ between two versions.
+
+    Nodes with the same id but another range are ``moved``; with other fields,
+    ``changed``. A removed and an added node with the same kind and qualified name
+    (e.g. a class moved to another file) are reported as one ``moved`` entry.
+    """
+    old_nodes = {node["id"]: node for fragment in old.values() for node in fragment["nodes"]}
+    new_nodes = {node["id"]: node for fragment in new.values() for node in fragment["nodes"]}
+    old_edges = {_edge_key(edge): edge for fragment in old.values() for edge in fragment["edges"]}
+    new_edges = {_edge_key(edge): edge for fragment in new.values() for edge in fragment["edges"]}
+
+    moved: list[dict[str, Any]] = []
+    changed: list[dict[str, Any]] = []
+    for node_id in sorted(old_nodes.keys() & new_nodes.keys()):
+        before, after = old_nodes[node_id], new_nodes[node_id]
+        if before == after:
+            continue
+        if {**before, "range": after.get("range")} == after:
+            moved.append({"id": node_id, "from": before, "to": after})
+        else:
+            changed.append({"id": node_id, "from": before, "to": after})
+
+    removed_ids = sorted(old_nodes.keys() - new_nodes.keys())
+    added_ids = sorted(new_nodes.keys() - old_nodes.keys())
+    by_identity: dict[tuple[str, str], list[str]] = {}
+    for node_id in added_ids:
+        identity = _node_identity(new_nodes[node_id])
+        if identity is not None:
+            by_identity.setdefault(identity, []).append(node_id)
+    relocated: set[str] = set()
+    for node_id in removed_ids:
+        identity = _node_identity(old_nodes[node_id])
+        candidates = by_identity.get(identity, []) if identity is not None else []
+        if len(candidates) == 1:
+            target = candidates.pop()
+            relocated.update((node_id, target))
+            moved.append({"id": target, "from": old_nodes[node_id], "to": new_nodes[target]})
+
+    return {
+        "nodes": {
+            "added": [new_nodes[node_id] for node_id in added_ids if node_id not in relocated],
+            "removed": [old_nodes[node_id] for node_id in removed_ids if node_id not in relocated],
+            "moved": moved,
+            "changed": changed,
+        },
+        "edges": {
+            "added": [new_edges[key] for key in sorted(new_edges.keys() - old_edges.keys())],
+            "removed": [old_edges[key] for key in sorted(old_edges.keys() - new_edges.keys())],
+        },
+    }
+
+
+class GraphVersionStore:
+    """Versioned graph snapshots keyed by ``code_hash``, stored as per-file fragments.
+
+    Fragments are stored once under their content hash, so versions that share
+    unchanged files share their fragments. Retention keeps at most
+    ``max_versions`` versions whose fragments fit in ``max_bytes``, evicting the
+    least recently used version first; the newest version is always kept.
+    """
+
+    def __init__(
+        self, directory: str, index_path: str, max_versions: int = 16, max_bytes: int = 0
+    ) -> None:
+        self._directory = directory
+        self._index_path = index_path
+        self._max_versions = max_versions
+        self._max_bytes = max_bytes
+
+    def _fragment_path(self, key: str) -> str:
+        return os.path.join(self._directory, key[:2], f"{key}.json")
+
+    def _load_index(self) -> dict[str, Any]:
+        try:
+            with open(self._index_path, "r", encoding="UTF-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return {"versions": [], "fragments": {}}
+        if data.get("schema_version") != GRAPH_VERSIONS_VERSION:
+            return {"versions": [], "fragments": {}}
+        return {
+            "versions": list(data.get("versions", [])),
+            "fragments": dict(data.get("fragments", {})),
+        }
+
+    def _save_index(self, index: dict[str, Any]) -> None:
+        tmp_path = f"{self._index_path}.tmp"
+        with open(tmp_path, "w", encoding="UTF-8") as handle:
+            json.dump(
+                {"schema_version": GRAPH_VERSIONS_VERSION, **index}, handle, ensure_ascii=True
+            )
+        os.replace(tmp_path, self._index_path)
+
+    def versions(self) -> list[dict[str, Any]]:
+        """Recorded versions in recording order, without their headers and file maps."""
+        return [
+            {key: value for key, value in version.items() if key not in {"files", "header"}}
+            for version in self._load_index()["versions"]
+        ]
+
+    def put_fragment(self, fragment: dict[str, Any]) -> str:
+        """Stores a fragment under its content hash and returns the key."""
+        blob = json.dumps(fragment, sort_keys=True, ensure_ascii=True).encode("utf-8")
+        key = _fragment_key(blob)
+        path = self._fragment_path(key)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as handle:
+                handle.write(blob)
+            os.replace(tmp_path, path)
+        return key
+
+    def record(
+        self, graph: dict[str, Any], known: dict[str, str] | None = None
+    ) -> dict[str, str]:
+        """Records ``graph`` as the newest version; returns its file -> fragment key map.
+
+        ``known`` maps files whose fragment is already stored unchanged to its key,
+        so those fragments are neither serialised nor hashed again.
+        """
+        known = known or {}
+        files = {
+            file_rel: known.get(file_rel) or self.put_fragment(fragment)
+            for file_rel, fragment in split_fragments(graph).items()
+        }
+        header = {key: value for key, value in graph.items() if key not in {"nodes", "edges"}}
+        self.record_files(header, files)
+        return files
+
+    def record_files(self, header: dict[str, Any], files: dict[str, str]) -> None:
+        """Makes already stored fragments the newest version described by ``header``."""
+        index = self._load_index()
+        sizes: dict[str, int] = index["fragments"]
+        for key in files.values():
+            if key not in sizes:
+                try:
+                    sizes[key] = os.path.getsize(self._fragment_path(key))
+                except OSError:
+                    sizes[key] = 0
+
+        code_hash = header.get("code_hash", "")
+        versions = [v for v in index["versions"] if v.get("code_hash") != code_hash]
+        versions.append(
+            {
+                "code_hash": code_hash,
+                "generated_at": header.get("generated_at"),
+                "last_used": time.time(),
+                "header": header,
+                "files": dict(files),
+            }
+        )
+        index["versions"] = self._retain(versions, sizes)
+        live = {key for version in index["versions"] for key in version["files"].values()}
+        for key in set(sizes) - live:
+            del sizes[key]
+            try:
+                os.remove(self._fragment_path(key))
+            except OSError:
+                pass
+        self._save_index(index)
+
+    def _retain(
+        self, versions: list[dict[str, Any]], sizes: dict[str, int]
+    ) -> list[dict[str, Any]]:
+        newest = versions[-1]
+        kept = list(versions)
+
+        def over_budget() -> bool:
+            if self._max_versions > 0 and len(kept) > self._max_versions:
+                return True
+            if self._max_bytes <= 0:
+                return False
+            keys = {key for version in kept for key in version["files"].values()}
+            return sum(sizes.get(key, 0) for key in keys) > self._max_bytes
+
+        for version in sorted(versions[:-1], key=lambda item: item.get("last_used", 0)):
+            if not over_budget():
+                break
+            kept.remove(version)
+        return kept if newest in kept else [*kept, newest]
+
+    def touch(self, code_hash: str) -> None:
+        """Marks a version as used so retention evicts it last."""
+        index = self._load_index()
+        for version in index["versions"]:
+            if version.get("code_hash") == code_hash:
+                version["last_used"] = time.time()
+                self._save_index(index)
+                return
+
+    def graph(self, code_hash: str) -> dict[str, Any] | None:
+        """Reassembles the full graph of a recorded version, or None if it was evicted."""
+        for version in self._load_index()["versions"]:
+            if version.get("code_hash") != code_hash:
+                continue
+            graph = dict(version.get("header", {}))
+            graph["nodes"] = []
+            graph["edges"] = []
+            for key in version["files"].values():
+                fragment = self.fragment(key)
+                graph["nodes"].extend(fragment["nodes"])
+                graph["edges"].extend(fragment["edges"])
+            self.touch(code_hash)
+            return graph
+        return None
+
+    def files(self, code_hash: str) -> dict[str, str] | None:
+        for version in self._load_index()["versions"]:
+            if version.get("code_hash") == code_hash:
+                return dict(version.get("files", {}))
+        return None
+
+    def fragment(self, key: str) -> dict[str, Any]:
+        with open(self._fragment_path(key), "r", encoding="UTF-8") as handle:
+            return json.load(handle)
+
+    def diff(self, from_hash: str, to_hash: str) -> dict[str, Any]:
+        """Structural diff between two recorded versions, loading only differing files."""
+        old_files = self.files(from_hash)
+        new_files = self.files(to_hash)
+        if old_files is None or new_files is None:
+            missing = from_hash if old_files is None else to_hash
+            raise ValueError(f"Unknown code hash: {missing}")
+        changed_files = sorted(
+            file_rel
+            for file_rel in old_files.keys() | new_files.keys()
+            if old_files.get(file_rel) != new_files.get(file_rel)
+        )
+        old = {f: self.fragment(old_files[f]) for f in changed_files if f in old_files}
+        new = {f: self.fragment(new_files[f]) for f in changed_files if f in new_files}
+        result = diff_fragments(old, new)
+        self.touch(from_hash)
+        self.touch(to_hash)
+        result["files"] = {
+            "added": [f for f in changed_files if f not in old_files],
+            "removed": [f for f in changed_files if f not in new_files],
+            "changed": [f for f in changed_files if f in old_files and f in new_files],
+        }
+        return result
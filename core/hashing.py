@@ -0,0 +1,75 @@
+"""Streaming file hashing."""
+from __future__ import annotations
+
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable
+
+SUPPORTED_ALGORITHMS = ("sha256", "blake2b", "sha1", "md5")
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class FileHasher:
+    """Hashes files in fixed-size chunks, concurrently on a thread pool.
+
+    Each worker thread reuses one chunk buffer, so peak memory is bounded by
+    ``chunk_size * workers`` regardless of file sizes. hashlib releases the GIL
+    while digesting large buffers, which lets threads overlap I/O and hashing.
+    """
+
+    def __init__(
+        self,
+        algorithm: str = "sha256",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        workers: int = 0,
+    ) -> None:
+        if algorithm not in SUPPORTED_ALGORITHMS:
+            raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.algorithm = algorithm
+        self._chunk_size = chunk_size
+        self._workers = workers
+        self._local = threading.local()
+
+    def new(self) -> Any:
+        return hashlib.new(self.algorithm)
+
+    def _buffer(self) -> memoryview:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = memoryview(bytearray(self._chunk_size))
+            self._local.buffer = buffer
+        return buffer
+
+    def hash_bytes(self, data: bytes) -> str:
+        hasher = self.new()
+        hasher.update(data)
+        return hasher.hexdigest()
+
+    def hash_file(self, full_path: str) -> str:
+        hasher = self.new()
+        buffer = self._buffer()
+        with open(full_path, "rb", buffering=0) as handle:
+            while True:
+                read = handle.readinto(buffer)
+                if not read:
+                    break
+                hasher.update(buffer[:read])
+        return hasher.hexdigest()
+
+    def _try_hash_file(self, full_path: str) -> str | None:
+        try:
+            return self.hash_file(full_path)
+        except OSError:
+            return None
+
+    def hash_files(self, paths: Iterable[str]) -> dict[str, str | None]:
+        """Hashes many files; unreadable files map to None."""
+        paths = list(paths)
+        workers = min(self._workers or 8, len(paths))
+        if workers <= 1:
+            return {path: self._try_hash_file(path) for path in paths}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return dict(zip(paths, pool.map(self._try_hash_file, paths)))
@@ -0,0 +1,190 @@
+"""Merkle-style hash tree over project files."""
+from __future__ import annotations
+
+import json
+import os
+import posixpath
+import time
+from typing import Any, Iterable
+
+from core.hashing import FileHasher
+
+HASH_TREE_VERSION = "0.1.0"
+
+
+def _ancestors(rel_path: str) -> list[str]:
+    """Returns the directories containing ``rel_path``, deepest first, ending with the root ""."""
+    result = []
+    folder = posixpath.dirname(rel_path)
+    while folder:
+        result.append(folder)
+        folder = posixpath.dirname(folder)
+    result.append("")
+    return result
+
+
+class HashTree:
+    """File digests rolled up into per-directory digests, revalidated by stat.
+
+    File entries are trusted while their size and mtime match and the file was not
+    modified after the previous scan started, so a refresh only reads changed files
+    and only recomputes the digests of directories on their paths.
+    """
+
+    def __init__(
+        self, path: str, hasher: FileHasher | None = None, history_size: int = 16
+    ) -> None:
+        self._path = path
+        self._hasher = hasher or FileHasher()
+        self._history_size = history_size
+        self.files: dict[str, dict[str, Any]] = {}
+        self.dirs: dict[str, str] = {}
+        self.root = ""
+        self.scanned_ns = 0
+        self.history: list[dict[str, Any]] = []
+
+    def load(self) -> "HashTree":
+        if not os.path.exists(self._path):
+            return self
+        try:
+            with open(self._path, "r", encoding="UTF-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return self
+        if data.get("schema_version") != HASH_TREE_VERSION:
+            return self
+        if data.get("algorithm", "sha256") != self._hasher.algorithm:
+            return self
+        self.files = data.get("files", {})
+        self.dirs = data.get("dirs", {})
+        self.root = data.get("root", "")
+        self.scanned_ns = int(data.get("scanned_ns", 0))
+        self.history = data.get("history", [])
+        return self
+
+    def save(self) -> None:
+        data = {
+            "schema_version": HASH_TREE_VERSION,
+            "algorithm": self._hasher.algorithm,
+            "root": self.root,
+            "scanned_ns": self.scanned_ns,
+            "files": self.files,
+            "dirs": self.dirs,
+            "history": self.history,
+        }
+        tmp_path = f"{self._path}.tmp"
+        with open(tmp_path, "w", encoding="UTF-8") as handle:
+            json.dump(data, handle, ensure_ascii=True)
+        os.replace(tmp_path, self._path)
+
+    @property
+    def algorithm(self) -> str:
+        return self._hasher.algorithm
+
+    def digest(self, rel_path: str) -> str | None:
+        entry = self.files.get(rel_path)
+        return entry["digest"] if entry else None
+
+    def refresh(self, files: Iterable[tuple[str, str]]) -> bool:
+        """Revalidates the tree against ``(full_path, rel_path)`` pairs.
+
+        Returns True when any file had to be re-read or disappeared, i.e. when the
+        tree should be saved.
+        """
+        scan_started = time.time_ns()
+        current: dict[str, dict[str, Any]] = {}
+        stale: dict[str, tuple[str, os.stat_result]] = {}
+        for full_path, rel_path in files:
+            try:
+                stat = os.stat(full_path)
+            except OSError:
+                continue
+            previous = self.files.get(rel_path)
+            if (
+                previous
+                and previous.get("size") == stat.st_size
+                and previous.get("mtime_ns") == stat.st_mtime_ns
+                and stat.st_mtime_ns < self.scanned_ns
+            ):
+                current[rel_path] = previous
+                continue
+            stale[rel_path] = (full_path, stat)
+
+        digests = self._hasher.hash_files(full_path for full_path, _ in stale.values())
+        changed: set[str] = set()
+        for rel_path, (full_path, stat) in stale.items():
+            digest = digests.get(full_path)
+            if digest is None:
+                continue
+            current[rel_path] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "digest": digest,
+            }
+            previous = self.files.get(rel_path)
+            if not previous or previous.get("digest") != digest:
+                changed.add(rel_path)
+        changed.update(rel_path for rel_path in self.files if rel_path not in current)
+        rehashed = bool(stale) or len(current) != len(self.files)
+
+        self.files = current
+        self.scanned_ns = scan_started
+        if not changed and self.root:
+            return rehashed
+
+        dirty: set[str] = {""}
+        for rel_path in changed:
+            dirty.update(_ancestors(rel_path))
+
+        children: dict[str, list[tuple[str, str, str]]] = {folder: [] for folder in dirty}
+        for rel_path, entry in current.items():
+            folder = posixpath.dirname(rel_path)
+            if folder in children:
+                children[folder].append(("f", posixpath.basename(rel_path), entry["digest"]))
+        live_dirs = {""}
+        for rel_path in current:
+            live_dirs.update(_ancestors(rel_path))
+        subdirs: dict[str, list[str]] = {}
+        for folder in live_dirs:
+            if folder:
+                subdirs.setdefault(posixpath.dirname(folder), []).append(folder)
+
+        previous_root = self.root
+        previous_dirs = self.dirs
+        dirs = {folder: digest for folder, digest in self.dirs.items() if folder in live_dirs}
+        for folder in sorted(
+            dirty & live_dirs, key=lambda item: item.count("/") if item else -1, reverse=True
+        ):
+            entries = list(children.get(folder, []))
+            for sub in subdirs.get(folder, []):
+                entries.append(("d", posixpath.basename(sub), dirs[sub]))
+            hasher = self._hasher.new()
+            for kind, name, digest in sorted(entries):
+                hasher.update(f"{kind} {name} {digest}\n".encode("utf-8"))
+            dirs[folder] = hasher.hexdigest()
+
+        self.dirs = dirs
+        self.root = dirs[""]
+        if previous_root and previous_root != self.root:
+            self._remember(previous_root, previous_dirs)
+        return True
+
+    def _remember(self, root: str, dirs: dict[str, str]) -> None:
+        """Keeps the directory digests of a superseded root for ``changed_since``."""
+        self.history = [entry for entry in self.history if entry.get("root") != root]
+        self.history.append({"root": root, "dirs": dirs})
+        self.history = self.history[-self._history_size :]
+
+    def changed_since(self, root: str) -> dict[str, Any]:
+        """Lists directories whose digest differs from the tree identified by ``root``."""
+        if root == self.root:
+            return {"known": True, "changed": False, "directories": []}
+        for entry in self.history:
+            if entry.get("root") == root:
+                old_dirs = entry.get("dirs", {})
+                names = set(old_dirs) | set(self.dirs)
+                directories = sorted(
+                    name for name in names if old_dirs.get(name) != self.dirs.get(name)
+                )
+                return {"known": True, "changed": True, "directories": directories}
+        return {"known": False, "changed": True, "directories": []}
@@ -0,0 +1,109 @@
+"""Gitignore-style ignore rules applied while walking project trees."""
+from __future__ import annotations
+
+import os
+import re
+from typing import Iterable
+
+DEFAULT_IGNORE_PATTERNS = (
+    ".git/",
+    ".hg/",
+    ".svn/",
+    ".venv/",
+    "venv/",
+    "__pycache__/",
+    "node_modules/",
+    ".mypy_cache/",
+    ".pytest_cache/",
+    ".ruff_cache/",
+    ".tox/",
+    "*.egg-info/",
+)
+
+
+def _translate(pattern: str) -> str:
+    """Translates a gitignore glob (``*``, ``?``, ``[...]``, ``**``) into a regex."""
+    out = []
+    idx = 0
+    while idx < len(pattern):
+        char = pattern[idx]
+        if pattern.startswith("**/", idx):
+            out.append("(?:.*/)?")
+            idx += 3
+            continue
+        if pattern.startswith("**", idx):
+            out.append(".*")
+            idx += 2
+            continue
+        if char == "*":
+            out.append("[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", idx + 1)
+            if end == -1:
+                out.append(re.escape(char))
+            else:
+                body = pattern[idx + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                idx = end
+        else:
+            out.append(re.escape(char))
+        idx += 1
+    return "".join(out)
+
+
+class IgnoreRules:
+    """Ordered gitignore-style patterns; the last matching pattern wins.
+
+    Supported syntax: ``#`` comments, ``!`` negation, a trailing ``/`` for
+    directories only, and anchoring to the project root with a leading or inner
+    ``/``; unanchored patterns match the entry name at any depth.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self.patterns = tuple(patterns)
+        self._rules: list[tuple[re.Pattern[str], bool, bool, bool]] = []
+        for raw in self.patterns:
+            line = raw.strip()
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            anchored = "/" in line
+            line = line.lstrip("/")
+            if not line:
+                continue
+            regex = re.compile(f"{_translate(line)}$")
+            self._rules.append((regex, negated, dir_only, anchored))
+
+    @property
+    def key(self) -> tuple[str, ...]:
+        return self.patterns
+
+    def ignored(self, rel_path: str, is_dir: bool) -> bool:
+        result = False
+        name = rel_path.rsplit("/", 1)[-1]
+        for regex, negated, dir_only, anchored in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path if anchored else name):
+                result = not negated
+        return result
+
+
+def load_ignore_rules(root: str, patterns: Iterable[str], use_gitignore: bool) -> IgnoreRules:
+    """Combines configured patterns with the project's root ``.gitignore``."""
+    combined = list(patterns)
+    if use_gitignore:
+        try:
+            with open(os.path.join(root, ".gitignore"), "r", encoding="UTF-8") as handle:
+                combined.extend(handle.read().splitlines())
+        except (OSError, UnicodeDecodeError):
+            pass
+    return IgnoreRules(combined)
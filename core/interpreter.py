@@ -28,24 +28,31 @@ class GraphChangeApplier:
     def _project_root(self, project: str) -> str:
         return os.path.join(self._config.base_path, project)
 
-    def _graph_path(self, project: str) -> str:
-        return os.path.join(
-            os.path.abspath(os.path.join(os.path.dirname(__file__), "..")),
-            "graphs",
-            f"{project}.codegraph.json",
-        )
-
-    def _load_graph(self, project: str) -> dict[str, Any]:
-        graph_path = self._graph_path(project)
-        if not os.path.exists(graph_path):
-            raise ValueError("Graph not found, build it first")
-        with open(graph_path, "r", encoding="UTF-8") as handle:
-            return json.load(handle)
+    def _load_graph(
+        self, project: str, operations: list[Any] | None = None
+    ) -> dict[str, Any]:
+        """Loads the graph, or with sharded storage only the files ``operations`` touch."""
+        if not isinstance(operations, list):
+            return self._graphs.load_graph(project)
+        node_ids: set[str] = set()
+        files: set[str] = set()
+        for op in operations:
+            if not isinstance(op, dict):
+                continue
+            if op.get("op") == "delete_node":
+                # Edges into a deleted node can live in any shard.
+                return self._graphs.load_graph(project)
+            node = op.get("node") or {}
+            edge = op.get("edge") or {}
+            if op.get("node_id"):
+                node_ids.add(op["node_id"])
+            if node.get("file"):
+                files.add(node["file"])
+            node_ids.update(node_id for node_id in (edge.get("from"), edge.get("to")) if node_id)
+        return self._graphs.load_partial(project, node_ids=node_ids, files=files)
 
     def _write_graph(self, project: str, graph: dict[str, Any]) -> None:
-        graph_path = self._graph_path(project)
-        with open(graph_path, "w", encoding="UTF-8") as handle:
-            json.dump(graph, handle, indent=2, ensure_ascii=True)
+        self._graphs.write_partial(project, graph)
 
     def _split_file(self, file_rel: str) -> tuple[str, str, str]:
         folder, filename = os.path.split(file_rel)
@@ -184,7 +191,7 @@ class GraphChangeApplier:
         if proposal.get("base_code_hash") != current_hash:
             raise ValueError("Code hash mismatch")
 
-        graph = self._load_graph(project)
+        graph = self._load_graph(project, proposal.get("operations"))
         nodes = graph.get("nodes", [])
         edges = graph.get("edges", [])
         nodes_by_id = {node["id"]: node for node in nodes}
@@ -205,6 +212,8 @@ class GraphChangeApplier:
         added_nodes = {op["node"]["id"]: op["node"] for op in add_nodes if op.get("node")}
         added_edges = [op.get("edge") for op in add_edges if op.get("edge")]
 
+        if "partial_files" in graph:
+            node_ids |= self._graphs.known_node_ids(project, added_nodes)
         for node_id in added_nodes:
             if node_id in node_ids:
                 raise ValueError(f"Node already exists: {node_id}")
@@ -374,8 +383,9 @@ class GraphChangeApplier:
                 edges.append(edge)
 
         graph["generated_at"] = datetime.now(timezone.utc).isoformat()
-        graph["code_hash"] = self._graphs.compute_code_hash(project)
+        self._graphs.refresh_hashes(project, graph)
         self._write_graph(project, graph)
+        self._graphs.mark_proposal_applied(project, proposal_path, graph["code_hash"])
 
         return {
             "applied": True,
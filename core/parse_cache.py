@@ -0,0 +1,124 @@
+"""Content-addressed, size-bounded cache of per-file extraction results."""
+from __future__ import annotations
+
+import json
+import os
+from typing import Any
+
+
+class ParseCache:
+    """Stores extracted fragments on disk keyed by file digest and extractor version.
+
+    Entries do not depend on the project or path of the file, so identical files
+    anywhere under the apps root are parsed once. Hits refresh the entry's mtime and
+    ``prune`` evicts the least recently used entries once ``max_bytes`` is exceeded.
+    The cache's total size is kept in ``size.json``, so ``prune`` only walks the
+    entries when that running total is missing or over the bound.
+    """
+
+    def __init__(self, directory: str, version: str, max_bytes: int) -> None:
+        self._directory = directory
+        self._version = version
+        self._max_bytes = max_bytes
+        self._added = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_bytes > 0
+
+    def _entry_path(self, algorithm: str, digest: str) -> str:
+        return os.path.join(
+            self._directory, digest[:2], f"{self._version}.{algorithm}.{digest}.json"
+        )
+
+    def get(self, algorithm: str, digest: str) -> tuple[bool, dict[str, Any] | None]:
+        """Returns ``(hit, fragment)``; a hit may carry ``None`` for unparsable files."""
+        if not self.enabled:
+            return False, None
+        path = self._entry_path(algorithm, digest)
+        try:
+            with open(path, "r", encoding="UTF-8") as handle:
+                entry = json.load(handle)
+            os.utime(path)
+        except (OSError, ValueError):
+            return False, None
+        return True, entry.get("fragment")
+
+    def put(self, algorithm: str, digest: str, fragment: dict[str, Any] | None) -> None:
+        if not self.enabled:
+            return
+        path = self._entry_path(algorithm, digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="UTF-8") as handle:
+                json.dump({"fragment": fragment}, handle, ensure_ascii=True)
+            added = os.path.getsize(tmp_path)
+            replaced = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self._added += added - replaced
+
+    def _size_path(self) -> str:
+        return os.path.join(self._directory, "size.json")
+
+    def _read_size(self) -> int | None:
+        try:
+            with open(self._size_path(), "r", encoding="UTF-8") as handle:
+                return int(json.load(handle)["bytes"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_size(self, total: int) -> None:
+        path = self._size_path()
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="UTF-8") as handle:
+                json.dump({"bytes": max(0, total)}, handle)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def prune(self) -> int:
+        """Evicts least recently used entries until the cache fits; returns the count.
+
+        Sizes added by this instance's ``put`` calls are folded into the running
+        total; the directory is only walked (and the total corrected) when the
+        total is unknown or exceeds ``max_bytes``.
+        """
+        if not self.enabled or not os.path.isdir(self._directory):
+            return 0
+        stored = self._read_size()
+        added, self._added = self._added, 0
+        if stored is not None and stored + added <= self._max_bytes:
+            self._write_size(stored + added)
+            return 0
+        entries = []
+        total = 0
+        for current_root, _, filenames in os.walk(self._directory):
+            for filename in filenames:
+                if not filename.endswith(".json") or filename == "size.json":
+                    continue
+                path = os.path.join(current_root, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+                total += stat.st_size
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self._max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self._write_size(total)
+        return removed
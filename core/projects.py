@@ -5,11 +5,14 @@ from collections import defaultdict
 import os
 
 from core.config import AppConfig
+from core.ignore import IgnoreRules, load_ignore_rules
+from core.snapshot import SNAPSHOTS, ProjectSnapshot, SnapshotCache
 
 
 class ProjectManager:
-    def __init__(self, config: AppConfig) -> None:
+    def __init__(self, config: AppConfig, snapshots: SnapshotCache | None = None) -> None:
         self._config = config
+        self._snapshots = snapshots or SNAPSHOTS
 
     def _project_root(self, project: str) -> str:
         return os.path.join(self._config.base_path, project)
@@ -35,29 +38,37 @@ class ProjectManager:
             os.rename(path_to_rename, new_path_full)
         return True
 
+    def _ignore_rules(self, root: str) -> IgnoreRules:
+        return load_ignore_rules(root, self._config.ignore_patterns, self._config.use_gitignore)
+
+    def _snapshot_folder(
+        self, project: str, sub_path: str | None
+    ) -> tuple[ProjectSnapshot, str]:
+        """Returns the cached project snapshot and the folder key for ``sub_path``."""
+        root = self._project_root(project)
+        snapshot = self._snapshots.get(root, self._ignore_rules(root))
+        if not sub_path:
+            return snapshot, ""
+        rel_dir = snapshot.relative(sub_path)
+        if rel_dir is None:
+            return self._snapshots.get(sub_path, self._ignore_rules(sub_path)), ""
+        return snapshot, rel_dir
+
     def scaffolding(self, project: str, sub_path: str | None = None) -> dict:
         """Retrieves the project scaffolding in a dict (json) shape."""
         self._validate_project(project)
-        root = self._project_root(project)
-        path = root if not sub_path else sub_path
+        snapshot, rel_dir = self._snapshot_folder(project, sub_path)
 
-        folder_dict = {
-            "folder_name": project if not sub_path else os.path.basename(sub_path),
-            "files": [],
-            "subfolders": [],
-        }
-
-        try:
-            for entry in os.scandir(path):
-                if entry.is_file():
+        def folder(rel: str, name: str) -> dict:
+            folder_dict = {"folder_name": name, "files": [], "subfolders": []}
+            for entry in snapshot.children.get(rel, []):
+                if entry.is_dir:
+                    folder_dict["subfolders"].append(folder(entry.rel_path, entry.name))
+                else:
                     folder_dict["files"].append(entry.name)
-                elif entry.is_dir():
-                    subfolder_dict = self.scaffolding(project=project, sub_path=entry.path)
-                    folder_dict["subfolders"].append(subfolder_dict)
-        except PermissionError:
-            pass
+            return folder_dict
 
-        return folder_dict
+        return folder(rel_dir, project if not sub_path else os.path.basename(sub_path))
 
     def inverted_index(
         self, project: str, sub_path: str | None = None, pre_index: dict | None = None
@@ -68,22 +79,15 @@ class ProjectManager:
         """
         self._validate_project(project)
         index = defaultdict(list) if pre_index is None else pre_index
-        root = self._project_root(project)
-        path = root if not sub_path else sub_path
-
-        try:
-            for entry in os.scandir(path):
-                if entry.is_file():
-                    name, extension = entry.name.split(".")
-                    index[extension].append(entry.path)
-                    index[name].append(entry.path)
-                elif entry.is_dir():
-                    for segment in entry.path.split("\\"):
-                        index[segment].append(entry.path)
-                    index = self.inverted_index(
-                        project=project, sub_path=entry.path, pre_index=index
-                    )
-        except PermissionError:
-            pass
+        snapshot, rel_dir = self._snapshot_folder(project, sub_path)
+
+        for entry in snapshot.walk(rel_dir):
+            if entry.is_dir:
+                for segment in entry.path.split("\\"):
+                    index[segment].append(entry.path)
+            else:
+                name, extension = entry.name.split(".")
+                index[extension].append(entry.path)
+                index[name].append(entry.path)
 
         return index
@@ -0,0 +1,205 @@
+"""SQLite catalog of saved graph proposals."""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Any, Iterable
+
+PROPOSAL_STATUSES = ("pending", "applied", "stale")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS proposals (
+    id TEXT PRIMARY KEY,
+    base_code_hash TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    status TEXT NOT NULL,
+    path TEXT NOT NULL,
+    op_count INTEGER NOT NULL,
+    op_counts TEXT NOT NULL,
+    rationale TEXT NOT NULL,
+    applied_code_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS proposals_status ON proposals (status, created_at);
+CREATE INDEX IF NOT EXISTS proposals_base ON proposals (base_code_hash, status);
+"""
+
+_COLUMNS = (
+    "id, base_code_hash, created_at, recorded_at, status, path, op_count, op_counts, "
+    "rationale, applied_code_hash"
+)
+
+
+def _entry(row: sqlite3.Row) -> dict[str, Any]:
+    entry = dict(row)
+    entry["op_counts"] = json.loads(entry["op_counts"])
+    return entry
+
+
+def _row(
+    proposal_id: str,
+    proposal: dict[str, Any],
+    path: str,
+    recorded_at: float | None,
+    status: str,
+) -> tuple[Any, ...]:
+    op_counts: dict[str, int] = {}
+    for op in proposal.get("operations") or []:
+        name = str(op.get("op", ""))
+        op_counts[name] = op_counts.get(name, 0) + 1
+    return (
+        proposal_id,
+        str(proposal.get("base_code_hash", "")),
+        str(proposal.get("created_at", "")),
+        time.time() if recorded_at is None else recorded_at,
+        status,
+        path,
+        sum(op_counts.values()),
+        json.dumps(dict(sorted(op_counts.items()))),
+        str(proposal.get("rationale") or ""),
+        None,
+    )
+
+
+def _check_statuses(statuses: Iterable[str]) -> list[str]:
+    statuses = list(statuses)
+    for status in statuses:
+        if status not in PROPOSAL_STATUSES:
+            raise ValueError(f"Invalid proposal status: {status}")
+    return statuses
+
+
+class ProposalCatalog:
+    """One row per saved proposal: identity, base hash, op counts, status and file.
+
+    Listing and lookups hit indexed columns instead of parsing proposal files.
+    Each call opens its own connection, as in ``SqliteGraphStore``.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+
+    def exists(self) -> bool:
+        return os.path.exists(self._path)
+
+    def create(self) -> None:
+        """Creates the database and its schema if they do not exist yet."""
+        with closing(self._connect()):
+            pass
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def add(
+        self,
+        proposal_id: str,
+        proposal: dict[str, Any],
+        path: str,
+        status: str = "pending",
+        recorded_at: float | None = None,
+    ) -> dict[str, Any]:
+        """Records (or re-records) a proposal and returns its catalog entry."""
+        _check_statuses([status])
+        self.add_many([(proposal_id, proposal, path, recorded_at)], status)
+        return self.get(proposal_id)
+
+    def add_many(
+        self,
+        records: Iterable[tuple[str, dict[str, Any], str, float | None]],
+        status: str = "pending",
+    ) -> int:
+        """Records ``(id, proposal, path, recorded_at)`` tuples in one transaction."""
+        _check_statuses([status])
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.executemany(
+                f"INSERT OR REPLACE INTO proposals ({_COLUMNS}) "
+                f"VALUES ({', '.join('?' * len(_COLUMNS.split(',')))})",
+                (_row(*record, status) for record in records),
+            )
+        return cursor.rowcount
+
+    def get(self, proposal_id: str) -> dict[str, Any] | None:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                f"SELECT {_COLUMNS} FROM proposals WHERE id = ?", (proposal_id,)
+            ).fetchone()
+        return _entry(row) if row is not None else None
+
+    def entries(
+        self,
+        statuses: Iterable[str] = (),
+        base_code_hash: str | None = None,
+        limit: int | None = 50,
+        offset: int = 0,
+    ) -> dict[str, Any]:
+        """Entries newest first, filtered by status and base hash; ``total`` ignores paging."""
+        clauses: list[str] = []
+        params: list[Any] = []
+        statuses = _check_statuses(statuses)
+        if statuses:
+            clauses.append(f"status IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+        if base_code_hash is not None:
+            clauses.append("base_code_hash = ?")
+            params.append(base_code_hash)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with closing(self._connect()) as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM proposals{where}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT {_COLUMNS} FROM proposals{where} "
+                "ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+                [*params, -1 if limit is None else max(0, limit), max(0, offset)],
+            ).fetchall()
+        return {"total": total, "proposals": [_entry(row) for row in rows]}
+
+    def set_status(
+        self, proposal_id: str, status: str, applied_code_hash: str | None = None
+    ) -> bool:
+        _check_statuses([status])
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "UPDATE proposals SET status = ?, applied_code_hash = ? WHERE id = ?",
+                (status, applied_code_hash, proposal_id),
+            )
+        return cursor.rowcount > 0
+
+    def refresh(self, current_hash: str) -> None:
+        """Marks pending proposals on another base stale, and stale ones on this base pending."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "UPDATE proposals SET status = 'stale' "
+                "WHERE status = 'pending' AND base_code_hash != ?",
+                (current_hash,),
+            )
+            conn.execute(
+                "UPDATE proposals SET status = 'pending' "
+                "WHERE status = 'stale' AND base_code_hash = ?",
+                (current_hash,),
+            )
+
+    def remove(
+        self, statuses: Iterable[str] = ("stale",), older_than: float | None = None
+    ) -> list[dict[str, Any]]:
+        """Deletes the entries with ``statuses`` (recorded before ``older_than``); returns them."""
+        statuses = _check_statuses(statuses)
+        if not statuses:
+            return []
+        clauses = [f"status IN ({', '.join('?' * len(statuses))})"]
+        params: list[Any] = list(statuses)
+        if older_than is not None:
+            clauses.append("recorded_at < ?")
+            params.append(older_than)
+        where = " AND ".join(clauses)
+        with closing(self._connect()) as conn, conn:
+            rows = conn.execute(f"SELECT {_COLUMNS} FROM proposals WHERE {where}", params)
+            removed = [_entry(row) for row in rows.fetchall()]
+            conn.execute(f"DELETE FROM proposals WHERE {where}", params)
+        return removed
@@ -0,0 +1,139 @@
+"""Single-pass snapshots of a project tree, cached until a directory changes."""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Iterator, NamedTuple
+
+from core.ignore import IgnoreRules
+
+
+class SnapshotEntry(NamedTuple):
+    name: str
+    path: str
+    rel_path: str
+    is_dir: bool
+    extension: str
+    size: int
+    mtime_ns: int
+
+
+class ProjectSnapshot:
+    """Every file and folder under ``root`` from one recursive ``os.scandir`` pass.
+
+    ``children`` keeps each folder's entries in scandir order, keyed by the folder's
+    relative path ("" for the root). Stat values are as of the scan: adding,
+    removing or renaming entries changes a directory's mtime and invalidates the
+    snapshot, but editing a file in place does not, so content checks must re-stat.
+    Entries matching ``rules`` are skipped, and ignored folders are never entered.
+    """
+
+    def __init__(self, root: str, rules: IgnoreRules | None = None) -> None:
+        self.root = root
+        self.rules = rules
+        self.children: dict[str, list[SnapshotEntry]] = {}
+        self.dir_mtimes: dict[str, int] = {}
+        self.scanned_ns = time.time_ns()
+        self._scan(root, "")
+
+    def _scan(self, path: str, rel_dir: str) -> None:
+        try:
+            self.dir_mtimes[rel_dir] = os.stat(path).st_mtime_ns
+            with os.scandir(path) as iterator:
+                scanned = list(iterator)
+        except OSError:
+            self.children[rel_dir] = []
+            return
+        entries = []
+        subdirs = []
+        for entry in scanned:
+            try:
+                is_dir = entry.is_dir()
+                if not is_dir and not entry.is_file():
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            if self.rules is not None and self.rules.ignored(rel_path, is_dir):
+                continue
+            extension = entry.name.rsplit(".", 1)[-1].lower() if "." in entry.name else ""
+            entries.append(
+                SnapshotEntry(
+                    entry.name,
+                    entry.path,
+                    rel_path,
+                    is_dir,
+                    "" if is_dir else extension,
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                )
+            )
+            if is_dir and not entry.is_symlink():
+                subdirs.append((entry.path, rel_path))
+        self.children[rel_dir] = entries
+        for path_, rel_path in subdirs:
+            self._scan(path_, rel_path)
+
+    def is_current(self) -> bool:
+        """True while no directory changed since (or during the tick of) the scan."""
+        for rel_dir, mtime_ns in self.dir_mtimes.items():
+            if mtime_ns >= self.scanned_ns:
+                return False
+            path = os.path.join(self.root, rel_dir) if rel_dir else self.root
+            try:
+                if os.stat(path).st_mtime_ns != mtime_ns:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def relative(self, path: str) -> str | None:
+        """Relative folder key for ``path``, or None when it is outside the snapshot."""
+        rel = os.path.relpath(os.path.abspath(path), os.path.abspath(self.root))
+        if rel == ".":
+            return ""
+        rel = rel.replace("\\", "/")
+        return None if rel.startswith("..") else rel
+
+    def walk(self, rel_dir: str = "") -> Iterator[SnapshotEntry]:
+        """Yields entries depth-first in scandir order, each folder before its contents."""
+        for entry in self.children.get(rel_dir, []):
+            yield entry
+            if entry.is_dir:
+                yield from self.walk(entry.rel_path)
+
+    def directories(self) -> list[str]:
+        return [rel_dir for rel_dir in self.children if rel_dir]
+
+    def files(self) -> Iterator[SnapshotEntry]:
+        return (entry for entry in self.walk() if not entry.is_dir)
+
+
+class SnapshotCache:
+    """Thread-safe cache of snapshots by root, shared by the services of one process."""
+
+    def __init__(self) -> None:
+        self._snapshots: dict[tuple[str, tuple[str, ...]], ProjectSnapshot] = {}
+        self._lock = threading.Lock()
+
+    def get(self, root: str, rules: IgnoreRules | None = None) -> ProjectSnapshot:
+        key = (root, rules.key if rules is not None else ())
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is None or not snapshot.is_current():
+                snapshot = ProjectSnapshot(root, rules)
+                self._snapshots[key] = snapshot
+            return snapshot
+
+    def invalidate(self, root: str | None = None) -> None:
+        with self._lock:
+            if root is None:
+                self._snapshots.clear()
+                return
+            for key in [key for key in self._snapshots if key[0] == root]:
+                del self._snapshots[key]
+
+
+SNAPSHOTS = SnapshotCache()
@@ -0,0 +1,132 @@
+"""Project symbol table used to resolve references between graph nodes."""
+from __future__ import annotations
+
+import posixpath
+from typing import Any, Iterable
+
+RESOLVED_EDGE_KINDS = ("calls", "references", "resolves_to")
+_DEFINITION_KINDS = {"module", "class", "function", "method"}
+_MAX_REEXPORT_DEPTH = 8
+
+
+def resolve_relative(module: str, level: int, is_package: bool, target: str) -> str:
+    """Turns ``from <level dots><target>`` inside ``module`` into an absolute dotted name."""
+    if not level:
+        return target
+    parts = module.split(".") if module else []
+    if not is_package:
+        parts = parts[:-1]
+    if level > 1:
+        parts = parts[: len(parts) - (level - 1)] if level - 1 <= len(parts) else []
+    base = ".".join(parts)
+    if base and target:
+        return f"{base}.{target}"
+    return base or target
+
+
+class SymbolTable:
+    """Qualified name -> node id, plus per-file local names and import aliases.
+
+    Module qualnames come from the project's file paths, so ``qualified`` doubles
+    as the module-path index used to resolve import nodes.
+
+    Built in one pass over the graph's nodes; every resolution is a handful of
+    dictionary lookups, so resolving all references stays linear in project size.
+    """
+
+    def __init__(self, nodes: Iterable[dict[str, Any]]) -> None:
+        self.qualified: dict[str, str] = {}
+        self.modules: dict[str, str] = {}
+        self.local: dict[str, dict[str, str]] = {}
+        self.aliases: dict[str, dict[str, str]] = {}
+        self.import_targets: dict[str, str] = {}
+        imports: list[dict[str, Any]] = []
+
+        for node in nodes:
+            kind = node.get("kind")
+            extra = node.get("extra") or {}
+            file_rel = node.get("file", "")
+            if kind == "module":
+                qualname = extra.get("qualname", "")
+                self.modules[file_rel] = qualname
+                self.qualified.setdefault(qualname, node["id"])
+            elif kind in _DEFINITION_KINDS and extra.get("qualname"):
+                self.local.setdefault(file_rel, {}).setdefault(extra["qualname"], node["id"])
+            elif kind == "import":
+                imports.append(node)
+
+        self.module_files = {qualname: file_rel for file_rel, qualname in self.modules.items()}
+        for file_rel, symbols in self.local.items():
+            module = self.modules.get(file_rel, "")
+            for qualname, node_id in symbols.items():
+                self.qualified.setdefault(f"{module}.{qualname}" if module else qualname, node_id)
+
+        for node in imports:
+            file_rel = node.get("file", "")
+            extra = node.get("extra") or {}
+            name = str(node.get("name", ""))
+            level = int(extra.get("level") or 0)
+            asname = extra.get("asname")
+            is_from = "level" in extra
+            target = name
+            if is_from and level:
+                module = self.modules.get(file_rel, "")
+                is_package = posixpath.basename(file_rel) == "__init__.py"
+                target = resolve_relative(module, level, is_package, name)
+            self.import_targets[node["id"]] = target
+            if asname:
+                local_name = asname
+            elif is_from:
+                local_name = name.rsplit(".", 1)[-1]
+            else:
+                local_name = name.split(".", 1)[0]
+                target = local_name
+            self.aliases.setdefault(file_rel, {})[local_name] = target
+
+    def resolve_import(self, import_id: str) -> str | None:
+        """Resolves an import node to the deepest project module or symbol it names."""
+        target = self.import_targets.get(import_id)
+        while target:
+            node_id = self.lookup(target)
+            if node_id:
+                return node_id
+            target = target.rpartition(".")[0]
+        return None
+
+    def lookup(self, dotted: str, depth: int = 0) -> str | None:
+        """Qualified-name lookup that follows names re-exported by a module's imports."""
+        node_id = self.qualified.get(dotted)
+        if node_id or depth >= _MAX_REEXPORT_DEPTH:
+            return node_id
+        module, _, name = dotted.rpartition(".")
+        while module:
+            file_rel = self.module_files.get(module)
+            if file_rel is not None:
+                head, _, rest = name.partition(".")
+                target = self.aliases.get(file_rel, {}).get(head)
+                if target is None:
+                    return None
+                return self.lookup(f"{target}.{rest}" if rest else target, depth + 1)
+            module, _, parent = module.rpartition(".")
+            name = f"{parent}.{name}"
+        return None
+
+    def resolve(self, file_rel: str, dotted: str, class_qualname: str | None = None) -> str | None:
+        """Resolves a dotted name used in ``file_rel`` to a node id, if it is a project symbol."""
+        head, _, rest = dotted.partition(".")
+        if class_qualname and head in ("self", "cls") and rest:
+            node_id = self.local.get(file_rel, {}).get(f"{class_qualname}.{rest}")
+            if node_id:
+                return node_id
+        node_id = self.local.get(file_rel, {}).get(dotted)
+        if node_id:
+            return node_id
+        target = self.aliases.get(file_rel, {}).get(head)
+        if target:
+            return self.lookup(f"{target}.{rest}" if rest else target)
+        # Any other bare name (a parameter, local or builtin) is not a project symbol,
+        # even when a module elsewhere in the project happens to share its name.
+        if head not in self.local.get(file_rel, {}):
+            return None
+        module = self.modules.get(file_rel, "")
+        return self.lookup(f"{module}.{dotted}" if module else dotted)
@@ -0,0 +1,273 @@
+"""Background watcher that keeps project graphs rebuilt as files change."""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import threading
+import time
+
+from core.config import AppConfig
+from core.graph import GraphService
+
+logger = logging.getLogger(__name__)
+
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+)
+_EVENT = struct.Struct("iIII")
+
+
+class _InotifySource:
+    """Linux inotify through libc; one watch per (non-ignored) project directory."""
+
+    def __init__(self) -> None:
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches: dict[int, tuple[str, str]] = {}
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+    def watch(self, project: str, root: str, rel_dirs: list[str]) -> None:
+        for rel_dir in rel_dirs:
+            path = os.path.join(root, rel_dir) if rel_dir else root
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), _WATCH_MASK)
+            if wd >= 0:
+                self._watches[wd] = (project, rel_dir)
+
+    def read(self, timeout: float) -> tuple[dict[str, set[str]], set[str]]:
+        """Returns changed paths per project and projects whose watches need a resync."""
+        changes: dict[str, set[str]] = {}
+        resync: set[str] = set()
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return changes, resync
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changes, resync
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset : offset + length].rstrip(b"\0").decode("utf-8", "replace")
+            offset += length
+            if mask & _IN_Q_OVERFLOW:
+                for project, _ in self._watches.values():
+                    changes.setdefault(project, set()).add("")
+                    resync.add(project)
+                continue
+            watched = self._watches.get(wd)
+            if watched is None:
+                continue
+            project, rel_dir = watched
+            rel_path = f"{rel_dir}/{name}" if rel_dir and name else rel_dir or name
+            if mask & _IN_ISDIR or mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+                resync.add(project)
+                changes.setdefault(project, set()).add(rel_path)
+            elif name:
+                changes.setdefault(project, set()).add(rel_path)
+        return changes, resync
+
+
+class ProjectWatcher:
+    """Feeds file changes into debounced, coalesced incremental rebuilds.
+
+    Uses inotify where available and falls back to stat polling. Paths changed in a
+    project are collected until the project has been quiet for ``debounce_ms`` (or
+    events kept arriving for ten times that), then one incremental build runs and
+    refreshes the service's cached index.
+    """
+
+    def __init__(
+        self, config: AppConfig, graphs: GraphService, backend: str | None = None
+    ) -> None:
+        self._config = config
+        self._graphs = graphs
+        self._backend = backend
+        self._debounce = config.watch_debounce_ms / 1000
+        self._poll_interval = config.watch_poll_interval_ms / 1000
+        self._pending: dict[str, set[str]] = {}
+        self._first_event: dict[str, float] = {}
+        self._last_event: dict[str, float] = {}
+        self._signatures: dict[str, dict[str, tuple[int, int]]] = {}
+        self._watched: set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._source: _InotifySource | None = None
+        self.rebuilds = 0
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._source is not None else "poll"
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        if self._backend in (None, "inotify"):
+            try:
+                self._source = _InotifySource()
+            except (OSError, AttributeError):
+                if self._backend == "inotify":
+                    raise
+                self._source = None
+        for project in sorted(self._config.projects):
+            self._signatures[project] = self._signature(project)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="graph-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._source is not None:
+            self._source.close()
+            self._source = None
+        self._watched.clear()
+
+    def notify(self, project: str, paths: set[str], now: float | None = None) -> None:
+        """Records changed paths for a project; rebuilds happen in ``process_pending``."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._pending.setdefault(project, set()).update(paths)
+            self._first_event.setdefault(project, now)
+            self._last_event[project] = now
+
+    def process_pending(self, now: float | None = None) -> list[str]:
+        """Rebuilds every project whose pending changes have settled; returns them."""
+        now = time.monotonic() if now is None else now
+        due: list[tuple[str, set[str]]] = []
+        with self._lock:
+            for project in list(self._pending):
+                quiet = now - self._last_event[project] >= self._debounce
+                overdue = now - self._first_event[project] >= self._debounce * 10
+                if quiet or overdue:
+                    due.append((project, self._pending.pop(project)))
+                    del self._first_event[project]
+                    del self._last_event[project]
+        for project, paths in due:
+            self._rebuild(project, paths)
+        return [project for project, _ in due]
+
+    def _rebuild(self, project: str, paths: set[str]) -> None:
+        if project not in self._config.projects:
+            return
+        try:
+            self._graphs.build(project, incremental=True)
+            self.rebuilds += 1
+        except Exception:  # noqa: BLE001 - a failed rebuild must not kill the watcher
+            logger.exception("Watch rebuild of %s failed (%d changed paths)", project, len(paths))
+
+    def _relevant(self, rel_path: str) -> bool:
+        """Folder changes and files with an allowed extension can affect the graph."""
+        extensions = {ext.lower().lstrip(".") for ext in self._config.allowed_extensions}
+        name = rel_path.rsplit("/", 1)[-1]
+        if not extensions or "." not in name:
+            return True
+        return name.rsplit(".", 1)[-1].lower() in extensions
+
+    def _signature(self, project: str) -> dict[str, tuple[int, int]]:
+        signature = {}
+        for entry in self._graphs.snapshot(project).files():
+            if not self._relevant(entry.rel_path):
+                continue
+            try:
+                stat = os.stat(entry.path)
+            except OSError:
+                continue
+            signature[entry.rel_path] = (stat.st_size, stat.st_mtime_ns)
+        return signature
+
+    def _poll(self) -> dict[str, set[str]]:
+        changes: dict[str, set[str]] = {}
+        for project in sorted(self._config.projects):
+            current = self._signature(project)
+            previous = self._signatures.get(project)
+            self._signatures[project] = current
+            if previous is None:
+                continue
+            changed = {
+                rel_path
+                for rel_path in set(previous) | set(current)
+                if previous.get(rel_path) != current.get(rel_path)
+            }
+            if changed:
+                changes[project] = changed
+        return changes
+
+    def _sync_watches(self, projects: set[str]) -> None:
+        assert self._source is not None
+        for project in projects:
+            snapshot = self._graphs.snapshot(project)
+            self._source.watch(project, snapshot.root, ["", *snapshot.directories()])
+            self._watched.add(project)
+
+    def _wait(self) -> float:
+        with self._lock:
+            if not self._last_event:
+                return self._poll_interval
+            now = time.monotonic()
+            return max(
+                0.0,
+                min(
+                    min(last + self._debounce for last in self._last_event.values()),
+                    min(first + self._debounce * 10 for first in self._first_event.values()),
+                )
+                - now,
+            )
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._step()
+            except Exception:  # noqa: BLE001 - keep watching after unexpected errors
+                logger.exception("Graph watcher iteration failed")
+                self._stop.wait(self._poll_interval)
+
+    def _step(self) -> None:
+        if self._source is not None:
+            self._sync_watches(set(self._config.projects) - self._watched)
+            changes, resync = self._source.read(min(self._wait(), self._poll_interval))
+            if resync:
+                self._sync_watches(resync)
+        else:
+            self._stop.wait(min(self._wait(), self._poll_interval))
+            changes = self._poll()
+        for project, paths in changes.items():
+            paths = {path for path in paths if self._relevant(path)}
+            if paths:
+                self.notify(project, paths)
+        self.process_pending()
@@ -3,6 +3,7 @@ FastMCP quickstart example.
 """
 import sys
 import os
+from contextlib import asynccontextmanager
 # Add the parent directory to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
@@ -13,10 +14,21 @@ from core.graph import GraphService
 from core.interpreter import GraphChangeApplier
 from core.projects import ProjectManager
 from core.registry import ProjectRegistry
+from core.watcher import ProjectWatcher
 from mcp.server.fastmcp import FastMCP
 
+
+@asynccontextmanager
+async def _lifespan(server: FastMCP):
+    """Starts the watcher with the server, not on import: pool workers re-import
+    this module as ``__mp_main__`` and must not start watchers of their own."""
+    if config.watch:
+        watcher.start()
+    yield
+
+
 # Create an MCP server
-mcp = FastMCP("Demo")
+mcp = FastMCP("Demo", lifespan=_lifespan)
 config = AppConfig.from_globals()
 projects = ProjectManager(config)
 files = FileService(config, projects)
@@ -24,6 +36,7 @@ graphs = GraphService(config)
 interpreter = GraphChangeApplier(config, projects, files, graphs)
 git = GitService(os.path.abspath(os.path.dirname(__file__)))
 registry = ProjectRegistry(os.path.abspath(os.path.dirname(__file__)))
+watcher = ProjectWatcher(config, graphs)
 
 
 @mcp.resource("resource://listx_available_projects")
@@ -84,20 +97,124 @@ def get_files_inverted_index(project: str):
     return projects.inverted_index(project=project)
 
 @mcp.tool()
-def build_code_graph(project: str):
-    """Builds a code graph and stores it as JSON"""
-    return graphs.build(project=project)
+def build_code_graph(project: str, incremental: bool = True, full: bool = False):
+    """Builds a code graph, re-parsing only changed files; returns a summary unless full"""
+    graph = graphs.build(project=project, incremental=incremental)
+    return graph if full else graphs.summary(project, graph)
+
+@mcp.tool()
+def export_code_graph(project: str):
+    """Streams the stored code graph to an NDJSON file, one node or edge per line"""
+    return graphs.export_ndjson(project=project)
+
+@mcp.tool()
+def import_code_graph(project: str, path: str | None = None):
+    """Stores a code graph read from an NDJSON export in the graphs directory"""
+    return graphs.import_ndjson(project=project, path=path)
+
+@mcp.tool()
+def query_code_graph(
+    project: str, term: str, kind: str | None = None, limit: int = 50, offset: int = 0
+):
+    """Queries the code graph by name or file path, ranked exact > prefix > substring"""
+    return graphs.query(project=project, term=term, kind=kind, limit=limit, offset=offset)
+
+@mcp.tool()
+def graph_neighborhood(
+    project: str,
+    node_id: str,
+    hops: int = 1,
+    direction: str = "both",
+    edge_kinds: list[str] | None = None,
+):
+    """Returns nodes within k hops of a node and the edges between them"""
+    return graphs.neighborhood(
+        project=project, node_id=node_id, hops=hops, direction=direction, edge_kinds=edge_kinds
+    )
+
+@mcp.tool()
+def graph_dependencies(
+    project: str, node_id: str, edge_kinds: list[str] | None = None, max_depth: int | None = None
+):
+    """Returns everything a node transitively depends on (outgoing edges)"""
+    return graphs.dependencies(
+        project=project, node_id=node_id, edge_kinds=edge_kinds, max_depth=max_depth
+    )
+
+@mcp.tool()
+def graph_dependents(
+    project: str, node_id: str, edge_kinds: list[str] | None = None, max_depth: int | None = None
+):
+    """Returns everything that transitively depends on a node (incoming edges)"""
+    return graphs.dependents(
+        project=project, node_id=node_id, edge_kinds=edge_kinds, max_depth=max_depth
+    )
 
 @mcp.tool()
-def query_code_graph(project: str, term: str, kind: str | None = None):
-    """Queries the code graph by name or file path"""
-    return graphs.query(project=project, term=term, kind=kind)
+def graph_shortest_path(
+    project: str,
+    from_id: str,
+    to_id: str,
+    direction: str = "both",
+    edge_kinds: list[str] | None = None,
+):
+    """Returns a shortest path between two nodes"""
+    return graphs.shortest_path(
+        project=project, from_id=from_id, to_id=to_id, direction=direction, edge_kinds=edge_kinds
+    )
+
+@mcp.tool()
+def code_changes_since(project: str, code_hash: str):
+    """Lists directories whose contents changed since the given code hash"""
+    return graphs.changed_since(project=project, code_hash=code_hash)
+
+@mcp.tool()
+def diff_code_graph(project: str, from_hash: str | None = None, to_hash: str | None = None):
+    """Returns added/removed/moved/changed nodes and edges between two graph versions"""
+    return graphs.diff(project=project, from_hash=from_hash, to_hash=to_hash)
 
 @mcp.tool()
 def save_graph_proposal(project: str, proposal: dict[str, object]):
     """Validates and stores a graph change proposal"""
     return graphs.save_proposal(project=project, proposal=proposal)
 
+@mcp.tool()
+def validate_graph_proposals(project: str, proposals: list[dict[str, object]]):
+    """Validates several proposals at once and reports which ones conflict"""
+    return graphs.validate_proposals(project=project, proposals=proposals)
+
+@mcp.tool()
+def rebase_graph_proposal(project: str, proposal_id: str):
+    """Re-targets a saved proposal to the current code hash, or reports its conflicts"""
+    return graphs.rebase_proposal(project=project, proposal_id=proposal_id)
+
+@mcp.tool()
+def list_graph_proposals(
+    project: str,
+    status: str | None = None,
+    base_code_hash: str | None = None,
+    limit: int = 50,
+    offset: int = 0,
+):
+    """Lists saved proposals newest first, filtered by status (pending/applied/stale)"""
+    return graphs.list_proposals(
+        project=project, status=status, base_code_hash=base_code_hash, limit=limit, offset=offset
+    )
+
+@mcp.tool()
+def get_graph_proposal(project: str, proposal_id: str):
+    """Returns a saved proposal and its catalog entry by id"""
+    return graphs.get_proposal(project=project, proposal_id=proposal_id)
+
+@mcp.tool()
+def gc_graph_proposals(
+    project: str, statuses: list[str] | None = None, older_than_days: float | None = None
+):
+    """Deletes saved proposals with the given statuses (default: stale)"""
+    return graphs.gc_proposals(
+        project=project, statuses=statuses or ["stale"], older_than_days=older_than_days
+    )
+
 @mcp.tool()
 def apply_graph_proposal(project: str, proposal_path: str):
     """Applies a graph proposal to code and updates the graph"""
@@ -4,6 +4,7 @@ from __future__ import annotations
 import os
 import pathlib
 from types import MethodType
+from typing import Any, Callable
 
 import pytest
 
@@ -78,16 +79,8 @@ def interpreter(
     project_manager: ProjectManager,
     file_service: FileService,
     graph_service: GraphService,
-    graph_dir: pathlib.Path,
 ) -> GraphChangeApplier:
-    interpreter = GraphChangeApplier(config, project_manager, file_service, graph_service)
-    graph_dir_str = str(graph_dir)
-
-    def _graph_path(self, project: str) -> str:
-        return os.path.join(graph_dir_str, f"{project}.codegraph.json")
-
-    interpreter._graph_path = MethodType(_graph_path, interpreter)
-    return interpreter
+    return GraphChangeApplier(config, project_manager, file_service, graph_service)
 
 
 @pytest.fixture()
@@ -108,3 +101,23 @@ def sample_python_file(project_root: pathlib.Path) -> pathlib.Path:
     path = project_root / "sample.py"
     path.write_text(content, encoding="utf-8")
     return path
+
+
+@pytest.fixture()
+def make_proposal(project_name: str) -> Callable[..., dict[str, Any]]:
+    """Factory for proposal dicts on ``project_name`` against a given code hash."""
+
+    def _make(
+        code_hash: str,
+        operations: list[dict[str, Any]] | None = None,
+        created_at: str = "2025-01-01T00:00:00Z",
+    ) -> dict[str, Any]:
+        return {
+            "schema_version": "0.1.0",
+            "project": project_name,
+            "base_code_hash": code_hash,
+            "created_at": created_at,
+            "operations": operations or [],
+        }
+
+    return _make
@@ -1,6 +1,11 @@
 """Tests for core.graph.GraphService.build."""
 from __future__ import annotations
 
+import pytest
+
+import core.graph
+from core.graph import validate_graph
+
 
 def test_graph_build_schema(graph_service, project_name, project_root, sample_python_file):
     graph = graph_service.build(project_name)
@@ -21,3 +26,38 @@ def test_graph_build_hash_determinism(graph_service, project_name, project_root,
     (project_root / "note.txt").write_text("x", encoding="utf-8")
     changed = graph_service.compute_code_hash(project_name)
     assert changed != first
+
+
+def test_graph_build_ids_stable_across_edits(graph_service, project_name, project_root):
+    path = project_root / "stable.py"
+    path.write_text("class Keep:\n    def run(self):\n        pass\n", encoding="utf-8")
+    first = graph_service.build(project_name, incremental=False)
+
+    path.write_text(
+        "def inserted():\n    pass\n\nclass Keep:\n    def run(self):\n        pass\n",
+        encoding="utf-8",
+    )
+    second = graph_service.build(project_name, incremental=False)
+
+    def ids(graph):
+        return {
+            (node["kind"], node["extra"].get("qualname")): node["id"] for node in graph["nodes"]
+        }
+
+    assert ids(second)[("class", "Keep")] == ids(first)[("class", "Keep")]
+    assert ids(second)[("method", "Keep.run")] == ids(first)[("method", "Keep.run")]
+    assert len({node["id"] for node in second["nodes"]}) == len(second["nodes"])
+
+
+def test_graph_build_skips_models_but_matches_schema(
+    monkeypatch, graph_service, project_name, sample_python_file
+):
+    def fail(*_, **__):
+        pytest.fail("build constructed a pydantic model")
+
+    with monkeypatch.context() as patch:
+        for model in ("Node", "Edge", "Range", "Graph"):
+            patch.setattr(core.graph, model, fail)
+        graph = graph_service.build(project_name, incremental=False)
+
+    assert validate_graph(graph) == graph
@@ -0,0 +1,100 @@
+"""Tests for call and reference edges resolved through core.symbols."""
+from __future__ import annotations
+
+from core.symbols import SymbolTable, resolve_relative
+
+
+def _edges(graph, kind):
+    names = {node["id"]: node["name"] for node in graph["nodes"]}
+    return {
+        (names[edge["from"]], names[edge["to"]]) for edge in graph["edges"] if edge["kind"] == kind
+    }
+
+
+def _write_package(project_root):
+    pkg = project_root / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("", encoding="utf-8")
+    (pkg / "util.py").write_text(
+        "LIMIT = 3\n\ndef helper():\n    return LIMIT\n", encoding="utf-8"
+    )
+    (project_root / "app.py").write_text(
+        "from pkg.util import helper\n"
+        "from pkg import util as u\n"
+        "\n"
+        "class Service:\n"
+        "    def run(self):\n"
+        "        self.step()\n"
+        "        return helper()\n"
+        "\n"
+        "    def step(self):\n"
+        "        return u.helper()\n"
+        "\n"
+        "def main():\n"
+        "    Service().run()\n"
+        "    print('done')\n",
+        encoding="utf-8",
+    )
+
+
+def test_build_adds_call_edges(graph_service, project_name, project_root):
+    _write_package(project_root)
+    graph = graph_service.build(project_name)
+
+    calls = _edges(graph, "calls")
+    assert ("run", "step") in calls
+    assert ("run", "helper") in calls
+    assert ("step", "helper") in calls
+    assert ("main", "Service") in calls
+    assert all(target != "print" for _, target in calls)
+    assert "calls" in graph["kinds"]["edge"]
+
+
+def test_incremental_build_re_resolves_unchanged_callers(
+    graph_service, project_name, project_root
+):
+    _write_package(project_root)
+    graph_service.build(project_name)
+    (project_root / "pkg" / "util.py").write_text("def other():\n    pass\n", encoding="utf-8")
+
+    graph = graph_service.build(project_name)
+    assert ("run", "helper") not in _edges(graph, "calls")
+    assert ("run", "step") in _edges(graph, "calls")
+
+    (project_root / "pkg" / "util.py").write_text("def helper():\n    pass\n", encoding="utf-8")
+    graph = graph_service.build(project_name)
+    assert ("run", "helper") in _edges(graph, "calls")
+
+
+def test_symbol_table_resolves_relative_imports():
+    nodes = [
+        {"id": "m", "kind": "module", "name": "pkg/a.py", "file": "pkg/a.py",
+         "extra": {"qualname": "pkg.a"}},
+        {"id": "b", "kind": "module", "name": "pkg/b.py", "file": "pkg/b.py",
+         "extra": {"qualname": "pkg.b"}},
+        {"id": "f", "kind": "function", "name": "f", "file": "pkg/b.py",
+         "extra": {"qualname": "f"}},
+        {"id": "i", "kind": "import", "name": "b.f", "file": "pkg/a.py",
+         "extra": {"level": 1, "asname": "g"}},
+    ]
+    table = SymbolTable(nodes)
+    assert table.resolve("pkg/a.py", "g") == "f"
+    assert table.resolve("pkg/a.py", "pkg.b.f") is None  # pkg is never imported in a.py
+    assert table.resolve("pkg/b.py", "f") == "f"
+    assert table.resolve("pkg/a.py", "missing") is None
+    assert resolve_relative("pkg.sub.mod", 2, False, "x") == "pkg.x"
+
+
+def test_unimported_names_do_not_resolve_to_modules(graph_service, project_name, project_root):
+    (project_root / "config.py").write_text("VALUE = 1\n", encoding="utf-8")
+    (project_root / "data.py").write_text("ROWS = []\n", encoding="utf-8")
+    (project_root / "user.py").write_text(
+        "def run(config):\n"
+        "    data = config + 1\n"
+        "    return data\n",
+        encoding="utf-8",
+    )
+    graph = graph_service.build(project_name)
+
+    targets = {target for source, target in _edges(graph, "references") if source == "run"}
+    assert not targets & {"config", "data"}
@@ -0,0 +1,53 @@
+"""Tests for structural graph diffs in core.graph.GraphService.diff."""
+from __future__ import annotations
+
+import pytest
+
+
+def _names(nodes):
+    return sorted(node["name"] for node in nodes)
+
+
+def test_diff_stored_graph_against_current_tree(
+    graph_service, project_name, project_root, sample_python_file
+):
+    (project_root / "other.py").write_text("def untouched():\n    pass\n", encoding="utf-8")
+    first = graph_service.build(project_name)
+    sample_python_file.write_text(
+        "import os\n\n\nclass Greeter:\n    def greet(self):\n        return 'hi'\n\n"
+        "def added():\n    return 2\n",
+        encoding="utf-8",
+    )
+
+    diff = graph_service.diff(project_name)
+
+    assert diff["from_hash"] == first["code_hash"]
+    assert diff["to_hash"] != first["code_hash"]
+    assert diff["files"] == {"added": [], "removed": [], "changed": ["sample.py"]}
+    assert _names(diff["nodes"]["added"]) == ["added"]
+    assert _names(diff["nodes"]["removed"]) == ["helper"]
+    assert "Greeter" in {entry["to"]["name"] for entry in diff["nodes"]["moved"]}
+    assert all(node["file"] == "sample.py" for node in diff["nodes"]["added"])
+
+
+def test_diff_between_recorded_hashes_detects_cross_file_moves(
+    graph_service, project_name, project_root
+):
+    (project_root / "a.py").write_text("class Mover:\n    pass\n", encoding="utf-8")
+    (project_root / "b.py").write_text("", encoding="utf-8")
+    before = graph_service.build(project_name)["code_hash"]
+    (project_root / "a.py").write_text("", encoding="utf-8")
+    (project_root / "b.py").write_text("class Mover:\n    pass\n", encoding="utf-8")
+    after = graph_service.build(project_name)["code_hash"]
+
+    diff = graph_service.diff(project_name, from_hash=before, to_hash=after)
+    moved = [entry for entry in diff["nodes"]["moved"] if entry["to"]["name"] == "Mover"]
+    assert [(m["from"]["file"], m["to"]["file"]) for m in moved] == [("a.py", "b.py")]
+    assert diff["nodes"]["added"] == [] and diff["nodes"]["removed"] == []
+    assert graph_service.diff(project_name, to_hash=after)["from_hash"] == before
+
+
+def test_diff_rejects_unknown_hash(graph_service, project_name, sample_python_file):
+    graph_service.build(project_name)
+    with pytest.raises(ValueError):
+        graph_service.diff(project_name, from_hash="missing", to_hash="missing")
@@ -0,0 +1,42 @@
+"""Tests for resolves_to edges from import nodes."""
+from __future__ import annotations
+
+
+def _resolved(graph):
+    nodes = {node["id"]: node for node in graph["nodes"]}
+    return {
+        (nodes[edge["from"]]["file"], nodes[edge["from"]]["name"], nodes[edge["to"]]["name"])
+        for edge in graph["edges"]
+        if edge["kind"] == "resolves_to"
+    }
+
+
+def test_imports_resolve_to_project_nodes(graph_service, project_name, project_root):
+    pkg = project_root / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("from .util import helper\n", encoding="utf-8")
+    (pkg / "util.py").write_text("def helper():\n    pass\n", encoding="utf-8")
+    (pkg / "sub.py").write_text(
+        "from . import util\nfrom .util import helper, MISSING\n", encoding="utf-8"
+    )
+    (project_root / "app.py").write_text(
+        "import os\nimport pkg.util\nfrom pkg import helper\n", encoding="utf-8"
+    )
+
+    resolved = _resolved(graph_service.build(project_name))
+
+    assert ("app.py", "pkg.util", "util") in resolved
+    assert ("app.py", "pkg.helper", "helper") in resolved
+    assert ("pkg/__init__.py", "util.helper", "helper") in resolved
+    assert ("pkg/sub.py", "util", "util") in resolved
+    assert ("pkg/sub.py", "util.MISSING", "util") in resolved
+    assert all(name != "os" for _, name, _ in resolved)
+
+
+def test_resolves_to_follows_moved_targets(graph_service, project_name, project_root):
+    (project_root / "a.py").write_text("from b import thing\n", encoding="utf-8")
+    graph_service.build(project_name)
+    assert _resolved(graph_service.build(project_name)) == set()
+
+    (project_root / "b.py").write_text("def thing():\n    pass\n", encoding="utf-8")
+    assert ("a.py", "b.thing", "thing") in _resolved(graph_service.build(project_name))
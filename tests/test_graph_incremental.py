@@ -0,0 +1,124 @@
+"""Tests for incremental builds in core.graph.GraphService.build."""
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from core.graph_versions import GraphVersionStore
+
+
+def _edge_key(edge):
+    return edge["from"], edge["to"], edge["kind"]
+
+
+def _ids_by_name(graph):
+    return {node["name"]: node["id"] for node in graph["nodes"]}
+
+
+def test_incremental_build_reuses_unchanged_files(
+    graph_service, project_name, project_root, sample_python_file, monkeypatch
+):
+    (project_root / "other.py").write_text("def other():\n    pass\n", encoding="utf-8")
+    first = graph_service.build(project_name)
+    assert os.path.exists(graph_service._manifest_path(project_name))
+
+    parsed = []
+    original = graph_service._extract_file
+
+    def tracking(full_path, file_rel):
+        parsed.append(file_rel)
+        return original(full_path, file_rel)
+
+    monkeypatch.setattr(graph_service, "_extract_file", tracking)
+    (project_root / "other.py").write_text(
+        "def other():\n    pass\n\ndef added():\n    pass\n", encoding="utf-8"
+    )
+    second = graph_service.build(project_name)
+
+    assert parsed == ["other.py"]
+    assert _ids_by_name(second)["Greeter"] == _ids_by_name(first)["Greeter"]
+    assert "added" in _ids_by_name(second)
+    assert len({node["id"] for node in second["nodes"]}) == len(second["nodes"])
+
+
+def test_incremental_build_drops_deleted_files(
+    graph_service, project_name, project_root, sample_python_file
+):
+    (project_root / "gone.py").write_text("class Gone:\n    pass\n", encoding="utf-8")
+    graph_service.build(project_name)
+    (project_root / "gone.py").unlink()
+
+    graph = graph_service.build(project_name)
+    node_ids = {node["id"] for node in graph["nodes"]}
+    assert all(node["file"] != "gone.py" for node in graph["nodes"])
+    assert all(edge["from"] in node_ids and edge["to"] in node_ids for edge in graph["edges"])
+
+
+def test_full_build_matches_incremental(
+    graph_service, project_name, project_root, sample_python_file
+):
+    graph_service.build(project_name)
+    incremental = graph_service.build(project_name)
+    full = graph_service.build(project_name, incremental=False)
+
+    def shape(graph):
+        return sorted((n["kind"], n["name"], n["file"]) for n in graph["nodes"])
+
+    assert shape(incremental) == shape(full)
+    assert incremental["code_hash"] == full["code_hash"]
+
+
+def test_build_of_unchanged_tree_writes_nothing(
+    graph_service, project_name, sample_python_file, monkeypatch
+):
+    first = graph_service.build(project_name)
+    monkeypatch.setattr(
+        graph_service, "_write_graph", lambda *args: pytest.fail("graph was rewritten")
+    )
+
+    second = graph_service.build(project_name)
+
+    assert second["code_hash"] == first["code_hash"]
+    assert second["nodes"] == first["nodes"]
+
+
+def test_build_after_an_apply_rebuilds(
+    graph_service, make_proposal, interpreter, project_name, sample_python_file
+):
+    graph = graph_service.build(project_name)
+    helper = _ids_by_name(graph)["helper"]
+    proposal = make_proposal(
+        graph["code_hash"],
+        [{"op": "update_node", "node_id": helper, "patch": {"name": "renamed"}}],
+    )
+    saved = graph_service.save_proposal(project_name, proposal)
+    applied = interpreter.apply_proposal(project_name, saved["path"])
+
+    rebuilt = graph_service.build(project_name)
+
+    assert rebuilt["code_hash"] == applied["new_code_hash"]
+    assert "renamed" in _ids_by_name(rebuilt)
+
+
+def test_incremental_build_stores_only_changed_fragments(
+    graph_service, project_name, project_root, sample_python_file, monkeypatch
+):
+    (project_root / "other.py").write_text("def other():\n    pass\n", encoding="utf-8")
+    graph_service.build(project_name)
+    stored = []
+    original = GraphVersionStore.put_fragment
+
+    def tracking(self, fragment):
+        stored.append({node["file"] for node in fragment["nodes"]})
+        return original(self, fragment)
+
+    monkeypatch.setattr(GraphVersionStore, "put_fragment", tracking)
+    (project_root / "other.py").write_text("def other():\n    return 1\n", encoding="utf-8")
+
+    graph = graph_service.build(project_name)
+
+    assert stored == [{"other.py"}]
+    reassembled = graph_service._versions(project_name).graph(graph["code_hash"])
+    assert reassembled["nodes"] == graph["nodes"]
+    assert sorted(reassembled["edges"], key=_edge_key) == sorted(graph["edges"], key=_edge_key)
@@ -0,0 +1,69 @@
+"""Tests for core.graph_index.GraphIndex and the GraphService index cache."""
+from __future__ import annotations
+
+import json
+
+import core.graph
+from core.graph_index import GraphIndex, TrigramIndex
+
+
+def test_graph_index_lookups(graph_service, project_name, sample_python_file):
+    graph = graph_service.build(project_name)
+    index = GraphIndex(graph)
+
+    greeter = index.nodes_by_id[index.by_name["greeter"][0]]
+    assert greeter["kind"] == "class"
+    assert set(index.nodes_by_kind["method"]) == {
+        node["id"] for node in graph["nodes"] if node["kind"] == "method"
+    }
+    outgoing = [index.edges[idx] for idx in index.out_edges[greeter["id"]]]
+    assert any(edge["kind"] == "belongs_to" for edge in outgoing)
+    assert [node["name"] for node in index.search("help", kind="function")] == ["helper"]
+
+
+def test_query_reuses_cached_index(
+    graph_service, project_name, project_root, sample_python_file, monkeypatch
+):
+    graph_service.build(project_name)
+
+    loads = []
+    original = json.load
+
+    def tracking(handle):
+        loads.append(handle.name)
+        return original(handle)
+
+    monkeypatch.setattr(core.graph.json, "load", tracking)
+    graph_service.query(project_name, "Greeter")
+    graph_service.query(project_name, "helper")
+    assert loads == []
+
+    graph_path = graph_service._graph_path(project_name)
+    with open(graph_path, "r", encoding="UTF-8") as handle:
+        graph = original(handle)
+    graph["nodes"] = [node for node in graph["nodes"] if node["name"] != "helper"]
+    with open(graph_path, "w", encoding="UTF-8") as handle:
+        json.dump(graph, handle)
+
+    result = graph_service.query(project_name, "helper")
+    assert result["match_count"] == 0
+    assert [path for path in loads if path.endswith(".codegraph.json")] == [graph_path]
+
+
+def test_trigram_index_lookup():
+    index = TrigramIndex.from_keys(["greeter", "sample.py", "helper", "ge"])
+
+    assert index.lookup("eet") == ["greeter"]
+    assert index.lookup("per") == ["helper"]
+    assert index.lookup("er") == ["greeter", "helper"]
+    assert index.lookup("xyz") == []
+    assert TrigramIndex.from_dict(index.to_dict()).lookup("mple") == ["sample.py"]
+
+
+def test_trigram_index_persisted_with_graph(graph_service, project_name, sample_python_file):
+    graph_service.build(project_name)
+    graph_service._index_cache.clear()
+
+    index = graph_service.load_index(project_name)
+    assert index.trigrams is not None
+    assert "greeter" in index.trigrams.keys
@@ -0,0 +1,136 @@
+"""Tests for streaming NDJSON graph export and import."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+import server
+from core.graph_ndjson import read_ndjson
+from core.graph_store import BinaryGraphReader
+from core.graph_versions import GraphVersionStore
+
+
+def test_export_streams_one_record_per_line(graph_service, project_name, sample_python_file):
+    graph = graph_service.build(project_name)
+
+    result = graph_service.export_ndjson(project_name)
+
+    with open(result["path"], "r", encoding="UTF-8") as handle:
+        lines = [json.loads(line) for line in handle]
+    assert result["lines"] == len(lines) == 1 + len(graph["nodes"]) + len(graph["edges"])
+    assert lines[0]["type"] == "header"
+    assert lines[0]["code_hash"] == graph["code_hash"]
+    records = list(read_ndjson(result["path"]))
+    assert [r for t, r in records if t == "node"] == graph["nodes"]
+    assert [r for t, r in records if t == "edge"] == graph["edges"]
+
+
+def test_export_reads_binary_graph_lazily(
+    monkeypatch, graph_service, project_name, sample_python_file
+):
+    graph_service.build(project_name)
+    monkeypatch.setattr(
+        BinaryGraphReader, "to_graph", lambda self: pytest.fail("graph was materialised")
+    )
+
+    assert graph_service.export_ndjson(project_name)["lines"] > 1
+
+
+def test_binary_reader_keeps_no_decoded_strings(graph_service, project_name, sample_python_file):
+    graph_service.build(project_name)
+    stamp = graph_service._graph_stamp(graph_service._graph_path(project_name))
+
+    with graph_service._open_binary_graph(project_name, stamp) as reader:
+        before = set(vars(reader))
+        list(reader.nodes())
+        list(reader.edges())
+
+        assert set(vars(reader)) == before
+        assert not hasattr(reader, "_strings")
+
+
+def test_import_round_trips(graph_service, project_name, sample_python_file, graph_dir):
+    graph = graph_service.build(project_name)
+    path = str(graph_dir / "export.ndjson")
+    graph_service.export_ndjson(project_name, path)
+    (graph_dir / f"{project_name}.codegraph.json").unlink()
+
+    summary = graph_service.import_ndjson(project_name, path)
+
+    assert summary["code_hash"] == graph["code_hash"]
+    assert summary["node_count"] == len(graph["nodes"])
+    loaded = graph_service.load_graph(project_name)
+    assert loaded["nodes"] == graph["nodes"]
+    assert loaded["edges"] == graph["edges"]
+
+
+def test_import_forces_a_full_rebuild(
+    graph_service, project_name, sample_python_file, graph_dir
+):
+    graph_service.build(project_name)
+    path = graph_dir / f"{project_name}.codegraph.ndjson"
+    graph_service.export_ndjson(project_name)
+    path.write_text(path.read_text(encoding="utf-8").replace('"helper"', '"bogus"'), "utf-8")
+    graph_service.import_ndjson(project_name)
+
+    rebuilt = graph_service.build(project_name)
+
+    names = {node["name"] for node in rebuilt["nodes"]}
+    assert "helper" in names
+    assert "bogus" not in names
+
+
+def test_ndjson_paths_stay_in_graph_dir(graph_service, project_name, sample_python_file, tmp_path):
+    graph_service.build(project_name)
+    outside = tmp_path / "outside.ndjson"
+    outside.write_text("", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="graphs directory"):
+        graph_service.export_ndjson(project_name, str(outside))
+    with pytest.raises(ValueError, match="graphs directory"):
+        graph_service.import_ndjson(project_name, "../outside.ndjson")
+
+
+def test_sharded_export(
+    monkeypatch, config, graph_service, project_name, sample_python_file, project_root
+):
+    config.graph_storage = "sharded"
+    (project_root / "other.py").write_text("def other():\n    return 1\n", encoding="utf-8")
+    graph = graph_service.build(project_name)
+    reads: list[str] = []
+    fragment = GraphVersionStore.fragment
+    monkeypatch.setattr(
+        GraphVersionStore, "fragment", lambda self, key: reads.append(key) or fragment(self, key)
+    )
+
+    result = graph_service.export_ndjson(project_name)
+
+    assert len(reads) == len(set(reads)) == 2
+    records = list(read_ndjson(result["path"]))
+    nodes = [r for t, r in records if t == "node"]
+    edges = [r for t, r in records if t == "edge"]
+    assert sorted(n["id"] for n in nodes) == sorted(n["id"] for n in graph["nodes"])
+    assert len(edges) == len(graph["edges"])
+    assert graph_service.import_ndjson(project_name)["node_count"] == len(graph["nodes"])
+
+
+def test_read_rejects_unknown_records(tmp_path):
+    path = tmp_path / "bad.ndjson"
+    path.write_text('{"type": "header"}\n{"type": "blob"}\n', encoding="utf-8")
+
+    with pytest.raises(ValueError, match="line 2"):
+        list(read_ndjson(str(path)))
+
+
+def test_build_tool_returns_summary(monkeypatch, graph_service, project_name, sample_python_file):
+    monkeypatch.setattr(server, "graphs", graph_service)
+
+    summary = server.build_code_graph(project_name)
+    full = server.build_code_graph(project_name, full=True)
+
+    assert "nodes" not in summary
+    assert summary["code_hash"] == full["code_hash"]
+    assert summary["node_count"] == len(full["nodes"])
+    assert summary["node_kinds"]["function"] == 1
+    assert summary["path"].endswith(f"{project_name}.codegraph.json")
@@ -0,0 +1,56 @@
+"""Tests for parallel extraction in core.graph.GraphService.build."""
+from __future__ import annotations
+
+import core.graph
+
+
+def _write_modules(project_root, count):
+    for idx in range(count):
+        (project_root / f"mod_{idx}.py").write_text(
+            f"class C{idx}:\n    def m(self):\n        pass\n\ndef f{idx}():\n    pass\n",
+            encoding="utf-8",
+        )
+
+
+def _shape(graph):
+    return (
+        [(n["id"], n["kind"], n["name"], n["file"]) for n in graph["nodes"]],
+        [(e["from"], e["to"], e["kind"]) for e in graph["edges"]],
+    )
+
+
+def test_parallel_build_matches_serial(graph_service, config, project_name, project_root):
+    _write_modules(project_root, 12)
+    config.parse_cache_max_bytes = 0
+
+    config.build_workers = 1
+    serial = graph_service.build(project_name, incremental=False)
+
+    config.build_workers = 3
+    config.parallel_build_min_files = 2
+    parallel = graph_service.build(project_name, incremental=False)
+
+    assert _shape(parallel) == _shape(serial)
+    assert len(parallel["nodes"]) == 12 * 4
+
+
+def test_parallel_build_never_forks(
+    monkeypatch, graph_service, config, project_name, project_root
+):
+    _write_modules(project_root, 4)
+    config.parse_cache_max_bytes = 0
+    config.build_workers = 2
+    config.parallel_build_min_files = 2
+    contexts = []
+    original = core.graph.ProcessPoolExecutor
+
+    def recording(*args, **kwargs):
+        contexts.append(kwargs.get("mp_context"))
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(core.graph, "ProcessPoolExecutor", recording)
+
+    graph_service.build(project_name, incremental=False)
+
+    assert len(contexts) == 1
+    assert contexts[0].get_start_method() in {"forkserver", "spawn"}
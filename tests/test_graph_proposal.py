@@ -1,6 +1,7 @@
 """Tests for core.graph.GraphService.save_proposal."""
 from __future__ import annotations
 
+import json
 import os
 
 import pytest
@@ -44,3 +45,53 @@ def test_graph_proposal_accepts_valid(graph_service, project_name, sample_python
     assert result["saved"] is True
     assert os.path.exists(result["path"])
     assert result["proposal"]["created_at"]
+
+
+def test_graph_proposal_uses_resident_index(
+    monkeypatch, graph_service, interpreter, project_name, project_root, sample_python_file
+):
+    graph = graph_service.build(project_name)
+    helper = next(node for node in graph["nodes"] if node["name"] == "helper")
+
+    def fail(*_, **__):
+        pytest.fail("proposal validation reloaded the graph")
+
+    monkeypatch.setattr(graph_service, "load_graph", fail)
+    proposal = {
+        "schema_version": "0.1.0",
+        "project": project_name,
+        "base_code_hash": graph["code_hash"],
+        "created_at": "2025-01-01T00:00:00Z",
+        "operations": [
+            {
+                "op": "add_node",
+                "node": {
+                    "id": "n901",
+                    "kind": "function",
+                    "name": "extra",
+                    "file": "sample.py",
+                    "range": {"start_line": 1, "end_line": 1},
+                    "extra": {},
+                },
+            },
+            {"op": "add_edge", "edge": {"from": "n901", "to": helper["id"], "kind": "calls"}},
+        ],
+    }
+    assert graph_service.save_proposal(project_name, proposal)["saved"] is True
+    monkeypatch.undo()
+
+    proposal_path = project_root / "proposal.json"
+    proposal_path.write_text(json.dumps(proposal), encoding="utf-8")
+    applied = interpreter.apply_proposal(project_name, str(proposal_path))
+    monkeypatch.setattr(graph_service, "load_graph", fail)
+
+    follow_up = {
+        **proposal,
+        "base_code_hash": applied["new_code_hash"],
+        "operations": [{"op": "update_node", "node_id": "n901", "patch": {"name": "renamed"}}],
+    }
+    assert graph_service.save_proposal(project_name, follow_up)["saved"] is True
+    with pytest.raises(ValueError, match="Node already exists"):
+        graph_service.save_proposal(
+            project_name, {**follow_up, "operations": proposal["operations"][:1]}
+        )
@@ -11,3 +11,33 @@ def test_graph_query_filters(graph_service, project_name, sample_python_file):
 
     result = graph_service.query(project_name, "sample.py", kind="function")
     assert any(node["kind"] == "function" for node in result["matches"])
+
+
+def test_graph_query_ranks_and_pages(graph_service, project_name, project_root):
+    (project_root / "ranking.py").write_text(
+        "\n".join(
+            [
+                "def load_config():",
+                "    pass",
+                "",
+                "def load():",
+                "    pass",
+                "",
+                "def reload():",
+                "    pass",
+                "",
+            ]
+        ),
+        encoding="utf-8",
+    )
+    graph_service.build(project_name)
+
+    result = graph_service.query(project_name, "load", kind="function")
+    assert [node["name"] for node in result["matches"]] == ["load", "load_config", "reload"]
+
+    page = graph_service.query(project_name, "load", kind="function", limit=1, offset=1)
+    assert page["match_count"] == 3
+    assert [node["name"] for node in page["matches"]] == ["load_config"]
+    page_ids = {node["id"] for node in page["matches"]}
+    assert page["related_edges"]
+    assert all(page_ids & {edge["from"], edge["to"]} for edge in page["related_edges"])
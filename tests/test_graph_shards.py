@@ -0,0 +1,134 @@
+"""Tests for sharded graph storage (AppConfig.graph_storage = "sharded")."""
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from core.graph_index import GraphIndex
+from core.graph_versions import GraphVersionStore
+
+
+@pytest.fixture()
+def sharded(config, graph_service, project_root, sample_python_file):
+    config.graph_storage = "sharded"
+    (project_root / "other.py").write_text("def other():\n    pass\n", encoding="utf-8")
+    return graph_service
+
+
+def _track_fragments(monkeypatch):
+    loaded = []
+    original = GraphVersionStore.fragment
+
+    def tracking(self, key):
+        fragment = original(self, key)
+        loaded.extend({node["file"] for node in fragment["nodes"]})
+        return fragment
+
+    monkeypatch.setattr(GraphVersionStore, "fragment", tracking)
+    return loaded
+
+
+def test_sharded_build_round_trips(sharded, project_name, graph_dir):
+    graph = sharded.build(project_name)
+
+    assert os.path.exists(graph_dir / f"{project_name}.shards.json")
+    assert not os.path.exists(graph_dir / f"{project_name}.codegraph.json")
+    loaded = sharded.load_graph(project_name)
+    assert sorted(n["id"] for n in loaded["nodes"]) == sorted(n["id"] for n in graph["nodes"])
+    assert loaded["code_hash"] == graph["code_hash"]
+    assert sharded.query(project_name, "other")["match_count"] >= 1
+
+
+def test_partial_load_reads_only_owning_shards(sharded, project_name, monkeypatch):
+    graph = sharded.build(project_name)
+    greeter = next(node for node in graph["nodes"] if node["name"] == "Greeter")
+    loaded = _track_fragments(monkeypatch)
+
+    partial = sharded.load_partial(project_name, node_ids=[greeter["id"]])
+
+    assert partial["partial_files"] == ["sample.py"]
+    assert loaded == ["sample.py"]
+    assert {node["file"] for node in partial["nodes"]} == {"sample.py"}
+
+
+def test_sharded_proposal_and_apply_touch_one_shard(
+    sharded, interpreter, make_proposal, project_name, project_root, monkeypatch
+):
+    graph = sharded.build(project_name)
+    greeter = next(node for node in graph["nodes"] if node["name"] == "Greeter")
+    proposal = make_proposal(
+        graph["code_hash"],
+        [
+            {
+                "op": "add_node",
+                "node": {
+                    "id": "n-new",
+                    "kind": "method",
+                    "name": "wave",
+                    "file": "sample.py",
+                    "range": {"start_line": 1, "end_line": 1},
+                    "extra": {},
+                },
+            },
+            {
+                "op": "add_edge",
+                "edge": {"from": greeter["id"], "to": "n-new", "kind": "belongs_to"},
+            },
+        ],
+    )
+    loaded = _track_fragments(monkeypatch)
+
+    saved = sharded.save_proposal(project_name, proposal)
+    result = interpreter.apply_proposal(project_name, saved["path"])
+
+    assert result["applied"] is True
+    assert set(loaded) == {"sample.py"}
+    after = sharded.load_graph(project_name)
+    assert {"wave", "other", "Greeter"} <= {node["name"] for node in after["nodes"]}
+    assert after["code_hash"] == result["new_code_hash"]
+    assert "def wave(self)" in (project_root / "sample.py").read_text(encoding="utf-8")
+
+
+def test_sharded_query_loads_only_matching_shards(
+    sharded, interpreter, make_proposal, project_name, project_root, monkeypatch
+):
+    for idx in range(8):
+        (project_root / f"mod{idx}.py").write_text(
+            f"def func{idx}():\n    pass\n", encoding="utf-8"
+        )
+    (project_root / "caller.py").write_text(
+        "from mod3 import func3\n\ndef use():\n    return func3()\n", encoding="utf-8"
+    )
+    graph = sharded.build(project_name)
+    expected = GraphIndex(sharded.load_graph(project_name))
+    sharded._index_cache.clear()
+    loaded = _track_fragments(monkeypatch)
+
+    result = sharded.query(project_name, "func3")
+
+    ranked = expected.search("func3")
+    assert result["matches"] == ranked
+    assert result["related_edges"] == expected.related_edges(node["id"] for node in ranked)
+    assert any(edge["kind"] == "calls" for edge in result["related_edges"])
+    assert set(loaded) == {"mod3.py", "caller.py"}
+    loaded.clear()
+    manifest = sharded._shards(project_name).manifest()
+    monkeypatch.setattr(
+        type(sharded._shards(project_name)), "manifest", lambda self: pytest.fail("re-read")
+    )
+
+    assert sharded.query(project_name, "func3") == result
+    assert loaded == []
+    assert set(manifest) == {"schema_version", "header", "files"}
+    monkeypatch.undo()
+    loaded = _track_fragments(monkeypatch)
+
+    greeter = next(node for node in graph["nodes"] if node["name"] == "Greeter")
+    rename = {"op": "update_node", "node_id": greeter["id"], "patch": {"name": "Host"}}
+    saved = sharded.save_proposal(project_name, make_proposal(graph["code_hash"], [rename]))
+    interpreter.apply_proposal(project_name, saved["path"])
+    loaded.clear()
+
+    assert [node["name"] for node in sharded.query(project_name, "host")["matches"]] == ["Host"]
+    assert set(loaded) == {"sample.py"}
@@ -0,0 +1,73 @@
+"""Tests for the sqlite graph backend (core.graph_sqlite.SqliteGraphStore)."""
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+
+@pytest.fixture()
+def sqlite_graphs(config, graph_service):
+    config.graph_backend = "sqlite"
+    return graph_service
+
+
+def test_sqlite_query_matches_json_ranking(sqlite_graphs, config, project_name, project_root):
+    (project_root / "ranking.py").write_text(
+        "def load_config():\n    pass\n\ndef load():\n    pass\n\ndef reload():\n    pass\n",
+        encoding="utf-8",
+    )
+    sqlite_graphs.build(project_name)
+
+    result = sqlite_graphs.query(project_name, "load", kind="function", limit=2)
+    assert result["match_count"] == 3
+    assert [node["name"] for node in result["matches"]] == ["load", "load_config"]
+    assert result["related_edges"]
+
+    short = sqlite_graphs.query(project_name, "lo")
+
+    config.graph_backend = "json"
+    expected = sqlite_graphs.query(project_name, "load", kind="function", limit=2)
+    assert result["matches"] == expected["matches"]
+    assert short["matches"] == sqlite_graphs.query(project_name, "lo")["matches"]
+
+
+def test_sqlite_incremental_build_and_wal(sqlite_graphs, graph_dir, project_name, project_root):
+    (project_root / "keep.py").write_text("def keep():\n    pass\n", encoding="utf-8")
+    (project_root / "gone.py").write_text("def gone():\n    pass\n", encoding="utf-8")
+    sqlite_graphs.build(project_name)
+    (project_root / "gone.py").unlink()
+    sqlite_graphs.build(project_name)
+
+    assert sqlite_graphs.query(project_name, "gone")["match_count"] == 0
+    assert sqlite_graphs.query(project_name, "keep")["match_count"] >= 1
+
+    conn = sqlite3.connect(str(graph_dir / f"{project_name}.codegraph.sqlite"))
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        dangling = conn.execute(
+            "SELECT count(*) FROM edges WHERE to_id NOT IN (SELECT id FROM nodes)"
+        ).fetchone()[0]
+        assert dangling == 0
+    finally:
+        conn.close()
+
+
+def test_sqlite_save_proposal_validates_references(
+    sqlite_graphs, project_name, sample_python_file
+):
+    graph = sqlite_graphs.build(project_name)
+    class_node = next(node for node in graph["nodes"] if node["kind"] == "class")
+    proposal = {
+        "schema_version": "0.1.0",
+        "project": project_name,
+        "base_code_hash": graph["code_hash"],
+        "operations": [
+            {"op": "update_node", "node_id": class_node["id"], "patch": {"name": "Hello"}},
+        ],
+    }
+    assert sqlite_graphs.save_proposal(project_name, proposal)["saved"] is True
+
+    proposal["operations"] = [{"op": "delete_node", "node_id": "missing"}]
+    with pytest.raises(ValueError):
+        sqlite_graphs.save_proposal(project_name, proposal)
@@ -0,0 +1,67 @@
+"""Tests for core.graph_store binary graph storage."""
+from __future__ import annotations
+
+import json
+import os
+
+from core.graph_store import BinaryGraphReader, write_binary_graph
+
+
+def test_binary_graph_round_trip(graph_service, project_name, sample_python_file, tmp_path):
+    graph = graph_service.build(project_name)
+    path = str(tmp_path / "graph.bin")
+    write_binary_graph(path, graph)
+
+    with BinaryGraphReader(path) as reader:
+        assert reader.node_count == len(graph["nodes"])
+        restored = reader.to_graph()
+    assert restored["nodes"] == graph["nodes"]
+    assert restored["edges"] == graph["edges"]
+    assert restored["code_hash"] == graph["code_hash"]
+    assert restored["files"] == graph["files"]
+
+
+def test_binary_graph_reads_kind_column_lazily(
+    graph_service, project_name, sample_python_file, tmp_path
+):
+    graph = graph_service.build(project_name)
+    path = str(tmp_path / "graph.bin")
+    write_binary_graph(path, graph)
+
+    with BinaryGraphReader(path) as reader:
+        indexes = reader.node_indexes_of_kind("class")
+        assert set(reader._columns) == {"node.kind", "strings.offsets", "strings.data"}
+        assert [reader.node(idx)["name"] for idx in indexes] == ["Greeter"]
+
+
+def test_load_graph_prefers_fresh_binary(graph_service, project_name, sample_python_file):
+    graph = graph_service.build(project_name)
+    assert os.path.exists(graph_service._binary_graph_path(project_name))
+    assert graph_service.load_graph(project_name)["nodes"] == graph["nodes"]
+
+    graph_path = graph_service._graph_path(project_name)
+    graph["nodes"] = graph["nodes"][:1]
+    with open(graph_path, "w", encoding="UTF-8") as handle:
+        json.dump(graph, handle)
+    assert len(graph_service.load_graph(project_name)["nodes"]) == 1
+
+
+def test_binary_graph_decodes_non_ascii_and_copies_extras(tmp_path):
+    node = {
+        "id": "n1",
+        "kind": "function",
+        "name": "grüß",
+        "file": "mödule.py",
+        "range": {"start_line": None, "end_line": 3},
+        "extra": {},
+    }
+    graph = {"nodes": [node, {**node, "id": "n2", "name": "plain"}], "edges": []}
+    path = str(tmp_path / "graph.bin")
+    write_binary_graph(path, graph)
+
+    with BinaryGraphReader(path) as reader:
+        restored = reader.to_graph()
+
+    assert restored["nodes"] == graph["nodes"]
+    restored["nodes"][0]["extra"]["touched"] = True
+    assert restored["nodes"][1]["extra"] == {}
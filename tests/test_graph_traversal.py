@@ -0,0 +1,66 @@
+"""Tests for graph traversals (core.graph_traversal and GraphService wrappers)."""
+from __future__ import annotations
+
+import pytest
+
+from core.graph_traversal import CsrAdjacency
+
+
+def _node(graph, name, kind=None):
+    return next(
+        node
+        for node in graph["nodes"]
+        if node["name"] == name and (not kind or node["kind"] == kind)
+    )
+
+
+def test_csr_adjacency_layout():
+    edges = [
+        {"from": "a", "to": "b", "kind": "defines"},
+        {"from": "a", "to": "c", "kind": "imports"},
+        {"from": "b", "to": "c", "kind": "defines"},
+        {"from": "b", "to": "missing", "kind": "defines"},
+    ]
+    csr = CsrAdjacency(["a", "b", "c"], edges)
+
+    assert list(csr.out_offsets) == [0, 2, 3, 3]
+    assert list(csr.out_targets) == [1, 2, 2]
+    assert list(csr.in_offsets) == [0, 0, 1, 3]
+    assert sorted(csr.neighbours(0, "out", csr.kind_filter(["imports"]))) == [(2, 1)]
+
+
+def test_neighborhood_and_closures(graph_service, project_name, sample_python_file):
+    graph = graph_service.build(project_name)
+    module = _node(graph, "sample", "module")
+    greeter = _node(graph, "Greeter")
+    greet = _node(graph, "greet")
+
+    one_hop = graph_service.neighborhood(project_name, greeter["id"], hops=1)
+    assert one_hop["distances"][greeter["id"]] == 0
+    assert one_hop["distances"][greet["id"]] == 1
+    assert module["id"] in one_hop["distances"]
+
+    deps = graph_service.dependencies(project_name, module["id"], edge_kinds=["defines"])
+    assert {node["name"] for node in deps["nodes"]} == {"sample", "Greeter", "greet", "helper"}
+
+    dependents = graph_service.dependents(project_name, greet["id"], edge_kinds=["belongs_to"])
+    assert [node["name"] for node in dependents["nodes"]] == ["greet", "Greeter"]
+
+    with pytest.raises(ValueError):
+        graph_service.neighborhood(project_name, "missing")
+
+
+def test_shortest_path(graph_service, project_name, sample_python_file):
+    graph = graph_service.build(project_name)
+    greet = _node(graph, "greet")
+    helper = _node(graph, "helper")
+
+    path = graph_service.shortest_path(project_name, greet["id"], helper["id"])
+    assert path["found"] is True
+    assert path["length"] == 2
+    assert [node["name"] for node in path["nodes"]] == ["greet", "sample", "helper"]
+
+    directed = graph_service.shortest_path(
+        project_name, greet["id"], helper["id"], direction="out"
+    )
+    assert directed["found"] is False
@@ -0,0 +1,74 @@
+"""Tests for versioned graph snapshots in core.graph_versions."""
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from core.graph_versions import GraphVersionStore
+
+
+def _graph(code_hash, files):
+    nodes = [
+        {"id": f"{name}-{body}", "kind": "function", "name": name, "file": name, "extra": {}}
+        for name, body in files.items()
+    ]
+    return {"code_hash": code_hash, "project": "demo", "nodes": nodes, "edges": []}
+
+
+def _fragment_files(directory):
+    return [name for _, _, names in os.walk(directory) for name in names]
+
+
+def test_versions_share_fragments_and_reassemble(tmp_path):
+    store = GraphVersionStore(str(tmp_path / "v"), str(tmp_path / "index.json"))
+    store.record(_graph("h1", {"a.py": 1, "b.py": 1}))
+    store.record(_graph("h2", {"a.py": 1, "b.py": 2}))
+
+    assert len(_fragment_files(tmp_path / "v")) == 3
+    graph = store.graph("h1")
+    assert graph["project"] == "demo"
+    assert sorted(node["id"] for node in graph["nodes"]) == ["a.py-1", "b.py-1"]
+
+
+def test_retention_evicts_least_recently_used(tmp_path):
+    store = GraphVersionStore(str(tmp_path / "v"), str(tmp_path / "index.json"), max_versions=2)
+    store.record(_graph("h1", {"a.py": 1}))
+    store.record(_graph("h2", {"a.py": 2}))
+    store.touch("h1")
+    store.record(_graph("h3", {"a.py": 3}))
+
+    assert [version["code_hash"] for version in store.versions()] == ["h1", "h3"]
+    assert store.graph("h2") is None
+    assert len(_fragment_files(tmp_path / "v")) == 2
+
+
+def test_retention_honours_size_bound(tmp_path):
+    store = GraphVersionStore(str(tmp_path / "v"), str(tmp_path / "index.json"), max_bytes=1)
+    store.record(_graph("h1", {"a.py": 1}))
+    store.record(_graph("h2", {"a.py": 2}))
+
+    assert [version["code_hash"] for version in store.versions()] == ["h2"]
+
+
+def test_proposal_against_older_snapshot_is_validated(
+    graph_service, project_name, sample_python_file
+):
+    graph = graph_service.build(project_name)
+    node_id = next(node["id"] for node in graph["nodes"] if node["name"] == "helper")
+    sample_python_file.write_text("def other():\n    pass\n", encoding="utf-8")
+    graph_service.build(project_name)
+    proposal = {
+        "schema_version": "0.1.0",
+        "project": project_name,
+        "base_code_hash": graph["code_hash"],
+        "operations": [{"op": "update_node", "node_id": node_id, "patch": {"name": "h"}}],
+    }
+
+    result = graph_service.save_proposal(project_name, proposal)
+    assert result["saved"] is True
+    assert result["stale_base"] is True
+
+    proposal["base_code_hash"] = "unknown"
+    with pytest.raises(ValueError, match="Code hash mismatch"):
+        graph_service.save_proposal(project_name, proposal)
@@ -0,0 +1,53 @@
+"""Tests for core.hashing.FileHasher."""
+from __future__ import annotations
+
+import hashlib
+import os
+from types import MethodType
+
+import pytest
+
+from core.graph import GraphService
+from core.hashing import FileHasher
+
+
+def test_file_hasher_chunks_match_whole_file(tmp_path):
+    path = tmp_path / "blob.bin"
+    data = os.urandom(10_000)
+    path.write_bytes(data)
+
+    hasher = FileHasher("sha256", chunk_size=64)
+    assert hasher.hash_file(str(path)) == hashlib.sha256(data).hexdigest()
+
+    blake = FileHasher("blake2b", chunk_size=333)
+    assert blake.hash_file(str(path)) == hashlib.blake2b(data).hexdigest()
+
+
+def test_file_hasher_hash_files_concurrently(tmp_path):
+    paths = []
+    for idx in range(20):
+        path = tmp_path / f"f{idx}.txt"
+        path.write_text(f"content {idx}", encoding="utf-8")
+        paths.append(str(path))
+    missing = str(tmp_path / "missing.txt")
+
+    result = FileHasher(workers=4).hash_files(paths + [missing])
+    assert result[missing] is None
+    for idx, path in enumerate(paths):
+        assert result[path] == hashlib.sha256(f"content {idx}".encode()).hexdigest()
+
+
+def test_file_hasher_rejects_unknown_algorithm():
+    with pytest.raises(ValueError):
+        FileHasher("crc32")
+
+
+def test_graph_records_hash_algorithm(config, graph_dir, project_name, sample_python_file):
+    config.hash_algorithm = "blake2b"
+    graphs = GraphService(config)
+    graphs._graph_dir = MethodType(lambda self: str(graph_dir), graphs)
+
+    graph = graphs.build(project_name)
+    assert graph["hash_algorithm"] == "blake2b"
+    assert len(graph["code_hash"]) == 128
+    assert graphs.compute_code_hash(project_name) == graph["code_hash"]
@@ -0,0 +1,49 @@
+"""Tests for core.hashtree.HashTree and GraphService.changed_since."""
+from __future__ import annotations
+
+from core.hashing import FileHasher
+
+
+def test_hash_tree_rehashes_only_changed_files(
+    graph_service, project_name, project_root, monkeypatch
+):
+    (project_root / "pkg").mkdir()
+    (project_root / "pkg" / "a.py").write_text("a = 1\n", encoding="utf-8")
+    (project_root / "b.py").write_text("b = 1\n", encoding="utf-8")
+    first = graph_service.compute_code_hash(project_name)
+    assert graph_service.compute_code_hash(project_name) == first
+
+    hashed = []
+    original = FileHasher.hash_file
+
+    def tracking(self, full_path):
+        hashed.append(full_path)
+        return original(self, full_path)
+
+    monkeypatch.setattr(FileHasher, "hash_file", tracking)
+    assert graph_service.compute_code_hash(project_name) == first
+    assert hashed == []
+
+    (project_root / "pkg" / "a.py").write_text("a = 22\n", encoding="utf-8")
+    second = graph_service.compute_code_hash(project_name)
+    assert second != first
+    assert [path.replace("\\", "/").rsplit("/", 2)[-2:] for path in hashed] == [["pkg", "a.py"]]
+
+
+def test_changed_since_reports_directories(graph_service, project_name, project_root):
+    (project_root / "pkg").mkdir()
+    (project_root / "pkg" / "a.py").write_text("a = 1\n", encoding="utf-8")
+    (project_root / "other").mkdir()
+    (project_root / "other" / "b.py").write_text("b = 1\n", encoding="utf-8")
+    base = graph_service.compute_code_hash(project_name)
+
+    (project_root / "pkg" / "a.py").write_text("a = 333\n", encoding="utf-8")
+    result = graph_service.changed_since(project_name, base)
+
+    assert result["known"] is True
+    assert result["changed"] is True
+    assert result["directories"] == ["", "pkg"]
+    assert result["code_hash"] != base
+
+    unknown = graph_service.changed_since(project_name, "deadbeef")
+    assert unknown["known"] is False
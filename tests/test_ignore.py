@@ -0,0 +1,62 @@
+"""Tests for ignore rules applied by the project walker."""
+from __future__ import annotations
+
+from core.ignore import IgnoreRules
+from core.snapshot import ProjectSnapshot
+
+
+def test_rules_follow_gitignore_semantics():
+    rules = IgnoreRules(["*.log", "!keep.log", "build/", "/top.txt", "docs/**/*.tmp"])
+
+    assert rules.ignored("a/b/debug.log", False)
+    assert not rules.ignored("keep.log", False)
+    assert rules.ignored("pkg/build", True)
+    assert not rules.ignored("pkg/build", False)
+    assert rules.ignored("top.txt", False)
+    assert not rules.ignored("sub/top.txt", False)
+    assert rules.ignored("docs/a/b/x.tmp", False)
+    assert not rules.ignored("src/x.tmp", False)
+
+
+def test_ignored_directories_are_never_entered(tmp_path, monkeypatch):
+    (tmp_path / ".venv" / "lib").mkdir(parents=True)
+    (tmp_path / ".venv" / "lib" / "site.py").write_text("", encoding="utf-8")
+    (tmp_path / "app.py").write_text("", encoding="utf-8")
+    scanned = []
+    original = ProjectSnapshot._scan
+
+    def tracking(self, path, rel_dir):
+        scanned.append(rel_dir)
+        return original(self, path, rel_dir)
+
+    monkeypatch.setattr(ProjectSnapshot, "_scan", tracking)
+    snapshot = ProjectSnapshot(str(tmp_path), IgnoreRules([".venv/"]))
+
+    assert scanned == [""]
+    assert [entry.rel_path for entry in snapshot.files()] == ["app.py"]
+
+
+def test_build_skips_default_and_gitignored_paths(
+    graph_service, project_name, project_root, sample_python_file
+):
+    for folder in ("__pycache__", "node_modules/pkg", "generated"):
+        (project_root / folder).mkdir(parents=True)
+        (project_root / folder / "mod.py").write_text("def f():\n    pass\n", encoding="utf-8")
+    (project_root / ".gitignore").write_text("generated/\n", encoding="utf-8")
+
+    graph = graph_service.build(project_name)
+
+    assert {entry["path"] for entry in graph["files"]} == {"sample.py"}
+
+
+def test_scaffolding_honours_configured_patterns(
+    project_manager, config, project_name, project_root
+):
+    (project_root / "src").mkdir()
+    (project_root / "src" / "main.py").write_text("", encoding="utf-8")
+    (project_root / "src" / "notes.txt").write_text("", encoding="utf-8")
+    config.ignore_patterns = ["*.txt"]
+
+    scaffolding = project_manager.scaffolding(project_name)
+
+    assert scaffolding["subfolders"][0]["files"] == ["main.py"]
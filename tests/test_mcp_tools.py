@@ -1,9 +1,13 @@
 """Tests for MCP tool wrappers in server.py."""
 from __future__ import annotations
 
+import asyncio
+import importlib
 import json
 
 import server
+from core.config import AppConfig
+from core.watcher import ProjectWatcher
 
 
 class FakeGit:
@@ -60,3 +64,25 @@ def test_mcp_wrappers(monkeypatch, project_name, graph_service, interpreter, pro
     assert server.git_add_all() == "added"
     assert server.git_commit("msg") == "committed"
     assert server.git_push() == "pushed"
+
+
+def test_watcher_starts_with_the_server_not_on_import(monkeypatch):
+    started = []
+    watching = AppConfig.from_globals()
+    watching.watch = True
+    monkeypatch.setattr(AppConfig, "from_globals", classmethod(lambda cls: watching))
+    monkeypatch.setattr(ProjectWatcher, "start", lambda self: started.append(self))
+
+    importlib.reload(server)
+    try:
+        assert started == []
+
+        async def serve():
+            async with server._lifespan(server.mcp):
+                pass
+
+        asyncio.run(serve())
+        assert started == [server.watcher]
+    finally:
+        monkeypatch.undo()
+        importlib.reload(server)
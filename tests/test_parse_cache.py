@@ -0,0 +1,88 @@
+"""Tests for the shared parse cache used by core.graph.GraphService.build."""
+from __future__ import annotations
+
+import os
+
+from core.parse_cache import ParseCache
+
+
+def _track_parses(graph_service, monkeypatch):
+    parsed = []
+    original = graph_service._extract_file
+
+    def tracking(full_path, file_rel):
+        parsed.append(file_rel)
+        return original(full_path, file_rel)
+
+    monkeypatch.setattr(graph_service, "_extract_file", tracking)
+    return parsed
+
+
+def test_identical_files_are_parsed_once(
+    graph_service, config, project_name, project_root, apps_root, monkeypatch
+):
+    source = "class Shared:\n    def run(self):\n        pass\n"
+    (project_root / "shared.py").write_text(source, encoding="utf-8")
+    graph_service.build(project_name)
+
+    other = apps_root / "other"
+    (other / "vendor").mkdir(parents=True)
+    (other / "vendor" / "copy.py").write_text(source, encoding="utf-8")
+    config.projects.add("other")
+    parsed = _track_parses(graph_service, monkeypatch)
+
+    graph = graph_service.build("other")
+
+    assert parsed == []
+    module = next(node for node in graph["nodes"] if node["kind"] == "module")
+    assert module["name"] == "copy"
+    assert module["extra"]["qualname"] == "vendor.copy"
+    assert {node["file"] for node in graph["nodes"]} == {"vendor/copy.py"}
+    assert "Shared.run" in {node["extra"].get("qualname") for node in graph["nodes"]}
+
+
+def test_full_rebuild_uses_cache(
+    graph_service, project_name, project_root, sample_python_file, monkeypatch
+):
+    first = graph_service.build(project_name)
+    parsed = _track_parses(graph_service, monkeypatch)
+
+    second = graph_service.build(project_name, incremental=False)
+
+    assert parsed == []
+    assert [node["id"] for node in second["nodes"]] == [node["id"] for node in first["nodes"]]
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    cache = ParseCache(str(tmp_path), "1", max_bytes=1)
+    cache.put("sha256", "aa01", {"nodes": [], "edges": []})
+    cache.put("sha256", "bb02", {"nodes": [], "edges": []})
+    old = os.path.join(str(tmp_path), "aa", "1.sha256.aa01.json")
+    os.utime(old, ns=(1, 1))
+    size = os.path.getsize(old)
+
+    cache = ParseCache(str(tmp_path), "1", max_bytes=size)
+    assert cache.prune() == 1
+    assert cache.get("sha256", "aa01") == (False, None)
+    assert cache.get("sha256", "bb02")[0]
+
+
+def test_prune_skips_the_walk_while_under_the_bound(tmp_path, monkeypatch):
+    cache = ParseCache(str(tmp_path), "1", max_bytes=10_000)
+    cache.put("sha256", "aa01", {"nodes": [], "edges": []})
+    assert cache.prune() == 0
+    size = os.path.getsize(os.path.join(str(tmp_path), "aa", "1.sha256.aa01.json"))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cache directory was walked")
+
+    monkeypatch.setattr(os, "walk", fail)
+    cache.put("sha256", "bb02", {"nodes": [], "edges": []})
+    cache.put("sha256", "bb02", {"nodes": [], "edges": []})
+    assert cache.prune() == 0
+    monkeypatch.undo()
+
+    cache = ParseCache(str(tmp_path), "1", max_bytes=size)
+    cache.put("sha256", "cc03", {"nodes": [], "edges": []})
+    assert cache.prune() == 2
+    assert cache._read_size() == size
@@ -0,0 +1,74 @@
+"""Tests for batched proposal validation."""
+from __future__ import annotations
+
+
+def test_batch_validates_and_reports_conflicts(
+    monkeypatch, graph_service, make_proposal, project_name, sample_python_file
+):
+    graph = graph_service.build(project_name)
+    code_hash = graph["code_hash"]
+    ids = {node["name"]: node["id"] for node in graph["nodes"]}
+    calls = []
+    original = graph_service.compute_code_hash
+
+    def counting(project):
+        calls.append(project)
+        return original(project)
+
+    monkeypatch.setattr(graph_service, "compute_code_hash", counting)
+
+    proposals = [
+        make_proposal(
+            code_hash,
+            [{"op": "update_node", "node_id": ids["helper"], "patch": {"name": "renamed"}}],
+        ),
+        make_proposal(
+            code_hash,
+            [
+                {
+                    "op": "add_edge",
+                    "edge": {"from": ids["greet"], "to": ids["helper"], "kind": "calls"},
+                }
+            ],
+        ),
+        make_proposal(
+            code_hash,
+            [{"op": "update_node", "node_id": ids["Greeter"], "patch": {"name": "Host"}}],
+        ),
+        make_proposal(code_hash, [{"op": "delete_node", "node_id": "missing"}]),
+        make_proposal("unknown", []),
+    ]
+
+    result = graph_service.validate_proposals(project_name, proposals)
+
+    assert calls == [project_name]
+    assert [entry["valid"] for entry in result["results"]] == [True, True, True, False, False]
+    assert result["valid_count"] == 3
+    assert result["results"][3]["errors"] == [
+        {"operation": 0, "reason": "Node not found: missing"}
+    ]
+    assert result["results"][4]["errors"][0]["reason"] == "Code hash mismatch"
+    assert result["conflicts"] == [{"proposals": [0, 1], "nodes": [ids["helper"]], "edges": []}]
+
+
+def test_batch_uses_retained_base_snapshots(
+    graph_service, make_proposal, project_name, sample_python_file
+):
+    graph = graph_service.build(project_name)
+    helper = next(node["id"] for node in graph["nodes"] if node["name"] == "helper")
+    sample_python_file.write_text("def other():\n    pass\n", encoding="utf-8")
+    graph_service.build(project_name)
+    operations = [{"op": "update_node", "node_id": helper, "patch": {"name": "h"}}]
+
+    result = graph_service.validate_proposals(
+        project_name,
+        [
+            make_proposal(graph["code_hash"], operations),
+            make_proposal(graph["code_hash"], operations),
+            {"project": project_name},
+        ],
+    )
+
+    assert [entry["valid"] for entry in result["results"]] == [True, True, False]
+    assert result["results"][0]["stale_base"] is True
+    assert result["conflicts"][0]["proposals"] == [0, 1]
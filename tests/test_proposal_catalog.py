@@ -0,0 +1,124 @@
+"""Tests for the proposal catalog behind list/get/gc of graph proposals."""
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+
+
+def _add_node(node_id="n950"):
+    return [
+        {
+            "op": "add_node",
+            "node": {
+                "id": node_id,
+                "kind": "function",
+                "name": f"fn_{node_id}",
+                "file": "sample.py",
+                "range": {"start_line": 1, "end_line": 1},
+                "extra": {},
+            },
+        }
+    ]
+
+
+def test_saved_proposals_are_listed_and_fetched(
+    graph_service, make_proposal, project_name, sample_python_file
+):
+    graph = graph_service.build(project_name)
+    proposal = make_proposal(graph["code_hash"], _add_node())
+    first = graph_service.save_proposal(project_name, proposal)
+    second = graph_service.save_proposal(
+        project_name,
+        make_proposal(graph["code_hash"], _add_node("n951"), created_at="2025-01-02T00:00:00Z"),
+    )
+
+    listing = graph_service.list_proposals(project_name, status="pending")
+
+    assert listing["total"] == 2
+    assert [entry["id"] for entry in listing["proposals"]] == [second["id"], first["id"]]
+    assert listing["proposals"][0]["op_counts"] == {"add_node": 1}
+    fetched = graph_service.get_proposal(project_name, first["id"])
+    assert fetched["proposal"]["operations"][0]["node"]["id"] == "n950"
+    with pytest.raises(ValueError):
+        graph_service.get_proposal(project_name, "missing")
+
+
+def test_stale_proposals_are_collected(
+    graph_service, make_proposal, project_name, project_root, sample_python_file
+):
+    graph = graph_service.build(project_name)
+    proposal = make_proposal(graph["code_hash"], _add_node())
+    saved = graph_service.save_proposal(project_name, proposal)
+    (project_root / "later.py").write_text("def later():\n    pass\n", encoding="utf-8")
+
+    assert graph_service.list_proposals(project_name, status="stale")["total"] == 1
+    assert graph_service.gc_proposals(project_name, older_than_days=1)["removed"] == 0
+    result = graph_service.gc_proposals(project_name)
+
+    assert result["ids"] == [saved["id"]]
+    assert not os.path.exists(saved["path"])
+    assert graph_service.list_proposals(project_name)["total"] == 0
+
+
+def test_applied_proposals_are_marked(
+    graph_service, make_proposal, interpreter, project_name, sample_python_file
+):
+    graph = graph_service.build(project_name)
+    proposal = make_proposal(graph["code_hash"], _add_node())
+    saved = graph_service.save_proposal(project_name, proposal)
+
+    result = interpreter.apply_proposal(project_name, saved["path"])
+
+    entry = graph_service.get_proposal(project_name, saved["id"])
+    assert entry["status"] == "applied"
+    assert entry["applied_code_hash"] == result["new_code_hash"]
+    assert graph_service.list_proposals(project_name, status="stale")["total"] == 0
+
+
+def test_catalog_backfills_existing_files(
+    graph_service, make_proposal, project_name, sample_python_file
+):
+    graph = graph_service.build(project_name)
+    directory = graph_service._proposal_dir(project_name)
+    with open(os.path.join(directory, "old_abcd1234.json"), "w", encoding="UTF-8") as handle:
+        json.dump(make_proposal(graph["code_hash"], _add_node()), handle)
+
+    listing = graph_service.list_proposals(project_name)
+
+    assert [entry["id"] for entry in listing["proposals"]] == ["old_abcd1234"]
+    assert listing["proposals"][0]["status"] == "pending"
+    with pytest.raises(ValueError, match="Invalid proposal status"):
+        graph_service.list_proposals(project_name, status="merged")
+
+
+def test_catalog_backfill_is_atomic(
+    monkeypatch, graph_service, make_proposal, project_name, sample_python_file
+):
+    graph = graph_service.build(project_name)
+    directory = graph_service._proposal_dir(project_name)
+    for idx in range(3):
+        with open(os.path.join(directory, f"old_{idx}.json"), "w", encoding="UTF-8") as handle:
+            json.dump(make_proposal(graph["code_hash"], _add_node(f"n96{idx}")), handle)
+    original = graph_service._proposal_records
+
+    def interrupted(directory):
+        for position, record in enumerate(original(directory)):
+            if position == 2:
+                raise RuntimeError("interrupted")
+            yield record
+
+    monkeypatch.setattr(graph_service, "_proposal_records", interrupted)
+    with pytest.raises(RuntimeError):
+        graph_service.list_proposals(project_name)
+    assert not os.path.exists(os.path.join(directory, "catalog.sqlite"))
+    monkeypatch.undo()
+
+    assert graph_service.list_proposals(project_name)["total"] == 3
+    assert sorted(os.listdir(directory)) == [
+        "catalog.sqlite",
+        "old_0.json",
+        "old_1.json",
+        "old_2.json",
+    ]
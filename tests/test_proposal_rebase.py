@@ -0,0 +1,126 @@
+"""Tests for rebasing graph proposals onto a newer code hash."""
+from __future__ import annotations
+
+import pytest
+
+
+def _rename(graph, name):
+    node_id = next(node["id"] for node in graph["nodes"] if node["name"] == name)
+    return {"op": "update_node", "node_id": node_id, "patch": {"name": f"{name}_renamed"}}
+
+
+def test_rebase_when_touched_files_are_unchanged(
+    graph_service, make_proposal, interpreter, project_name, project_root, sample_python_file
+):
+    graph = graph_service.build(project_name)
+    saved = graph_service.save_proposal(
+        project_name, make_proposal(graph["code_hash"], [_rename(graph, "helper")])
+    )
+    (project_root / "unrelated.py").write_text("def other():\n    pass\n", encoding="utf-8")
+
+    result = graph_service.rebase_proposal(project_name, proposal_id=saved["id"])
+
+    assert result["rebased"] is True
+    assert result["from_hash"] == graph["code_hash"]
+    assert result["to_hash"] == graph_service.compute_code_hash(project_name)
+    assert result["proposal"]["base_code_hash"] == result["to_hash"]
+    assert graph_service.get_proposal(project_name, result["id"])["status"] == "pending"
+    assert interpreter.apply_proposal(project_name, result["path"])["applied"] is True
+
+
+def test_rebase_reports_file_and_operation_conflicts(
+    graph_service, make_proposal, project_name, project_root, sample_python_file
+):
+    other = project_root / "other.py"
+    other.write_text("def keep():\n    pass\n", encoding="utf-8")
+    graph = graph_service.build(project_name)
+    proposal = make_proposal(
+        graph["code_hash"],
+        [
+            _rename(graph, "keep"),
+            _rename(graph, "helper"),
+            {
+                "op": "add_node",
+                "node": {
+                    "id": "n960",
+                    "kind": "function",
+                    "name": "fresh",
+                    "file": "new.py",
+                    "range": {"start_line": 1, "end_line": 1},
+                },
+            },
+        ],
+    )
+    graph_service.save_proposal(project_name, proposal)
+    sample_python_file.write_text("def unrelated():\n    pass\n", encoding="utf-8")
+
+    result = graph_service.rebase_proposal(project_name, proposal=proposal)
+
+    assert result["rebased"] is False
+    assert result["conflicts"]["files"] == [
+        {"file": "sample.py", "reason": "changed", "operations": [1]}
+    ]
+    assert [c["operation"] for c in result["conflicts"]["operations"]] == [1]
+    assert "Node not found" in result["conflicts"]["operations"][0]["reason"]
+
+
+def test_rebase_requires_a_retained_base(
+    graph_service, make_proposal, project_name, sample_python_file
+):
+    graph = graph_service.build(project_name)
+    current = make_proposal(graph["code_hash"], [])
+
+    assert graph_service.rebase_proposal(project_name, proposal=current)["up_to_date"] is True
+    with pytest.raises(ValueError, match="no longer retained"):
+        graph_service.rebase_proposal(project_name, proposal={**current, "base_code_hash": "x"})
+
+
+def test_rebase_after_apply_sees_rewritten_files(
+    graph_service, make_proposal, interpreter, project_name, sample_python_file
+):
+    graph = graph_service.build(project_name)
+    pending = make_proposal(graph["code_hash"], [_rename(graph, "helper")])
+    graph_service.save_proposal(project_name, pending)
+    add_import = make_proposal(
+        graph["code_hash"],
+        [
+            {
+                "op": "add_node",
+                "node": {
+                    "id": "n970",
+                    "kind": "import",
+                    "name": "math",
+                    "file": "sample.py",
+                    "range": {"start_line": 1, "end_line": 1},
+                },
+            }
+        ],
+    )
+    applied = graph_service.save_proposal(project_name, add_import)
+    interpreter.apply_proposal(project_name, applied["path"])
+
+    result = graph_service.rebase_proposal(project_name, proposal=pending)
+
+    assert result["rebased"] is False
+    assert result["conflicts"]["files"] == [
+        {"file": "sample.py", "reason": "changed", "operations": [0]}
+    ]
+
+
+def test_rebase_onto_an_applied_base(
+    graph_service, make_proposal, interpreter, project_name, project_root, sample_python_file
+):
+    graph = graph_service.build(project_name)
+    applied = graph_service.save_proposal(
+        project_name, make_proposal(graph["code_hash"], [_rename(graph, "Greeter")])
+    )
+    new_hash = interpreter.apply_proposal(project_name, applied["path"])["new_code_hash"]
+    base = graph_service.load_graph(project_name)
+    pending = make_proposal(new_hash, [_rename(base, "helper")])
+    graph_service.save_proposal(project_name, pending)
+    (project_root / "unrelated.py").write_text("def other():\n    pass\n", encoding="utf-8")
+
+    result = graph_service.rebase_proposal(project_name, proposal=pending)
+
+    assert result["conflicts"]["files"] == []
+    assert result["rebased"] is True
@@ -0,0 +1,66 @@
+"""Tests for core.snapshot project snapshots."""
+from __future__ import annotations
+
+import os
+
+from core.snapshot import ProjectSnapshot, SnapshotCache
+
+
+def _age(path, seconds=10):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - seconds * 10**9))
+
+
+def test_snapshot_lists_files_with_relative_paths(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "mod.py").write_text("x = 1\n", encoding="utf-8")
+    (tmp_path / "README.TXT").write_text("hi", encoding="utf-8")
+
+    snapshot = ProjectSnapshot(str(tmp_path))
+
+    files = {entry.rel_path: entry for entry in snapshot.files()}
+    assert set(files) == {"pkg/mod.py", "README.TXT"}
+    assert files["README.TXT"].extension == "txt"
+    assert files["pkg/mod.py"].path == os.path.join(str(tmp_path), "pkg", "mod.py")
+    assert snapshot.relative(str(tmp_path / "pkg")) == "pkg"
+    assert snapshot.relative(str(tmp_path.parent)) is None
+
+
+def test_cache_reuses_snapshot_until_a_directory_changes(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "mod.py").write_text("x = 1\n", encoding="utf-8")
+    _age(tmp_path / "pkg")
+    _age(tmp_path)
+    cache = SnapshotCache()
+
+    first = cache.get(str(tmp_path))
+    assert cache.get(str(tmp_path)) is first
+
+    (tmp_path / "pkg" / "mod.py").write_text("x = 2\n", encoding="utf-8")
+    assert cache.get(str(tmp_path)) is first
+
+    (tmp_path / "pkg" / "new.py").write_text("y = 1\n", encoding="utf-8")
+    second = cache.get(str(tmp_path))
+    assert second is not first
+    assert "pkg/new.py" in {entry.rel_path for entry in second.files()}
+
+
+def test_services_share_one_scan(
+    graph_service, project_manager, project_name, project_root, sample_python_file, monkeypatch
+):
+    _age(project_root)
+    scans = []
+    original = ProjectSnapshot._scan
+
+    def counting(self, path, rel_dir):
+        if not rel_dir:
+            scans.append(path)
+        return original(self, path, rel_dir)
+
+    monkeypatch.setattr(ProjectSnapshot, "_scan", counting)
+    graph_service.build(project_name)
+    project_manager.scaffolding(project_name)
+    project_manager.inverted_index(project_name)
+    graph_service.compute_code_hash(project_name)
+
+    assert len(scans) == 1
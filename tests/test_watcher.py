@@ -0,0 +1,76 @@
+"""Tests for core.watcher.ProjectWatcher."""
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from core.watcher import ProjectWatcher
+
+
+def _wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def _has_node(graph_service, project, name):
+    try:
+        graph = graph_service.load_graph(project)
+    except (OSError, ValueError):
+        return False
+    return any(node["name"] == name for node in graph["nodes"])
+
+
+def test_changes_are_debounced_and_coalesced(graph_service, config, project_name, monkeypatch):
+    config.watch_debounce_ms = 100
+    builds = []
+    monkeypatch.setattr(graph_service, "build", lambda project, incremental: builds.append(project))
+    watcher = ProjectWatcher(config, graph_service)
+
+    watcher.notify(project_name, {"a.py"}, now=0.0)
+    watcher.notify(project_name, {"b.py"}, now=0.05)
+    assert watcher.process_pending(now=0.1) == []
+    assert watcher.process_pending(now=0.16) == [project_name]
+    assert builds == [project_name]
+    assert watcher.process_pending(now=1.0) == []
+
+
+def test_continuous_changes_still_rebuild(graph_service, config, project_name, monkeypatch):
+    config.watch_debounce_ms = 100
+    monkeypatch.setattr(graph_service, "build", lambda project, incremental: None)
+    watcher = ProjectWatcher(config, graph_service)
+
+    for step in range(10):
+        watcher.notify(project_name, {"a.py"}, now=step * 0.09)
+        assert watcher.process_pending(now=step * 0.09) == []
+    watcher.notify(project_name, {"a.py"}, now=0.95)
+    assert watcher.process_pending(now=1.0) == [project_name]
+
+
+@pytest.mark.parametrize("backend", ["poll", "inotify"])
+def test_watcher_rebuilds_on_file_changes(
+    graph_service, config, project_name, project_root, sample_python_file, backend
+):
+    config.watch_debounce_ms = 50
+    config.watch_poll_interval_ms = 50
+    graph_service.build(project_name)
+    watcher = ProjectWatcher(config, graph_service, backend=backend)
+    try:
+        watcher.start()
+    except OSError:
+        pytest.skip("inotify is not available")
+    try:
+        (project_root / "pkg").mkdir()
+        time.sleep(0.2)
+        (project_root / "pkg" / "added.py").write_text("def added():\n    pass\n", "utf-8")
+        assert _wait_for(lambda: _has_node(graph_service, project_name, "added"))
+
+        sample_python_file.write_text("def renamed():\n    return 2\n", encoding="utf-8")
+        assert _wait_for(lambda: _has_node(graph_service, project_name, "renamed"))
+        assert watcher.backend == backend
+    finally:
+        watcher.stop()
@@ -6,16 +6,66 @@ GraphService = CoreGraphService
 _DEFAULT_GRAPH = GraphService(AppConfig.from_globals())
 
 
-def build(project: str) -> dict[str, object]:
+def build(project: str, incremental: bool = True) -> dict[str, object]:
     """Builds a code graph for a project and writes it to disk."""
-    return _DEFAULT_GRAPH.build(project)
+    return _DEFAULT_GRAPH.build(project, incremental=incremental)
 
 
-def query(project: str, term: str, kind: str | None = None) -> dict[str, object]:
-    """Query nodes by name/file and return matching nodes with related edges."""
-    return _DEFAULT_GRAPH.query(project, term, kind=kind)
+def export_ndjson(project: str, path: str | None = None) -> dict[str, object]:
+    """Streams the stored graph to an NDJSON file."""
+    return _DEFAULT_GRAPH.export_ndjson(project, path=path)
+
+
+def import_ndjson(project: str, path: str | None = None) -> dict[str, object]:
+    """Stores a graph read from an NDJSON export."""
+    return _DEFAULT_GRAPH.import_ndjson(project, path)
+
+
+def query(
+    project: str,
+    term: str,
+    kind: str | None = None,
+    limit: int | None = None,
+    offset: int = 0,
+) -> dict[str, object]:
+    """Query nodes by name/file and return ranked matching nodes with related edges."""
+    return _DEFAULT_GRAPH.query(project, term, kind=kind, limit=limit, offset=offset)
 
 
 def save_proposal(project: str, proposal: dict[str, object]) -> dict[str, object]:
     """Validates and stores a graph change proposal."""
     return _DEFAULT_GRAPH.save_proposal(project, proposal)
+
+
+def validate_proposals(project: str, proposals: list[dict[str, object]]) -> dict[str, object]:
+    """Validates several proposals against one graph snapshot and reports conflicts."""
+    return _DEFAULT_GRAPH.validate_proposals(project, proposals)
+
+
+def rebase_proposal(project: str, proposal_id: str) -> dict[str, object]:
+    """Re-targets a saved proposal to the current code hash, or reports conflicts."""
+    return _DEFAULT_GRAPH.rebase_proposal(project, proposal_id=proposal_id)
+
+
+def list_proposals(
+    project: str, status: str | None = None, limit: int | None = 50, offset: int = 0
+) -> dict[str, object]:
+    """Lists catalogued proposals, newest first."""
+    return _DEFAULT_GRAPH.list_proposals(project, status=status, limit=limit, offset=offset)
+
+
+def get_proposal(project: str, proposal_id: str) -> dict[str, object]:
+    """Returns a catalogued proposal by id."""
+    return _DEFAULT_GRAPH.get_proposal(project, proposal_id)
+
+
+def changed_since(project: str, code_hash: str) -> dict[str, object]:
+    """Reports which directories changed since the tree with ``code_hash``."""
+    return _DEFAULT_GRAPH.changed_since(project, code_hash)
+
+
+def diff(
+    project: str, from_hash: str | None = None, to_hash: str | None = None
+) -> dict[str, object]:
+    """Structural diff between two graph versions (default: stored graph vs current tree)."""
+    return _DEFAULT_GRAPH.diff(project, from_hash=from_hash, to_hash=to_hash)